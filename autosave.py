@@ -0,0 +1,347 @@
+"""Incremental autosave: an append-only change journal next to the project.
+
+Every model change is appended as one compact JSON line to
+`<project>.journal`. The UI thread only puts records on a list; a writer
+thread wakes every FLUSH_SECONDS, encodes the batch and appends it, so
+autosave never waits on the disk. Record kinds:
+
+    ["s", id, key, value]      property set
+    ["m", [ids], dx, dy]       move
+    ["a", [widget dicts], [z]] widgets appended, with their stacking keys
+    ["d", [ids]]               widgets deleted
+    ["r", [[z, dict], ...]]    widgets restored at stacking keys
+    ["c"]                      project cleared
+
+After COMPACT_EVERY records the whole project, stacking keys included,
+is written to `<project>.autosave` and the journal starts over. The UI
+thread only asks for it: the writer keeps its own copy of the project,
+applying each record as it writes it, and dumps that copy widget by
+widget. The copy starts from a base the builder hands over (a recovered
+or restored project) or, failing that, is rebuilt from disk like crash
+recovery does. Opening a project replays base + journal, where the
+base is the .autosave file when one exists and the project file
+otherwise. A manual save makes the project file the base again and
+empties the journal. .json and .pgb files don't keep stacking keys, and
+reading one back numbers its widgets 1..n, so a save to either lists the
+live keys in the fresh journal's header; recovery puts them back on the
+base before replaying records that name keys. The project opened or
+saved last is remembered in LAST_PROJECT so the builder can reopen it.
+
+Records are numbered: a journal starts with ["n", seq] (or
+["n", seq, [z]] after such a save), the number of its first record,
+and the .autosave base stores the number of the last record it holds.
+Compaction replaces the base before it starts a fresh journal,
+a save starts the fresh journal before it drops the base, and each step
+is an atomic rename. A crash in between leaves either journal records
+the base already holds, which replay skips, or a base older than the
+journal, which recovery ignores in favour of the saved project file.
+"""
+import json
+import os
+import threading
+
+from model import Widget, WidgetStore
+
+FLUSH_SECONDS = 0.5
+COMPACT_EVERY = 5000
+JOURNAL_SUFFIX = '.journal'
+AUTOSAVE_SUFFIX = '.autosave'
+UNTITLED = os.path.join(os.path.expanduser('~'), '.pygui_builder', 'untitled.json')
+# Path of the project open last, reopened at startup
+LAST_PROJECT = os.path.join(os.path.dirname(UNTITLED), 'last_project')
+
+# What recover() raises for a damaged or unreadable autosave
+RECOVER_ERRORS = (OSError, ValueError, LookupError, TypeError)
+
+_COMPACT = object()
+_RESET = object()
+
+
+def replay(store, records):
+    """Apply journal records to a WidgetStore, returning the store."""
+    for record in records:
+        op = record[0]
+        if op == 's':
+            data = store.get(record[1])
+            if data is not None:
+                data[record[2]] = record[3]
+        elif op == 'm':
+            for wid in record[1]:
+                data = store.get(wid)
+                if data is not None:
+                    data['x'] += record[2]
+                    data['y'] += record[3]
+        elif op == 'a':
+            # Journals written before adds kept their keys append on top
+            keys = record[2] if len(record) > 2 else [None] * len(record[1])
+            for d, z in zip(record[1], keys):
+                store.add(Widget.from_dict(d), z)
+        elif op == 'd':
+            for wid in record[1]:
+                store.remove(wid)
+        elif op == 'r':
+            store.restore([(z, Widget.from_dict(d)) for z, d in record[1]])
+        elif op == 'c':
+            store.clear()
+    return store
+
+
+def read_json(project):
+    with open(project, 'r', encoding='utf-8') as f:
+        return WidgetStore.from_list(json.load(f))
+
+
+def read_records(path):
+    """(number of the first record, stacking keys of the saved base or None, records)."""
+    first, keys, records = 1, None, []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash mid-write leaves at most one torn line, at the end
+                    break
+                if record[0] == 'n' and not records:
+                    first = record[1]
+                    keys = record[2] if len(record) > 2 else None
+                else:
+                    records.append(record)
+    except FileNotFoundError:
+        pass
+    return first, keys, records
+
+
+def has_changes(project):
+    """True if autosave holds changes not in the project file."""
+    if os.path.exists(project + AUTOSAVE_SUFFIX):
+        return True
+    try:
+        with open(project + JOURNAL_SUFFIX, 'rb') as f:
+            line = f.readline()
+            # A fresh journal holds only its header
+            return bool(f.read(1)) or bool(line) and not line.startswith(b'["n"')
+    except OSError:
+        return False
+
+
+def remember_project(project):
+    """Record `project` as the one to reopen next session."""
+    try:
+        os.makedirs(os.path.dirname(LAST_PROJECT), exist_ok=True)
+        with open(LAST_PROJECT, 'w', encoding='utf-8') as f:
+            f.write(os.path.abspath(project))
+    except OSError:
+        pass
+
+
+def last_project():
+    try:
+        with open(LAST_PROJECT, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def recover(project, load_base):
+    """Rebuild a project from its autosave base (or `load_base(project)`) and journal."""
+    autosave = project + AUTOSAVE_SUFFIX
+    first, keys, records = read_records(project + JOURNAL_SUFFIX)
+    store, seq = None, first - 1
+    if os.path.exists(autosave):
+        with open(autosave, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        if isinstance(base, list):
+            # Written before bases kept stacking keys and a record number
+            store = WidgetStore.from_list(base)
+        elif base['seq'] >= seq:
+            store, seq = WidgetStore.from_snapshot(base), base['seq']
+        # Otherwise a save restarted the journal but didn't get to drop this base
+    if store is None:
+        store = load_base(project) if os.path.exists(project) else WidgetStore()
+        if keys is not None and len(keys) == len(store):
+            # Saved to a file that numbered its widgets 1..n
+            store = WidgetStore(list(store), keys)
+    # Records up to `seq` are in the base already
+    return replay(store, records[seq - first + 1:])
+
+
+class Journal:
+    """Background writer for one project's journal.
+
+    load_base(project) reads the project file, for rebuilding the writer's
+    copy of the project; the default reads a JSON project.
+    """
+
+    def __init__(self, project, load_base=read_json, flush_seconds=FLUSH_SECONDS,
+                 compact_every=COMPACT_EVERY):
+        self.project = project
+        self.load_base = load_base
+        self.path = project + JOURNAL_SUFFIX
+        self.autosave = project + AUTOSAVE_SUFFIX
+        self.flush_seconds = flush_seconds
+        self.compact_every = compact_every
+        self.pending = []
+        self.count = 0
+        self.queued = 0
+        self.written = 0
+        self.compactions = 0
+        # Number of the last record written; read from the file by the writer
+        self.seq = 0
+        # The writer's copy of the project as of record `seq`, or None
+        self.store = None
+        self.error = None
+        self.urgent = False
+        self.closed = False
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name='autosave', daemon=True)
+        self.thread.start()
+
+    def append(self, *record):
+        # Called on the UI thread: no I/O, no encoding, no wakeup
+        with self.cond:
+            self.pending.append(record)
+            self.queued += 1
+        self.count += 1
+
+    def due(self):
+        return self.count >= self.compact_every
+
+    def compact(self, snapshot=None):
+        """Queue a fresh base.
+
+        snapshot: WidgetStore.to_snapshot() data the caller won't touch,
+        for a project the journal doesn't hold (just recovered or
+        restored); by default the writer's own copy is written.
+        """
+        self.count = 0
+        with self.cond:
+            self.pending.append((_COMPACT, snapshot))
+            self.queued += 1
+            self.wake()
+
+    def reset(self, keys=None):
+        """The project file was just saved: drop the autosave base and journal.
+
+        keys: the saved widgets' stacking keys, in order, when the file
+        doesn't keep them.
+        """
+        self.count = 0
+        with self.cond:
+            self.pending.append((_RESET, keys))
+            self.queued += 1
+            self.wake()
+
+    def flush(self):
+        """Block until everything appended so far is on disk."""
+        with self.cond:
+            target = self.queued
+            self.wake()
+            while self.written < target and self.thread.is_alive():
+                self.cond.wait(0.05)
+
+    def close(self, discard=False):
+        if discard:
+            self.reset()
+        with self.cond:
+            self.closed = True
+            self.wake()
+        self.thread.join()
+
+    def wake(self):
+        # Caller holds self.cond
+        self.urgent = True
+        self.cond.notify_all()
+
+    def run(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        first, _, records = read_records(self.path)
+        self.seq = first - 1 + len(records)
+        while True:
+            with self.cond:
+                # Sleep a full period so edits arrive in batches, not one by one
+                if not self.urgent and not self.closed:
+                    self.cond.wait(self.flush_seconds)
+                batch, self.pending = self.pending, []
+                self.urgent = False
+                closed = self.closed
+            if batch:
+                try:
+                    self.write(batch)
+                except OSError as e:
+                    self.error = e
+                with self.cond:
+                    self.written += len(batch)
+                    self.cond.notify_all()
+            if closed and not batch:
+                return
+
+    def write(self, batch):
+        lines = []
+        for item in batch:
+            if item[0] is _COMPACT or item[0] is _RESET:
+                self.append_lines(lines)
+                lines = []
+                # The base now holds everything journaled so far
+                if item[0] is _COMPACT:
+                    if item[1] is not None:
+                        self.store = WidgetStore.from_snapshot(item[1])
+                    elif self.store is None:
+                        self.store = self.rebuild()
+                    if self.store is not None:
+                        self.replace(self.autosave, self.dump(self.store))
+                        self.compactions += 1
+                        self.restart()
+                else:
+                    self.restart(item[1])
+                    if os.path.exists(self.autosave):
+                        os.remove(self.autosave)
+            else:
+                self.seq += 1
+                lines.append(json.dumps(item, separators=(',', ':')))
+                if self.store is not None:
+                    replay(self.store, (item,))
+        self.append_lines(lines)
+
+    def rebuild(self):
+        """The project as of the last record written, read back from disk; None if that fails."""
+        try:
+            return recover(self.project, self.load_base)
+        except RECOVER_ERRORS as e:
+            # Keep journaling; compaction waits for a base given by the builder
+            self.error = e
+            return None
+
+    def dump(self, store):
+        # One widget per chunk: a single json.dumps of a large project would
+        # hold the GIL, and with it the UI thread, until it was done
+        yield '{"widgets":['
+        for k, w in enumerate(store):
+            yield (',' if k else '') + json.dumps(w.to_dict(), separators=(',', ':'))
+        yield '],"z":['
+        z = store.z_list()
+        for k in range(0, len(z), 1000):
+            yield (',' if k else '') + json.dumps(z[k:k + 1000], separators=(',', ':'))[1:-1]
+        yield f'],"top":{json.dumps(store.top)},"seq":{self.seq}}}'
+
+    def restart(self, keys=None):
+        """Start an empty journal whose first record follows the last one written."""
+        header = ['n', self.seq + 1] if keys is None else ['n', self.seq + 1, keys]
+        self.replace(self.path, [json.dumps(header, separators=(',', ':')) + '\n'])
+
+    @staticmethod
+    def replace(path, chunks):
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def append_lines(self, lines):
+        if lines:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
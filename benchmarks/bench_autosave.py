@@ -0,0 +1,92 @@
+"""Event-loop stall with autosave off vs. on.
+
+Edits run as a chain of `after` callbacks (20 property edits and one
+drag per frame) while a probe scheduled every PROBE_MS records how late
+it fires. With autosave on, the journal writer thread encodes, appends,
+fsyncs and compacts during the run; the probe lag should barely move.
+
+Needs a display (run under Xvfb on headless machines):
+    python benchmarks/bench_autosave.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autosave import Journal
+from common import build
+
+FRAMES = 300
+EDITS_PER_FRAME = 20
+PROBE_MS = 5
+
+
+def run(app, root):
+    ids = app.widgets.ids()
+    lags = []
+    state = {'frame': 0, 'done': False}
+
+    def probe(expected):
+        now = time.perf_counter()
+        lags.append((now - expected) * 1000)
+        if not state['done']:
+            root.after(PROBE_MS, probe, now + PROBE_MS / 1000)
+
+    def frame():
+        f = state['frame']
+        for i in range(EDITS_PER_FRAME):
+            wid = ids[(f * EDITS_PER_FRAME + i) % len(ids)]
+            app.update_prop(wid, 'text', f"edit {f}-{i}")
+        app.move_widgets([ids[f % len(ids)]], 1, 1)
+        state['frame'] += 1
+        if state['frame'] < FRAMES:
+            root.after(1, frame)
+        else:
+            state['done'] = True
+
+    start = time.perf_counter()
+    root.after(PROBE_MS, probe, start + PROBE_MS / 1000)
+    root.after(1, frame)
+    while not state['done']:
+        root.update()
+    elapsed = (time.perf_counter() - start) * 1000
+    lags.sort()
+    return elapsed, lags[len(lags) // 2], lags[int(len(lags) * 0.99)], lags[-1]
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    root.withdraw()
+    workdir = tempfile.mkdtemp()
+    print(f"{'widgets':>8} {'autosave':>9} {'run ms':>8} {'lag p50':>8} {'lag p99':>8} "
+          f"{'lag max':>8} {'compactions':>12} {'drain ms':>9}")
+    try:
+        for n in (1000, 10000):
+            for autosave in (False, True):
+                app = build(root, n)
+                if autosave:
+                    app.journal = Journal(os.path.join(workdir, 'bench.json'))
+                elapsed, p50, p99, worst = run(app, root)
+                compactions = drain = 0
+                if app.journal is not None:
+                    start = time.perf_counter()
+                    app.journal.close()
+                    drain = (time.perf_counter() - start) * 1000
+                    compactions = app.journal.compactions
+                print(f"{n:>8} {'on' if autosave else 'off':>9} {elapsed:>8.0f} {p50:>8.2f} "
+                      f"{p99:>8.2f} {worst:>8.2f} {compactions:>12} {drain:>9.1f}")
+    finally:
+        shutil.rmtree(workdir)
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Batch export throughput and startup latency of export_cli.py.
+
+Builds a corpus of project files, runs the CLI in a subprocess and reports
+time from process start to the first result line and files per second,
+serially and with a process pool.
+
+    python benchmarks/bench_batch_export.py [--files 1000] [--widgets 200]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from common import scattered
+
+
+def make_corpus(directory, files, widgets):
+    rng = random.Random(11)
+    for n in range(files):
+        project = [w.to_dict() for w in scattered(widgets, 700, 500, rng)]
+        with open(os.path.join(directory, f'project{n:04d}.json'), 'w') as f:
+            json.dump(project, f, indent=2)
+
+
+def run_cli(corpus, out_dir, jobs):
+    cmd = [sys.executable, os.path.join(ROOT, 'export_cli.py'), corpus, '-o', out_dir, '-j', str(jobs)]
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    first = None
+    lines = 0
+    for _ in proc.stdout:
+        if first is None:
+            first = time.perf_counter() - start
+        lines += 1
+    proc.wait()
+    return first, time.perf_counter() - start, lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=1000)
+    parser.add_argument('--widgets', type=int, default=200)
+    args = parser.parse_args()
+
+    check = subprocess.run([sys.executable, '-c',
+                            "import sys, export_cli; sys.exit('tkinter' in sys.modules)"], cwd=ROOT)
+    print(f"export_cli imports tkinter: {'yes' if check.returncode else 'no'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, 'corpus')
+        os.makedirs(corpus)
+        make_corpus(corpus, args.files, args.widgets)
+        print(f"{args.files} projects x {args.widgets} widgets")
+        print(f"{'jobs':>5} {'first output ms':>16} {'total s':>8} {'files/s':>9}")
+        for jobs in sorted({1, 4, os.cpu_count() or 1}):
+            first, total, lines = run_cli(corpus, os.path.join(tmp, f'out{jobs}'), jobs)
+            print(f"{jobs:>5} {first * 1000:>16.1f} {total:>8.2f} {lines / total:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
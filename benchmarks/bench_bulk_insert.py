@@ -0,0 +1,60 @@
+"""Inserting many widgets: one add_widget call each vs. a single add_widgets batch.
+
+The per-widget path selects every new widget, redrawing the selection and
+rebinding the property panel each time; the batch selects once at the end.
+Also times duplicating a 1k-widget selection.
+
+Needs a display (run under Xvfb on headless machines):
+    python benchmarks/bench_bulk_insert.py
+"""
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import TYPES, fresh, specs
+
+
+def one_by_one(app, root, n):
+    start = time.perf_counter()
+    for i in range(n):
+        app.add_widget(TYPES[i % len(TYPES)])
+    root.update_idletasks()
+    return (time.perf_counter() - start) * 1000
+
+
+def batched(app, root, n):
+    start = time.perf_counter()
+    app.add_widgets(specs(n))
+    root.update_idletasks()
+    return (time.perf_counter() - start) * 1000
+
+
+def duplicate(app, root, n):
+    app.add_widgets(specs(n), select='all')
+    start = time.perf_counter()
+    app.duplicate_selection()
+    root.update_idletasks()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    root.withdraw()
+    print(f"{'widgets':>8} {'add_widget ms':>14} {'add_widgets ms':>15} {'duplicate ms':>13}")
+    for n in (100, 1000, 10000):
+        single = one_by_one(fresh(root), root, n)
+        batch = batched(fresh(root), root, n)
+        dup = duplicate(fresh(root), root, min(n, 1000))
+        print(f"{n:>8} {single:>14.1f} {batch:>15.1f} {dup:>13.1f}")
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
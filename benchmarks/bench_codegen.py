@@ -0,0 +1,98 @@
+"""Export cost: legacy string concatenation vs. the streaming, cached generator.
+
+Run from the repository root:  python benchmarks/bench_codegen.py
+"""
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codegen import HEADER, CodeGenerator
+from common import ms, scattered_store
+
+
+def legacy_generate(widgets):
+    # The pre-codegen.py implementation, kept for comparison
+    code = HEADER
+    for i, w in enumerate(widgets):
+        var = f"{w['type'].lower()}{i+1}"
+        code += f"# {w['type']}\n"
+        if w['type'] == 'Label':
+            code += f"{var} = ctk.CTkLabel(root, text=\"{w['text']}\", "
+            code += f"font=(\"{w['font']}\", {w['font_size']}), fg_color=\"{w['bg_color']}\", "
+            code += f"text_color=\"{w['text_color']}\", corner_radius={w['corner_radius']})\n"
+        elif w['type'] == 'Button':
+            code += f"{var} = ctk.CTkButton(root, text=\"{w['text']}\", "
+            code += f"font=(\"{w['font']}\", {w['font_size']}), fg_color=\"{w['fg_color']}\", "
+            code += f"hover_color=\"{w['hover_color']}\", corner_radius={w['corner_radius']}, "
+            code += f"width={w['width']}, height={w['height']})\n"
+        elif w['type'] == 'Entry':
+            code += f"{var} = ctk.CTkEntry(root, font=(\"{w['font']}\", {w['font_size']}), "
+            code += f"corner_radius={w['corner_radius']}, width={w['width']})\n"
+        elif w['type'] == 'Text':
+            code += f"{var} = ctk.CTkTextbox(root, font=(\"{w['font']}\", {w['font_size']}), "
+            code += f"corner_radius={w['corner_radius']}, width={w['width']}, height={w['height']*2})\n"
+        elif w['type'] == 'Checkbutton':
+            code += f"{var} = ctk.CTkCheckBox(root, text=\"{w['text']}\", "
+            code += f"font=(\"{w['font']}\", {w['font_size']}), fg_color=\"{w['fg_color']}\")\n"
+        elif w['type'] == 'Radiobutton':
+            code += f"{var} = ctk.CTkRadioButton(root, text=\"{w['text']}\", "
+            code += f"font=(\"{w['font']}\", {w['font_size']}), fg_color=\"{w['fg_color']}\")\n"
+        elif w['type'] == 'Frame':
+            code += f"{var} = ctk.CTkFrame(root, fg_color=\"{w['bg_color']}\", "
+            code += f"corner_radius={w['corner_radius']}, width={w['width']}, height={w['height']})\n"
+        elif w['type'] == 'Scale':
+            code += f"{var} = ctk.CTkSlider(root, fg_color=\"{w['fg_color']}\", width={w['width']})\n"
+        elif w['type'] == 'Progressbar':
+            code += f"{var} = ctk.CTkProgressBar(root, fg_color=\"{w['fg_color']}\", "
+            code += f"corner_radius={w['corner_radius']}, width={w['width']})\n{var}.set(0.5)\n"
+        code += f"{var}.place(x={w['x']}, y={w['y']})\n\n"
+    code += "root.mainloop()\n"
+    return code
+
+
+def peak_mb(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), 'export.py')
+    print(f"{'widgets':>8} {'legacy ms':>10} {'legacy MB':>10} {'stream ms':>10} "
+          f"{'stream MB':>10} {'re-export ms':>13}")
+    for n in (1000, 10000, 50000):
+        store = scattered_store(n, 700, 500, random.Random(3))
+
+        def legacy():
+            with open(path, 'w') as f:
+                f.write(legacy_generate(store))
+
+        gen = CodeGenerator()
+
+        def stream():
+            with open(path, 'w') as f:
+                gen.write(store, f)
+
+        legacy_ms, _ = ms(legacy)
+        legacy_mb = peak_mb(legacy)
+        with open(path) as f:
+            expected = f.read()
+        stream_ms, _ = ms(stream)
+        with open(path) as f:
+            assert f.read() == expected, "output differs from legacy generator"
+        store.get(n // 2)['x'] += 1
+        again_ms, _ = ms(stream)
+        # Peak includes the fragment cache the generator keeps between exports
+        stream_mb = peak_mb(stream)
+        print(f"{n:>8} {legacy_ms:>10.1f} {legacy_mb:>10.2f} {stream_ms:>10.1f} "
+              f"{stream_mb:>10.2f} {again_ms:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Per-frame drag cost: legacy redraw-per-event vs. the tag/move drag engine.
+
+Needs a display (run under Xvfb on headless machines):
+    python benchmarks/bench_drag.py
+"""
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import build
+
+FRAMES = 120
+EVENTS_PER_FRAME = 4  # ~240 Hz pointer vs. 60 Hz display
+
+
+def legacy_frames(app, root, group):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for _ in range(EVENTS_PER_FRAME):
+            for data in group:
+                data['x'] += 1
+                data['y'] += 1
+                app.draw_widget(data)
+        root.update_idletasks()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def engine_frames(app, root, group):
+    first = group[0]
+    x, y = first['x'] + 5, first['y'] + 5
+    app.drag.start([d['id'] for d in group], x, y)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for _ in range(EVENTS_PER_FRAME):
+            x += 1
+            y += 1
+            app.drag.motion(x, y)
+        app.drag.flush()
+        root.update_idletasks()
+    elapsed = (time.perf_counter() - start) / FRAMES * 1000
+    app.drag.release()
+    return elapsed
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    root.withdraw()
+    print(f"{'widgets':>8} {'group':>6} {'legacy ms/frame':>16} {'engine ms/frame':>16}")
+    for n in (100, 1000, 5000):
+        for size in (1, 20):
+            app = build(root, n)
+            group = list(app.widgets)[:size]
+            legacy = legacy_frames(app, root, group)
+            engine = engine_frames(app, root, group)
+            print(f"{n:>8} {size:>6} {legacy:>16.3f} {engine:>16.3f}")
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
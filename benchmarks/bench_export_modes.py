@@ -0,0 +1,87 @@
+"""Exported program size, compile time and start time: unrolled vs. compact.
+
+Projects are forms of Frames, each holding a grid of labels, entries and
+buttons. "compile ms" is byte-compiling the generated file; "start ms"
+runs it in a fresh interpreter up to the point it would enter mainloop
+(needs customtkinter and a display, run under Xvfb on headless machines;
+skipped otherwise). With --defer-frames, Frame contents are only built
+when the frame is shown, which happens after mainloop starts.
+
+    python benchmarks/bench_export_modes.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codegen import CodeGenerator, CompactGenerator
+from model import Widget
+
+CHILDREN = [('Label', 150, 35), ('Entry', 150, 35), ('Button', 150, 35)]
+PER_FRAME = 24
+
+# Run a generated program up to mainloop, then report how long that took
+STARTER = """
+import sys, time
+start = time.perf_counter()
+import customtkinter
+customtkinter.CTk.mainloop = lambda self: print((time.perf_counter() - start) * 1000)
+source = open(sys.argv[1]).read()
+exec(compile(source, sys.argv[1], 'exec'), {'__name__': '__main__'})
+"""
+
+
+def form(n):
+    widgets = []
+    frame_w, frame_h = 3 * 170 + 20, (PER_FRAME // 3) * 45 + 20
+    frames = max(1, n // (PER_FRAME + 1))
+    for f in range(frames):
+        fx, fy = 10 + (f % 4) * (frame_w + 10), 10 + (f // 4) * (frame_h + 10)
+        widgets.append(Widget(len(widgets) + 1, 'Frame', x=fx, y=fy, width=frame_w, height=frame_h))
+        for c in range(PER_FRAME):
+            kind, w, h = CHILDREN[c % 3]
+            widgets.append(Widget(len(widgets) + 1, kind, text=f"{kind} {c}", width=w, height=h,
+                                  x=fx + 10 + (c % 3) * 170, y=fy + 10 + (c // 3) * 45))
+    return widgets
+
+
+def start_ms(path):
+    try:
+        out = subprocess.run([sys.executable, '-c', STARTER, path], capture_output=True,
+                             text=True, timeout=600)
+    except subprocess.TimeoutExpired:
+        return None
+    if out.returncode != 0 or not out.stdout.strip():
+        return None
+    return float(out.stdout.split()[-1])
+
+
+def main():
+    modes = [('unrolled', CodeGenerator), ('compact', CompactGenerator),
+             ('deferred', lambda: CompactGenerator(defer_frames=True))]
+    print(f"{'widgets':>8} {'mode':<9} {'gen ms':>7} {'file KB':>8} {'compile ms':>11} {'start ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (100, 1000, 10000):
+            widgets = form(n)
+            for name, make in modes:
+                path = os.path.join(tmp, f'{name}_{n}.py')
+                start = time.perf_counter()
+                with open(path, 'w') as f:
+                    make().write(widgets, f)
+                gen = (time.perf_counter() - start) * 1000
+                with open(path) as f:
+                    source = f.read()
+                start = time.perf_counter()
+                compile(source, path, 'exec')
+                comp = (time.perf_counter() - start) * 1000
+                started = start_ms(path)
+                started = f"{started:>9.0f}" if started is not None else f"{'skipped':>9}"
+                print(f"{len(widgets):>8} {name:<9} {gen:>7.1f} {len(source) / 1024:>8.1f} "
+                      f"{comp:>11.1f} {started}")
+
+
+if __name__ == '__main__':
+    main()
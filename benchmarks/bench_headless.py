@@ -0,0 +1,277 @@
+"""Hot-path regression suite that runs without a display.
+
+Drives PyGUIBuilder through scripted workloads on top of the recording
+stand-in from headless.py: bulk add, select storms, long drags, typing
+into the property panel, save/load and export, at 100, 1k and 10k
+widgets. Every workload goes through the same entry points a user would
+hit (canvas bindings, the inspector, save/open/export with the file
+dialog answered). For each it reports
+
+    ms          wall time for the whole workload
+    ops/action  design-canvas calls per user action (create, coords,
+                itemconfigure, delete, ...); deterministic
+    alloc KB    tracemalloc peak above the starting point; measured in a
+                second run so tracing doesn't skew the wall time
+
+and compares them with headless_baseline.json. It also checks that
+autosave recovers a project saved as .json, .pgb and .pgdb in the order
+the builder shows. Counts may grow by
+OPS_SLACK, allocations by ALLOC_SLACK and wall time by TIME_SLACK (a
+generous factor, since CI machines differ) before a result counts as a
+regression; any regression or failed check makes the exit status 1.
+
+    python benchmarks/bench_headless.py                  # run and check
+    python benchmarks/bench_headless.py --no-time        # ignore wall time
+    python benchmarks/bench_headless.py --update         # record a new baseline
+    python benchmarks/bench_headless.py --sizes 100 1000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import headless
+
+headless.install()
+
+from autosave import Journal, recover
+from common import TYPES
+from hittest import widget_bounds
+from main import PyGUIBuilder
+
+BASELINE = os.path.join(HERE, 'headless_baseline.json')
+SIZES = (100, 1000, 10000)
+OPS_SLACK = 1.10
+ALLOC_SLACK = 1.25
+TIME_SLACK = 3.0
+CLICKS = 300
+DRAG_STEPS = 400
+DRAG_GROUP = 10
+KEYSTROKES = 200
+# Saved projects and exports; removed at exit
+WORKDIR = tempfile.TemporaryDirectory()
+
+
+def layout(n):
+    # A tidy grid, like a long form; most of it is outside the viewport
+    cols = max(10, int(n ** 0.5))
+    return [{'type': TYPES[i % len(TYPES)], 'text': f"Item {i}",
+             'x': 20 + (i % cols) * 180, 'y': 20 + (i // cols) * 60} for i in range(n)]
+
+
+def fresh(n):
+    root = headless.Tk()
+    app = PyGUIBuilder(root, autosave=False)
+    if n:
+        app.add_widgets(layout(n), select=False)
+    root.update()
+    return app
+
+
+def event_at(app, wid, dx=0, dy=0, state=0):
+    x1, y1, x2, y2 = widget_bounds(app.widgets.get(wid))
+    z, c = app.renderer.zoom, app.canvas
+    return headless.Event(x=(x1 + x2) / 2 * z + dx - c.xoffset,
+                          y=(y1 + y2) / 2 * z + dy - c.yoffset, state=state)
+
+
+def click(app, event):
+    binds = app.canvas.bindings
+    binds['<Button-1>'](event)
+    binds['<ButtonRelease-1>'](event)
+    app.root.update()
+
+
+# Workloads: set up on `app`, return a callable that performs the user
+# actions and returns how many there were.
+
+def bulk_add(app, n):
+    specs = layout(n)
+
+    def run():
+        app.add_widgets(specs)
+        app.root.update()
+        return n
+    return run
+
+
+def select_storm(app, n):
+    ids = app.widgets.ids()
+    # Alternate plain clicks with shift-clicks that grow the selection
+    picks = [ids[(i * 7919) % len(ids)] for i in range(CLICKS)]
+
+    def run():
+        for i, wid in enumerate(picks):
+            click(app, event_at(app, wid, state=0x0001 if i % 3 else 0))
+        return len(picks)
+    return run
+
+
+def long_drag(app, n):
+    ids = app.widgets.ids()[:DRAG_GROUP]
+    app.selected_ids = list(ids)
+    app.draw_selection()
+    binds = app.canvas.bindings
+    app.snap_var.set(True)
+
+    def run():
+        # A plain press on a selected widget drags the whole selection
+        binds['<Button-1>'](event_at(app, ids[0]))
+        for step in range(DRAG_STEPS):
+            binds['<B1-Motion>'](event_at(app, ids[0], dx=step, dy=step // 2))
+            app.root.update()
+        binds['<ButtonRelease-1>'](event_at(app, ids[0], dx=DRAG_STEPS, dy=DRAG_STEPS // 2))
+        app.root.update()
+        return DRAG_STEPS + 2
+    return run
+
+
+def typing(app, n):
+    wid = app.widgets.ids()[0]
+    app.select_widget(app.widgets.get(wid))
+    text = "The quick brown fox jumps over the lazy dog " * 5
+
+    def run():
+        # What the panel's <KeyRelease> handler does for each keystroke
+        for i in range(1, KEYSTROKES + 1):
+            app.inspector.apply('text', text[:i])
+            app.root.update()
+        return KEYSTROKES
+    return run
+
+
+def save_load(app, n):
+    paths = [os.path.join(WORKDIR.name, f'project{ext}') for ext in ('.json', '.pgb', '.pgdb')]
+
+    def run():
+        for path in paths:
+            headless.answers['save'] = path
+            app.save_project()
+            app.open_project(path)
+            app.finish_loading()
+            app.root.update()
+        return 2 * len(paths)
+    return run
+
+
+def export(app, n):
+    def run():
+        for compact in (False, True):
+            headless.answers['save'] = os.path.join(WORKDIR.name, f'export_{compact}.py')
+            app.compact_var.set(compact)
+            app.export_code()
+        return 2
+    return run
+
+
+WORKLOADS = [('bulk_add', bulk_add, True), ('select_storm', select_storm, False),
+             ('long_drag', long_drag, False), ('typing', typing, False),
+             ('save_load', save_load, False), ('export', export, False)]
+
+
+def recovered_order():
+    """Edits after a save must recover in the order the builder shows."""
+    found = []
+    for ext in ('.json', '.pgb', '.pgdb'):
+        path = os.path.join(WORKDIR.name, f'recover{ext}')
+        app = fresh(0)
+        app.journal = Journal(path, app.read_project)
+        first, second, _ = app.add_widgets(layout(3))
+        app.delete_widget(first['id'])
+        headless.answers['save'] = path
+        app.save_project()
+        # Undoing brings the widget back under its key from before the save
+        app.delete_widget(second['id'])
+        app.undo()
+        app.journal.flush()
+        order = recover(path, app.read_project).ids()
+        if order != app.widgets.ids():
+            found.append(f"recover{ext}: order {order} != {app.widgets.ids()}")
+        app.journal.close()
+        app.close_db()
+    return found
+
+
+def measure(workload, empty, n):
+    app = fresh(0 if empty else n)
+    run = workload(app, n)
+    before = sum(app.canvas.ops.values())
+    start = time.perf_counter()
+    actions = run()
+    elapsed = (time.perf_counter() - start) * 1000
+    ops = sum(app.canvas.ops.values()) - before
+
+    app = fresh(0 if empty else n)
+    run = workload(app, n)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'ms': round(elapsed, 1), 'ops_per_action': round(ops / actions, 2),
+            'alloc_kb': round((peak - base) / 1024, 1)}
+
+
+def regressions(key, result, baseline, check_time):
+    old = baseline.get(key)
+    if old is None:
+        return []
+    found = []
+    limits = [('ops_per_action', OPS_SLACK), ('alloc_kb', ALLOC_SLACK)]
+    if check_time:
+        limits.append(('ms', TIME_SLACK))
+    for metric, slack in limits:
+        # The +1 keeps tiny values from failing on noise
+        if result[metric] > old[metric] * slack + 1:
+            found.append(f"{key} {metric}: {result[metric]} > {old[metric]} x {slack}")
+    return found
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    ap.add_argument('--only', nargs='+', choices=[name for name, _, _ in WORKLOADS])
+    ap.add_argument('--update', action='store_true', help="write the results as the new baseline")
+    ap.add_argument('--no-time', action='store_true', help="don't check wall time")
+    args = ap.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+    results, failures = {}, recovered_order()
+    print(f"recover order: {'FAILED' if failures else 'ok'}")
+    print(f"{'workload':<13} {'widgets':>8} {'ms':>9} {'ops/action':>11} {'alloc KB':>9}")
+    for name, workload, empty in WORKLOADS:
+        if args.only and name not in args.only:
+            continue
+        for n in args.sizes:
+            key = f"{name}/{n}"
+            result = results[key] = measure(workload, empty, n)
+            found = regressions(key, result, baseline, not args.no_time)
+            failures += found
+            print(f"{name:<13} {n:>8} {result['ms']:>9.1f} {result['ops_per_action']:>11.2f} "
+                  f"{result['alloc_kb']:>9.1f}{'  REGRESSED' if found else ''}")
+
+    if args.update:
+        baseline.update(results)
+        with open(BASELINE, 'w') as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write('\n')
+        print(f"baseline written to {BASELINE}")
+        return 0
+    for failure in failures:
+        print(f"regression: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Undo/redo cost and history memory on growing projects.
+
+A single undo should cost the same at 100 or 10k widgets, whether it
+reverts a property edit or a delete from the middle of the stack, and
+typing thousands of characters into one field should leave a single step.
+Jumping back over 2000 light steps (property edits) should just replay
+them, while jumping over heavy ones (mass duplicate/delete) should use a
+snapshot when that is cheaper. Both are timed with and without snapshots.
+
+Before timing, a seeded random walk of adds, deletes, undos, redos and
+jumps checks that the project keeps the stacking order a plain list of
+ids would have at every step.
+
+Needs a display (run under Xvfb on headless machines):
+    python benchmarks/bench_history.py
+"""
+import os
+import random
+import sys
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import build, fresh, ms
+
+EDITS = 2000
+WALK = 3000
+
+
+def jump_back(app):
+    """Time returning to step 0 by pure replay, then with snapshots."""
+    history = app.history
+    end = history.step
+    snapshots, history.snapshots = history.snapshots, {}
+    replay, _ = ms(lambda: history.jump(0))
+    history.jump(end)
+    history.snapshots = snapshots
+    auto, _ = ms(lambda: history.jump(0))
+    history.jump(end)
+    return replay, auto
+
+
+def check_order(root, seed=0):
+    """Random edits and history moves must keep the order a list model has."""
+    rng = random.Random(seed)
+    app = fresh(root)
+    history = app.history
+    # Frequent snapshots, so long jumps restore one and replay across it
+    history.snapshot_every = 5
+    orders = [[]]
+    for _ in range(WALK):
+        ids = app.widgets.ids()
+        # An edit replaces the redo tail with the order it leaves
+        tail = history.step - history.base + 1
+        r = rng.random()
+        if not ids or r < 0.2 and len(ids) <= 60:
+            added = app.add_widgets([{'type': 'Label'}] * rng.choice((1, 1, 3, 40)), select=None)
+            orders[tail:] = [ids + [data.id for data in added]]
+        elif r < 0.35:
+            # Mostly single deletes; mass deletes keep the project small,
+            # so restoring a snapshot stays cheaper than long replays
+            gone = set(rng.sample(ids, 1 if len(ids) <= 60 else len(ids) // 2))
+            with history.batch():
+                for wid in gone:
+                    app.delete_widget(wid)
+            orders[tail:] = [[wid for wid in ids if wid not in gone]]
+        elif r < 0.6:
+            for _ in range(rng.randint(1, 4)):
+                app.undo()
+        elif r < 0.8:
+            for _ in range(rng.randint(1, 4)):
+                app.redo()
+        else:
+            history.jump(rng.randint(history.base, history.base + len(history.log)))
+        expected = orders[history.step - history.base]
+        assert app.widgets.ids() == expected, f"order {app.widgets.ids()} != {expected}"
+        depth = app.hit_index.entries
+        assert sorted(depth, key=lambda wid: depth[wid][1]) == expected, "canvas order differs"
+        del orders[:len(orders) - len(history.log) - 1]
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    root.withdraw()
+    for seed in range(3):
+        check_order(root, seed)
+    print(f"{'widgets':>8} {'undo ms':>8} {'undo del ms':>12} {'history KB':>11} {'typing steps':>13} "
+          f"{'light replay':>13} {'light auto':>11} {'heavy replay':>13} {'heavy auto':>11}")
+    for n in (100, 1000, 10000):
+        app = build(root, n)
+        app.history.clear()
+        ids = app.widgets.ids()
+        for i in range(EDITS):
+            app.update_prop(ids[0], 'text', 'x' * (i + 1))
+        typing = app.history.stats()['steps']
+
+        # Edits on alternating widgets never merge: one step each
+        app.history.clear()
+        for i in range(EDITS):
+            app.update_prop(ids[i % len(ids)], 'width', 100 + i % 50)
+        kb = app.history.bytes / 1024
+        undo, _ = ms(app.undo)
+        app.redo()
+        light = jump_back(app)
+
+        app.delete_widget(ids[len(ids) // 2])
+        undo_delete, _ = ms(app.undo)
+
+        # Heavy steps: select 50 widgets, duplicate them, delete the copies
+        app.history.clear()
+        app.selected_ids = ids[:50]
+        for _ in range(EDITS // 10):
+            copies = app.duplicate_selection()
+            with app.history.batch():
+                for data in copies:
+                    app.delete_widget(data['id'])
+            app.selected_ids = ids[:50]
+        heavy = jump_back(app)
+        print(f"{n:>8} {undo:>8.3f} {undo_delete:>12.3f} {kb:>11.0f} {typing:>13} "
+              f"{light[0]:>13.1f} {light[1]:>11.1f} {heavy[0]:>13.1f} {heavy[1]:>11.1f}")
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
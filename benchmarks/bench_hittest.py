@@ -0,0 +1,62 @@
+"""Click hit-test latency: legacy item scan vs. the spatial index.
+
+Run from the repository root:  python benchmarks/bench_hittest.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import scattered
+from hittest import SpatialIndex, widget_bounds
+
+CLICKS = 2000
+
+
+def make_widgets(n, rng):
+    # Spread the widgets so density stays roughly constant as n grows
+    side = int((n ** 0.5) * 120) + 200
+    # Dicts, like the widgets the legacy scan was written for
+    return [w.to_dict() for w in scattered(n, side, side, rng)]
+
+
+def legacy_click(widgets, canvas_widgets, item):
+    # Mirrors the old on_canvas_click after find_closest returned `item`
+    for wid, items in canvas_widgets.items():
+        if item in items:
+            return next((w for w in widgets if w['id'] == wid), None)
+
+
+def indexed_click(index, by_id, x, y):
+    wid = index.topmost(x, y)
+    return by_id.get(wid)
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'widgets':>8} {'legacy us/click':>16} {'indexed us/click':>17}")
+    for n in (10, 100, 1000, 10000):
+        widgets = make_widgets(n, rng)
+        by_id = {w['id']: w for w in widgets}
+        canvas_widgets = {w['id']: [w['id'] * 3, w['id'] * 3 + 1] for w in widgets}
+        index = SpatialIndex()
+        for w in widgets:
+            index.insert(w['id'], widget_bounds(w))
+
+        targets = [rng.choice(widgets) for _ in range(CLICKS)]
+        start = time.perf_counter()
+        for w in targets:
+            legacy_click(widgets, canvas_widgets, w['id'] * 3 + 1)
+        legacy = (time.perf_counter() - start) / CLICKS * 1e6
+
+        start = time.perf_counter()
+        for w in targets:
+            indexed_click(index, by_id, w['x'] + 5, w['y'] + 5)
+        indexed = (time.perf_counter() - start) / CLICKS * 1e6
+        print(f"{n:>8} {legacy:>16.2f} {indexed:>17.2f}")
+
+
+if __name__ == '__main__':
+    main()
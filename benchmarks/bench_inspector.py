@@ -0,0 +1,60 @@
+"""Selection-switch latency: rebuilding the property panel vs. rebinding it.
+
+The rebuild column destroys the panel and constructs every editor again,
+which is what show_props used to do on each selection change.
+
+Needs a display (run under Xvfb on headless machines):
+    python benchmarks/bench_inspector.py
+"""
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import TYPES, build
+from inspector import PropertyInspector
+
+SWITCHES = 200
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    root.withdraw()
+    app = build(root, len(TYPES) * 4)
+    widgets = list(app.widgets)
+
+    start = time.perf_counter()
+    for i in range(SWITCHES):
+        for child in app.props_frame.winfo_children():
+            child.destroy()
+        app.inspector = PropertyInspector(app.props_frame, app)
+        app.inspector.show([widgets[i % len(widgets)]])
+        root.update_idletasks()
+    rebuild = (time.perf_counter() - start) / SWITCHES * 1000
+
+    start = time.perf_counter()
+    for i in range(SWITCHES):
+        app.inspector.show([widgets[i % len(widgets)]])
+        root.update_idletasks()
+    rebind = (time.perf_counter() - start) / SWITCHES * 1000
+
+    start = time.perf_counter()
+    for i in range(SWITCHES):
+        app.inspector.show(widgets[i % 9:i % 9 + 5])
+        root.update_idletasks()
+    multi = (time.perf_counter() - start) / SWITCHES * 1000
+
+    print(f"rebuild panel     : {rebuild:7.3f} ms/switch")
+    print(f"rebind inspector  : {rebind:7.3f} ms/switch")
+    print(f"rebind, 5 selected: {multi:7.3f} ms/switch")
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
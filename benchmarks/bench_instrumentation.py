@@ -0,0 +1,82 @@
+"""Cost of the profiler: per-call wrapper overhead, and an editing session off vs. on.
+
+"call ns" times a trivial method called plain and through the profiler's
+timing wrapper (no display needed). The session columns run FRAMES
+frames of property edits and a move on a project of n widgets with the
+profiler off, then on (which also runs tracemalloc, the larger share of
+the cost).
+
+Needs a display for the session columns (run under Xvfb on headless machines):
+    python benchmarks/bench_instrumentation.py
+"""
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import build
+from perf import Profiler
+
+CALLS = 200000
+FRAMES = 200
+EDITS_PER_FRAME = 20
+
+
+class Target:
+    def method(self, x):
+        return x
+
+
+def call_ns():
+    target = Target()
+    profiler = Profiler(None)
+    timings = []
+    for wrapped in (False, True):
+        if wrapped:
+            target.method = profiler.timed('method', target.method)
+        method = target.method
+        start = time.perf_counter()
+        for i in range(CALLS):
+            method(i)
+        timings.append((time.perf_counter() - start) / CALLS * 1e9)
+    return timings
+
+
+def session(root, n, profiled):
+    app = build(root, n)
+    root.update()
+    if profiled:
+        app.profiler.start()
+    ids = app.widgets.ids()
+    start = time.perf_counter()
+    for f in range(FRAMES):
+        for i in range(EDITS_PER_FRAME):
+            app.update_prop(ids[(f * EDITS_PER_FRAME + i) % len(ids)], 'text', f"edit {f}-{i}")
+        app.move_widgets([ids[f % len(ids)]], 1, 1)
+        root.update()
+    elapsed = (time.perf_counter() - start) * 1000
+    app.profiler.stop()
+    return elapsed
+
+
+def main():
+    plain, wrapped = call_ns()
+    print(f"call ns: plain {plain:.0f}, timed {wrapped:.0f}")
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    root.withdraw()
+    print(f"{'widgets':>8} {'off ms':>8} {'on ms':>8} {'overhead':>9}")
+    for n in (100, 1000, 10000):
+        off = session(root, n, False)
+        on = session(root, n, True)
+        print(f"{n:>8} {off:>8.1f} {on:>8.1f} {(on / off - 1) * 100:>8.1f}%")
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
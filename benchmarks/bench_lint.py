@@ -0,0 +1,85 @@
+"""Layout lint time: sweep-line overlap search vs. checking every pair.
+
+Three layouts per size: a tidy grid (few findings), widgets scattered at
+random (thousands of overlaps) and a single-column form inside one Frame,
+whose height spans the whole form. The pairwise column is skipped at 10k
+widgets, where it would take minutes. Where it runs, the sweep must find
+the same pairs; at every size both sweeps (sorted window and max-bottom
+tree) must return the same pairs in the same order, and boxes with no
+width or height must overlap nothing.
+
+    python benchmarks/bench_lint.py
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import common
+from common import ms
+from hittest import widget_bounds
+from lint import lint, overlapping_pairs, tree_sweep, window_sweep
+from model import Widget
+
+PAIRWISE_LIMIT = 1000
+
+
+def grid(n):
+    return common.grid(n, int(n ** 0.5) + 1, origin=20)
+
+
+def scattered(n):
+    side = int(60 * n ** 0.5)
+    return common.scattered(n, side, side, random.Random(3))
+
+
+def framed(n):
+    rows = common.grid(n - 1, 1, origin=40)
+    return [Widget(n, 'Frame', x=20, y=20, width=190, height=(n - 1) * 90 + 40)] + rows
+
+
+def pairwise(boxes):
+    return [(i, j) for i in range(len(boxes)) for j in range(i + 1, len(boxes))
+            if boxes[i][0] < boxes[j][2] and boxes[j][0] < boxes[i][2]
+            and boxes[i][1] < boxes[j][3] and boxes[j][1] < boxes[i][3]]
+
+
+def check_empty_boxes():
+    # Lines and points inside a box, and a box only touching it, are no overlap
+    boxes = [(0, 0, 100, 100), (10, 10, 10, 90), (20, 50, 80, 50), (40, 40, 40, 40),
+             (100, 0, 200, 100), (0, 100, 100, 150), (50, 20, 60, 30)]
+    assert overlapping_pairs(boxes) == [(0, 6)], overlapping_pairs(boxes)
+
+
+def check_sweeps_agree(boxes):
+    order = sorted(range(len(boxes)), key=boxes.__getitem__)
+    max_h = max(b[3] - b[1] for b in boxes)
+    assert window_sweep(boxes, order, max_h) == tree_sweep(boxes, order)
+
+
+def main():
+    check_empty_boxes()
+    print(f"{'widgets':>8} {'layout':<10} {'lint ms':>8} {'issues':>7} {'sweep ms':>9} "
+          f"{'pairwise ms':>12} {'overlaps':>9}")
+    for n in (100, 1000, 10000):
+        for name, make in (('grid', grid), ('scattered', scattered), ('framed', framed)):
+            widgets = make(n)
+            # The window is sized to the layout so only real mistakes are out of bounds
+            window = (max(w.x for w in widgets) + 300, max(w.y for w in widgets) + 300)
+            lint_ms, issues = ms(lambda: lint(widgets, window))
+            boxes = [widget_bounds(w) for w in widgets]
+            sweep_ms, pairs = ms(lambda: overlapping_pairs(boxes))
+            check_sweeps_agree(boxes)
+            if n <= PAIRWISE_LIMIT:
+                brute_ms, brute = ms(lambda: pairwise(boxes))
+                assert brute == sorted((min(p), max(p)) for p in pairs)
+                brute = f"{brute_ms:>12.1f}"
+            else:
+                brute = f"{'-':>12}"
+            print(f"{n:>8} {name:<10} {lint_ms:>8.1f} {len(issues):>7} {sweep_ms:>9.1f} "
+                  f"{brute} {len(pairs):>9}")
+
+
+if __name__ == '__main__':
+    main()
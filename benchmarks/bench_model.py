@@ -0,0 +1,67 @@
+"""Memory and lookup cost of the widget store vs. the old list of dicts.
+
+Run from the repository root:  python benchmarks/bench_model.py
+"""
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import scattered
+from model import WidgetStore
+
+COUNT = 50_000
+LOOKUPS = 2000
+
+
+def project_json(n):
+    return json.dumps([w.to_dict() for w in scattered(n, 2000, 2000, random.Random(7))])
+
+
+def measure(build, text):
+    tracemalloc.start()
+    obj = build(text)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current
+
+
+def main():
+    text = project_json(COUNT)
+    dicts, dict_bytes = measure(json.loads, text)
+    store, store_bytes = measure(lambda t: WidgetStore.from_list(json.loads(t)), text)
+
+    print(f"{COUNT} widgets")
+    print(f"  list of dicts : {dict_bytes / 1e6:8.2f} MB  ({dict_bytes / COUNT:6.0f} B/widget)")
+    print(f"  WidgetStore   : {store_bytes / 1e6:8.2f} MB  ({store_bytes / COUNT:6.0f} B/widget)")
+
+    rng = random.Random(1)
+    ids = [rng.randrange(1, COUNT + 1) for _ in range(LOOKUPS)]
+    start = time.perf_counter()
+    for wid in ids:
+        next((w for w in dicts if w['id'] == wid), None)
+    scan = (time.perf_counter() - start) / LOOKUPS * 1e6
+    start = time.perf_counter()
+    for wid in ids:
+        store.get(wid)
+    indexed = (time.perf_counter() - start) / LOOKUPS * 1e6
+    print(f"  lookup by id  : scan {scan:9.2f} us   store {indexed:6.3f} us")
+
+    victims = ids[:200]
+    start = time.perf_counter()
+    for wid in victims:
+        dicts = [w for w in dicts if w['id'] != wid]
+    rebuild = (time.perf_counter() - start) / len(victims) * 1e6
+    start = time.perf_counter()
+    for wid in victims:
+        store.remove(wid)
+    removed = (time.perf_counter() - start) / len(victims) * 1e6
+    print(f"  delete        : rebuild {rebuild:6.0f} us   store {removed:6.3f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Edit-to-preview latency: live patches vs. reloading vs. exporting and relaunching.
+
+"relaunch ms" is what checking an edit cost before: write the export and
+start a fresh interpreter that imports customtkinter and builds every
+widget. "reload ms" re-runs the program inside the running preview
+(adds, removes, loads). "patch" is the round trip of one property edit,
+typed into the builder, to the preview child having applied and drawn it.
+
+Needs customtkinter and a display (run under Xvfb on headless machines):
+    python benchmarks/bench_preview.py
+"""
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import fresh
+
+TYPES = ['Label', 'Button', 'Entry', 'Checkbutton', 'Radiobutton', 'Frame', 'Scale', 'Progressbar']
+EDITS = 200
+TIMEOUT = 60
+
+# Run an export up to mainloop, then report how long that took
+STARTER = """
+import sys, time
+start = time.perf_counter()
+import customtkinter
+def mainloop(self):
+    self.update()
+    print((time.perf_counter() - start) * 1000)
+customtkinter.CTk.mainloop = mainloop
+exec(compile(open(sys.argv[1]).read(), sys.argv[1], 'exec'), {'__name__': '__main__'})
+"""
+
+
+def relaunch_ms(app, path):
+    start = time.perf_counter()
+    with open(path, 'w') as f:
+        app.codegen.write(app.widgets, f)
+    subprocess.run([sys.executable, '-c', STARTER, path], capture_output=True, check=True,
+                   timeout=TIMEOUT)
+    return (time.perf_counter() - start) * 1000
+
+
+def wait_for(root, preview, acked):
+    deadline = time.perf_counter() + TIMEOUT
+    while preview.acked < acked:
+        if not preview.running or time.perf_counter() > deadline:
+            raise RuntimeError("preview stopped: " + ''.join(preview.stderr))
+        root.update()
+        time.sleep(0.0005)
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    if importlib.util.find_spec('customtkinter') is None:
+        print("skipped: customtkinter is not installed")
+        return
+    root.withdraw()
+    tmp = tempfile.mkdtemp()
+    print(f"{'widgets':>8} {'relaunch ms':>12} {'reload ms':>10} {'patch p50 ms':>13} "
+          f"{'patch p95 ms':>13} {'patch max ms':>13}")
+    for n in (100, 1000):
+        app = fresh(root)
+        app.add_widgets([{'type': TYPES[i % len(TYPES)], 'x': 10 + (i % 20) * 160,
+                          'y': 10 + (i // 20) * 45} for i in range(n)])
+        relaunch = relaunch_ms(app, os.path.join(tmp, f'export_{n}.py'))
+
+        preview = app.preview
+        preview.start()
+        wait_for(root, preview, 1)
+        # The first load also imports customtkinter; time the second
+        before = preview.latency['load'].total
+        app.add_widget('Label')
+        wait_for(root, preview, 2)
+        reload = (preview.latency['load'].total - before) * 1000
+
+        wid = app.widgets.ids()[0]
+        for i in range(EDITS):
+            app.update_prop(wid, 'text', f"edit {i}")
+            wait_for(root, preview, 3 + i)
+        patch = preview.latency['patch']
+        print(f"{n:>8} {relaunch:>12.0f} {reload:>10.0f} {patch.percentile(50):>13.1f} "
+              f"{patch.percentile(95):>13.1f} {patch.max * 1000:>13.1f}")
+        preview.stop()
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
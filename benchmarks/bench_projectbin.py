@@ -0,0 +1,77 @@
+"""JSON vs. binary (.pgb) project save/load time and peak RSS.
+
+Each measurement runs in a fresh subprocess so peak RSS is per operation.
+
+    python benchmarks/bench_projectbin.py [--widgets 50000]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import projectbin
+from common import scattered_store
+from model import WidgetStore
+
+
+def make_store(n):
+    return scattered_store(n, 5000, 5000, random.Random(5), colors=True)
+
+
+def child(op, fmt, path, n):
+    """Run one operation and print 'seconds peak_rss_kb'."""
+    store = make_store(n) if op == 'save' else None
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if op == 'save' and fmt == 'json':
+        with open(path, 'w') as f:
+            json.dump(store.to_list(), f, indent=2)
+    elif op == 'save':
+        projectbin.save(store, path)
+    elif fmt == 'json':
+        with open(path) as f:
+            store = WidgetStore.from_list(json.load(f))
+    elif op == 'load':
+        store = projectbin.load(path)
+    else:
+        # Lazy open: map the file and decode a single record
+        project = projectbin.BinaryProject(path)
+        project[len(project) // 2]
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(elapsed, peak - base)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--widgets', type=int, default=50000)
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child, args.widgets)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {'json': os.path.join(tmp, 'p.json'), 'binary': os.path.join(tmp, 'p.pgb')}
+        print(f"{args.widgets} widgets")
+        print(f"{'operation':<14} {'format':<7} {'seconds':>8} {'peak RSS +MB':>13} {'file MB':>8}")
+        for op, fmt in (('save', 'json'), ('save', 'binary'), ('load', 'json'),
+                        ('load', 'binary'), ('open-lazy', 'binary')):
+            out = subprocess.run([sys.executable, __file__, '--widgets', str(args.widgets),
+                                  '--child', op, fmt, paths[fmt]],
+                                 capture_output=True, text=True, check=True).stdout
+            seconds, peak_kb = out.split()
+            size = os.path.getsize(paths[fmt]) / 1e6
+            print(f"{op:<14} {fmt:<7} {float(seconds):>8.3f} {int(peak_kb) / 1024:>13.1f} {size:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""JSON vs. SQLite (.pgdb) projects: opening a viewport, queries, saving edits.
+
+A JSON project has to be parsed whole before anything can be drawn and
+rewritten whole on every save. The database reads only the widgets in a
+1400x800 viewport (through the R*Tree, and through the (x, y) index as
+the fallback) and writes back only the rows an edit touched.
+
+The "open in builder" rows time PyGUIBuilder.open_project on the headless
+Tk: until the first view is drawn, until every widget is loaded (the
+event loop is run for a .pgdb, which merges its rows between events), and
+the longest the UI thread was busy at a stretch.
+
+    python benchmarks/bench_projectdb.py [--widgets 100000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+
+headless.install()
+
+import projectdb
+from common import ms, scattered_store
+from main import PyGUIBuilder
+from model import WidgetStore
+
+VIEW = (2000, 2000, 3400, 2800)
+
+
+def make_store(n):
+    return scattered_store(n, 20000, 20000, random.Random(5), colors=True)
+
+
+def open_in_builder(path):
+    """(ms to first view, ms until fully loaded, longest callback ms, widgets)."""
+    root = headless.Tk()
+    app = PyGUIBuilder(root, autosave=False, lazy=False)
+    root.update()
+    first, _ = ms(lambda: app.open_project(path))
+    longest, start = first, time.perf_counter()
+    while root.queue:
+        _, func, args = root.queue.pop(0)
+        longest = max(longest, ms(lambda: func(*args))[0])
+    loaded = first + (time.perf_counter() - start) * 1000
+    return first, loaded, longest, len(app.widgets)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--widgets', type=int, default=100000)
+    args = parser.parse_args()
+    store = make_store(args.widgets)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'p.json')
+        db_path = os.path.join(tmp, 'p.pgdb')
+        rows = []
+
+        def json_save():
+            with open(json_path, 'w') as f:
+                json.dump(store.to_list(), f, indent=2)
+
+        def json_load():
+            with open(json_path) as f:
+                return WidgetStore.from_list(json.load(f))
+
+        rows.append(('save all', 'json', *ms(json_save)))
+        rows.append(('save all', 'pgdb', *ms(lambda: projectdb.save(store, db_path))))
+        rows.append(('load all', 'json', *ms(json_load)))
+        rows.append(('load all', 'pgdb', *ms(lambda: projectdb.load(db_path))))
+
+        with projectdb.ProjectDB(db_path) as db:
+            rows.append(('viewport', f"rtree={'on' if db.rtree else 'n/a'}", *ms(lambda: db.region(*VIEW))))
+            rtree, db.rtree = db.rtree, False
+            rows.append(('viewport', 'xy index', *ms(lambda: db.region(*VIEW))))
+            db.rtree = rtree
+            rows.append(('find Button', 'pgdb', *ms(lambda: db.find(type='Button'))))
+
+            # An edit session: move 10 widgets, then save
+            ids = store.ids()
+            for wid in ids[:10]:
+                store.get(wid)['x'] += 5
+            rows.append(('save 10 edits', 'json', *ms(json_save)))
+            rows.append(('save 10 edits', 'pgdb',
+                         *ms(lambda: db.write_back(store, ids[:10], (), lambda wid: ids.index(wid) + 1))))
+
+        print(f"{args.widgets} widgets")
+        print(f"{'operation':<14} {'backend':<10} {'ms':>9} {'widgets':>8} {'file MB':>8}")
+        for op, backend, elapsed, result in rows:
+            count = len(result) if result is not None else ''
+            path = json_path if backend == 'json' else db_path
+            print(f"{op:<14} {backend:<10} {elapsed:>9.1f} {count:>8} "
+                  f"{os.path.getsize(path) / 1e6:>8.2f}")
+
+        print("\nopen in builder")
+        print(f"{'backend':<10} {'first view':>11} {'loaded':>9} {'longest':>9} {'widgets':>8}")
+        for backend, path in (('json', json_path), ('pgdb', db_path)):
+            first, loaded, longest, count = open_in_builder(path)
+            print(f"{backend:<10} {first:>11.1f} {loaded:>9.1f} {longest:>9.1f} {count:>8}")
+
+
+if __name__ == '__main__':
+    main()
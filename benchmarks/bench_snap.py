@@ -0,0 +1,81 @@
+"""Snap lookups per drag frame: sorted edge index vs. scanning every widget.
+
+A frame looks up the selection's three edges on each axis. The scan
+column is what computing guide candidates from all widgets would cost;
+"move+lookup" moves one widget between frames, as a live edit would, so
+the index has to absorb the change before answering. "build" is the
+one-off sort on the first drag after a load.
+
+    python benchmarks/bench_snap.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hittest import EdgeIndex, SpatialIndex
+
+FRAMES = 2000
+TOLERANCE = 6
+
+
+def populate(n):
+    rng = random.Random(9)
+    index = SpatialIndex()
+    for wid in range(1, n + 1):
+        x, y = rng.randrange(0, 20000), rng.randrange(0, 20000)
+        index.insert(wid, (x, y, x + rng.choice((100, 150, 200)), y + rng.choice((25, 35, 70))))
+    return index
+
+
+def frame_lookups(index, probes):
+    for x, y in probes:
+        for axis, value in ((0, x), (0, x + 75), (0, x + 150), (1, y), (1, y + 17), (1, y + 35)):
+            index.edges.nearest(axis, value, TOLERANCE, (0,))
+
+
+def frame_scans(index, probes):
+    entries = index.entries
+    for x, y in probes:
+        for axis, value in ((0, x), (0, x + 75), (0, x + 150), (1, y), (1, y + 17), (1, y + 35)):
+            best = None
+            for wid, (bounds, _) in entries.items():
+                for edge in EdgeIndex.edges(bounds)[axis]:
+                    d = abs(edge - value)
+                    if d <= TOLERANCE and (best is None or d < best):
+                        best = d
+
+
+def per_frame_us(action, probes):
+    start = time.perf_counter()
+    action(probes)
+    return (time.perf_counter() - start) / len(probes) * 1e6
+
+
+def main():
+    rng = random.Random(1)
+    probes = [(rng.uniform(0, 20000), rng.uniform(0, 20000)) for _ in range(FRAMES)]
+    print(f"{'widgets':>8} {'build ms':>9} {'lookup us':>10} {'move+lookup us':>15} {'scan us':>10}")
+    for n in (100, 1000, 10000, 100000):
+        index = populate(n)
+        start = time.perf_counter()
+        index.edges.sync()
+        build = (time.perf_counter() - start) * 1000
+        lookup = per_frame_us(lambda p: frame_lookups(index, p), probes)
+
+        def moving(probes):
+            for i, (x, y) in enumerate(probes):
+                wid = i % n + 1
+                x1, y1, x2, y2 = index.entries[wid][0]
+                index.move(wid, (x1 + 1, y1, x2 + 1, y2))
+                frame_lookups(index, [(x, y)])
+        moved = per_frame_us(moving, probes)
+        # Scanning is timed on fewer frames; it is linear in the widget count
+        scan = per_frame_us(lambda p: frame_scans(index, p), probes[:max(5, 20000 // n)])
+        print(f"{n:>8} {build:>9.1f} {lookup:>10.1f} {moved:>15.1f} {scan:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Full-canvas redraw cost: vector shapes vs. PhotoImage sprites.
+
+"draw" re-renders every widget through the renderer; "repaint" shifts
+every item and lets Tk repaint the whole canvas, which is where the
+smoothed polygons cost most. All widgets are kept on the canvas
+(virtualization off) so the numbers scale with the project size.
+
+Needs a display (run under Xvfb on headless machines):
+    python benchmarks/bench_sprites.py
+"""
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import TYPES
+from hittest import SpatialIndex
+from model import Widget, WidgetStore
+from render import CanvasRenderer
+from sprites import SpriteCache
+
+COLORS = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12']
+REPEAT = 5
+
+
+def project(n):
+    return WidgetStore(Widget(i + 1, TYPES[i % len(TYPES)], text=f"w{i + 1}",
+                              x=(i * 37) % 760, y=(i * 53) % 560,
+                              fg_color=COLORS[i % len(COLORS)])
+                       for i in range(n))
+
+
+def draw_all(renderer, widgets):
+    for data in widgets:
+        renderer.draw(data)
+
+
+def timed(canvas, action):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        action()
+        canvas.update()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    canvas = tk.Canvas(root, width=800, height=600, bg="white")
+    canvas.pack()
+    root.update()
+    print(f"{'widgets':>8} {'backend':>8} {'items':>7} {'draw ms':>9} {'repaint ms':>11} {'sprites':>8}")
+    for n in (100, 1000, 5000):
+        widgets = project(n)
+        for backend in ('vector', 'sprite'):
+            sprites = SpriteCache(canvas) if backend == 'sprite' else None
+            renderer = CanvasRenderer(canvas, SpatialIndex(), widgets.get, virtual=False,
+                                      sprites=sprites)
+            draw_all(renderer, widgets)
+            canvas.update()
+            draw_ms = timed(canvas, lambda: draw_all(renderer, widgets))
+            shift = [1]
+
+            def repaint():
+                shift[0] = -shift[0]
+                canvas.move("all", shift[0], 0)
+
+            repaint_ms = timed(canvas, repaint)
+            print(f"{n:>8} {backend:>8} {renderer.live_items():>7} {draw_ms:>9.1f} "
+                  f"{repaint_ms:>11.1f} {len(sprites) if sprites else '-':>8}")
+            renderer.clear()
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Builder startup: import time and time to first frame, eager vs. lazy.
+
+Each run is a fresh interpreter. "import ms" is `import main` (tkinter
+included) and "modules" how many modules are loaded by then. With a
+display, "first frame ms" is process start to the design canvas having
+been drawn, and "ready ms" to the palette and property panel existing
+too. "eager" is PyGUIBuilder(lazy=False), the old startup that builds
+everything (and imports every feature module) before returning; "lazy"
+shows the canvas first. With --project, that project is opened at startup
+as the last session's would be, in the background when lazy.
+
+    python benchmarks/bench_startup.py [--runs 5] [--project big.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import main
+imported = time.perf_counter()
+result = {'import': (imported - start) * 1000, 'modules': len(sys.modules)}
+mode, project = sys.argv[2], sys.argv[3]
+lazy = mode == 'lazy'
+if not lazy:
+    # What the builder used to import at startup
+    import codegen, inspector, lint, perf, preview, projectbin, projectdb
+    from tkinter import colorchooser, filedialog, messagebox
+    result['import'] = (time.perf_counter() - start) * 1000
+    result['modules'] = len(sys.modules)
+try:
+    root = main.tk.Tk()
+except main.tk.TclError:
+    print(json.dumps(result))
+    sys.exit()
+marks = {}
+app = main.PyGUIBuilder(root, autosave=False, lazy=lazy)
+app.canvas.bind("<Expose>", lambda e: marks.setdefault('expose', 1), add="+")
+if project:
+    if lazy:
+        app.restore_project(project)
+    else:
+        app.open_project(project)
+while 'ready' not in marks or (project and 'loaded' not in marks):
+    root.update()
+    now = (time.perf_counter() - start) * 1000
+    if 'expose' in marks and 'frame' not in marks:
+        root.update_idletasks()
+        marks['frame'] = (time.perf_counter() - start) * 1000
+    if app.inspector is not None and 'frame' in marks:
+        marks.setdefault('ready', now)
+    if project and len(app.widgets):
+        marks.setdefault('loaded', now)
+    if now > 60000:
+        break
+result.update(marks)
+root.destroy()
+print(json.dumps(result))
+"""
+
+
+def run(mode, project):
+    out = subprocess.run([sys.executable, '-c', PROBE, ROOT, mode, project or ''],
+                         capture_output=True, text=True, timeout=120)
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--runs', type=int, default=5)
+    ap.add_argument('--project', help="project to open at startup")
+    args = ap.parse_args()
+    project = os.path.abspath(args.project) if args.project else None
+
+    print(f"{'mode':<6} {'import ms':>10} {'modules':>8} {'first frame ms':>15} {'ready ms':>9}"
+          + (f" {'project ms':>11}" if project else ""))
+    for mode in ('eager', 'lazy'):
+        runs = [run(mode, project) for _ in range(args.runs)]
+
+        def median(key):
+            values = [r[key] for r in runs if key in r]
+            return statistics.median(values) if values else None
+
+        def column(key, width):
+            value = median(key)
+            return f"{value:>{width}.0f}" if value is not None else f"{'-':>{width}}"
+        line = (f"{mode:<6} {median('import'):>10.1f} {median('modules'):>8.0f} "
+                f"{column('frame', 15)} {column('ready', 9)}")
+        if project:
+            line += f" {column('loaded', 11)}"
+        print(line)
+    if 'frame' not in runs[0]:
+        print("first frame: skipped, no display (run under Xvfb on headless machines)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Project load time and live canvas items: full canvas vs. viewport virtualization.
+
+Widgets are laid out on a grid much larger than the 800x600 viewport, so
+with virtualization both numbers should track what is visible rather than
+the project size. Also times a full-page scroll and a zoom-out to the
+level-of-detail range.
+
+Needs a display (run under Xvfb on headless machines):
+    python benchmarks/bench_viewport.py
+"""
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import grid
+from hittest import SpatialIndex
+from model import WidgetStore
+from render import CanvasRenderer
+
+COLUMNS = 100
+
+
+def project(n):
+    return WidgetStore(grid(n, COLUMNS))
+
+
+def load(canvas, widgets, virtual):
+    renderer = CanvasRenderer(canvas, SpatialIndex(), widgets.get, virtual)
+    start = time.perf_counter()
+    for data in widgets:
+        renderer.draw(data)
+    canvas.update_idletasks()
+    return renderer, (time.perf_counter() - start) * 1000
+
+
+def timed(canvas, action):
+    start = time.perf_counter()
+    action()
+    canvas.update_idletasks()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    canvas = tk.Canvas(root, width=800, height=600, bg="white")
+    canvas.pack()
+    root.update()
+    print(f"{'widgets':>8} {'mode':>8} {'load ms':>9} {'items':>7} "
+          f"{'scroll ms':>10} {'zoom 25% ms':>12} {'items @25%':>11}")
+    for n in (100, 1000, 10000):
+        widgets = project(n)
+        for virtual in (False, True):
+            canvas.configure(scrollregion=(0, 0, 800, 600))
+            canvas.xview_moveto(0)
+            canvas.yview_moveto(0)
+            renderer, load_ms = load(canvas, widgets, virtual)
+            items = renderer.live_items()
+
+            def scroll():
+                canvas.yview_scroll(1, "pages")
+                renderer.sync()
+
+            scroll_ms = timed(canvas, scroll)
+            zoom_ms = timed(canvas, lambda: renderer.set_zoom(0.25))
+            print(f"{n:>8} {'virtual' if virtual else 'full':>8} {load_ms:>9.1f} {items:>7} "
+                  f"{scroll_ms:>10.2f} {zoom_ms:>12.1f} {renderer.live_items():>11}")
+            renderer.clear()
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Fixtures shared by the benchmarks: generated projects, builders, timing.
+
+Benchmarks import this after putting the repository root on sys.path.
+`main` is imported only by the builder factories, so benchmarks that
+never open a builder don't load tkinter, and those that run on the
+headless Tk can install it first.
+"""
+import time
+
+from model import Widget, WidgetStore
+
+TYPES = ['Label', 'Button', 'Entry', 'Text', 'Checkbutton', 'Radiobutton',
+         'Frame', 'Scale', 'Progressbar']
+COLORS = ['#f0f0f0', '#3498db', '#2ecc71', '#e74c3c', '#000000']
+
+
+def specs(n):
+    """add_widgets() specs for n widgets, cycling through TYPES."""
+    return [{'type': TYPES[i % len(TYPES)]} for i in range(n)]
+
+
+def grid(n, cols, origin=0):
+    """n Widgets in rows of `cols`, 180 x 90 apart, cycling through TYPES."""
+    return [Widget(i + 1, TYPES[i % len(TYPES)], text=f'Widget {i + 1}',
+                   x=origin + (i % cols) * 180, y=origin + (i // cols) * 90)
+            for i in range(n)]
+
+
+def scattered(n, width, height, rng, colors=False):
+    """n Widgets of random types at random points of a width x height area."""
+    widgets = []
+    for i in range(n):
+        w = Widget(i + 1, rng.choice(TYPES), text=f'Widget {i + 1}',
+                   x=rng.randrange(width), y=rng.randrange(height))
+        if colors:
+            w.fg_color, w.bg_color = rng.choice(COLORS), rng.choice(COLORS)
+        widgets.append(w)
+    return widgets
+
+
+def scattered_store(n, width, height, rng, colors=False):
+    return WidgetStore(scattered(n, width, height, rng, colors))
+
+
+def fresh(root):
+    """A builder without autosave on `root`, replacing whatever it showed."""
+    from main import PyGUIBuilder
+    for child in root.winfo_children():
+        child.destroy()
+    return PyGUIBuilder(root, autosave=False)
+
+
+def build(root, n):
+    """fresh() holding n widgets added in one step."""
+    app = fresh(root)
+    app.add_widgets(specs(n))
+    return app
+
+
+def ms(action):
+    """(milliseconds `action()` took, what it returned)."""
+    start = time.perf_counter()
+    result = action()
+    return (time.perf_counter() - start) * 1000, result
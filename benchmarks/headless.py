@@ -0,0 +1,379 @@
+"""Stand-in tkinter that records canvas operations instead of drawing.
+
+`install()` puts fake `tkinter`, `ttk`, `filedialog`, `messagebox` and
+`colorchooser` modules in sys.modules, so `main.PyGUIBuilder` can be
+driven on a machine with no display. Call it before importing `main`.
+
+Widgets accept any option and keep what they are given. The Canvas keeps
+its items and a tag -> items index (so tag lookups cost about what Tk's
+do, and benchmarks at 10k widgets measure the builder, not the fake), and
+counts every call in `Canvas.ops`. `after` callbacks queue on the root
+and run in order on `update()`/`update_idletasks()`, ignoring the delay.
+
+Dialogs answer from module state: `answers['save']`/`answers['open']`
+for file dialogs, `answers['yes']` for yes/no questions.
+"""
+import itertools
+import sys
+import types
+from collections import Counter
+
+answers = {'save': '', 'open': '', 'yes': True}
+
+_after_ids = itertools.count(1)
+
+
+class TclError(Exception):
+    pass
+
+
+class Variable:
+    def __init__(self, master=None, value=None, name=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def trace_add(self, *args):
+        return 'trace'
+
+
+class Misc:
+    def __init__(self, master=None, cnf=None, **options):
+        self.master = master
+        self.options = dict(cnf or {}, **options)
+        self.children = []
+        self.bindings = {}
+        self.queue = []
+        self.text = ''
+        if master is not None:
+            master.children.append(self)
+
+    def __getitem__(self, key):
+        return self.options.get(key)
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+    def configure(self, cnf=None, **options):
+        self.options.update(cnf or {}, **options)
+
+    config = configure
+
+    def cget(self, key):
+        return self.options.get(key)
+
+    def bind(self, sequence=None, func=None, add=None):
+        self.bindings[sequence] = func
+
+    bind_all = bind
+
+    def root(self):
+        widget = self
+        while widget.master is not None:
+            widget = widget.master
+        return widget
+
+    def after(self, ms, func=None, *args):
+        job = f"after#{next(_after_ids)}"
+        self.root().queue.append((job, func, args))
+        return job
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, job):
+        root = self.root()
+        root.queue = [entry for entry in root.queue if entry[0] != job]
+
+    def update(self):
+        root = self.root()
+        while root.queue:
+            job, func, args = root.queue.pop(0)
+            func(*args)
+
+    update_idletasks = update
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def winfo_exists(self):
+        return True
+
+    def winfo_width(self):
+        return self.options.get('width', 800)
+
+    def winfo_height(self):
+        return self.options.get('height', 600)
+
+    def destroy(self):
+        if self.master is not None and self in self.master.children:
+            self.master.children.remove(self)
+
+    def _noop(self, *args, **options):
+        pass
+
+    pack = pack_forget = pack_propagate = grid = grid_remove = grid_forget = place = _noop
+    columnconfigure = grid_columnconfigure = rowconfigure = _noop
+    focus_set = lift = tkraise = title = geometry = protocol = withdraw = deiconify = _noop
+    mainloop = _noop
+
+    # Entry/Text/Combobox contents
+    def insert(self, index, text):
+        self.text += str(text)
+
+    def delete(self, *args):
+        self.text = ''
+
+    def get(self, *args):
+        return self.text
+
+    def set(self, value):
+        self.text = value
+
+
+class Tk(Misc):
+    def __init__(self, *args, **options):
+        super().__init__(None)
+
+
+class Scale(Misc):
+    def set(self, value):
+        self.text = value
+        command = self.options.get('command')
+        if command:
+            command(str(value))
+
+
+class Canvas(Misc):
+    def __init__(self, master=None, cnf=None, **options):
+        super().__init__(master, cnf, **options)
+        self.items = {}
+        self.tagged = {}
+        self.last_id = 0
+        self.ops = Counter()
+        self.xoffset = self.yoffset = 0.0
+
+    def ids(self, tag_or_id):
+        if isinstance(tag_or_id, int):
+            return (tag_or_id,) if tag_or_id in self.items else ()
+        if tag_or_id == 'all':
+            return tuple(self.items)
+        return tuple(self.tagged.get(tag_or_id, ()))
+
+    def _set_tags(self, item, tags):
+        old = self.items[item][2]
+        for tag in old:
+            self.tagged[tag].discard(item)
+        tags = {tags} if isinstance(tags, str) else set(tags)
+        for tag in tags:
+            self.tagged.setdefault(tag, set()).add(item)
+        self.items[item][2] = tags
+
+    def _create(self, kind, coords, options):
+        self.ops['create'] += 1
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        self.last_id += 1
+        self.items[self.last_id] = [kind, list(coords), set(), options]
+        self._set_tags(self.last_id, options.pop('tags', ()))
+        return self.last_id
+
+    def create_rectangle(self, *coords, **options):
+        return self._create('rectangle', coords, options)
+
+    def create_polygon(self, *coords, **options):
+        return self._create('polygon', coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create('oval', coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create('line', coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create('text', coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create('image', coords, options)
+
+    def create_window(self, *coords, **options):
+        return self._create('window', coords, options)
+
+    def delete(self, *tags):
+        self.ops['delete'] += 1
+        for tag in tags:
+            for item in self.ids(tag):
+                self._set_tags(item, ())
+                del self.items[item]
+
+    def coords(self, tag, *coords):
+        if not coords:
+            items = self.ids(tag)
+            return list(self.items[items[0]][1]) if items else []
+        self.ops['coords'] += 1
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        for item in self.ids(tag):
+            self.items[item][1] = list(coords)
+
+    def move(self, tag, dx, dy):
+        self.ops['move'] += 1
+        for item in self.ids(tag):
+            coords = self.items[item][1]
+            coords[0::2] = [x + dx for x in coords[0::2]]
+            coords[1::2] = [y + dy for y in coords[1::2]]
+
+    def itemconfigure(self, tag, **options):
+        self.ops['itemconfigure'] += 1
+        tags = options.pop('tags', None)
+        for item in self.ids(tag):
+            if tags is not None:
+                self._set_tags(item, tags)
+            self.items[item][3].update(options)
+
+    itemconfig = itemconfigure
+
+    def addtag_withtag(self, new, tag):
+        self.ops['addtag'] += 1
+        for item in self.ids(tag):
+            self._set_tags(item, self.items[item][2] | {new})
+
+    def dtag(self, tag, remove=None):
+        self.ops['dtag'] += 1
+        remove = tag if remove is None else remove
+        for item in self.ids(tag):
+            self._set_tags(item, self.items[item][2] - {remove})
+
+    def tag_raise(self, *args):
+        self.ops['raise'] += 1
+
+    def tag_lower(self, *args):
+        self.ops['lower'] += 1
+
+    def find_withtag(self, tag):
+        return self.ids(tag)
+
+    def gettags(self, item):
+        return tuple(self.items[item][2]) if item in self.items else ()
+
+    def type(self, item):
+        return self.items[item][0]
+
+    def bbox(self, tag):
+        coords = [self.items[item][1] for item in self.ids(tag)]
+        if not coords:
+            return None
+        xs = [x for c in coords for x in c[0::2]]
+        ys = [y for c in coords for y in c[1::2]]
+        return int(min(xs)), int(min(ys)), int(max(xs)) + 1, int(max(ys)) + 1
+
+    def canvasx(self, x, gridspacing=None):
+        return x + self.xoffset
+
+    def canvasy(self, y, gridspacing=None):
+        return y + self.yoffset
+
+    def _region(self):
+        return [float(v) for v in self.options.get('scrollregion') or (0, 0, 800, 600)]
+
+    def xview_moveto(self, fraction):
+        x1, _, x2, _ = self._region()
+        self.xoffset = x1 + fraction * (x2 - x1)
+
+    def yview_moveto(self, fraction):
+        _, y1, _, y2 = self._region()
+        self.yoffset = y1 + fraction * (y2 - y1)
+
+    def xview(self, *args):
+        if args and args[0] == 'moveto':
+            self.xview_moveto(float(args[1]))
+        elif args and args[0] == 'scroll':
+            self.xview_scroll(int(args[1]), args[2])
+        return (0.0, 1.0)
+
+    def yview(self, *args):
+        if args and args[0] == 'moveto':
+            self.yview_moveto(float(args[1]))
+        elif args and args[0] == 'scroll':
+            self.yview_scroll(int(args[1]), args[2])
+        return (0.0, 1.0)
+
+    def xview_scroll(self, number, what):
+        self.xoffset += number * (self.winfo_width() if what == 'pages' else 10)
+
+    def yview_scroll(self, number, what):
+        self.yoffset += number * (self.winfo_height() if what == 'pages' else 10)
+
+    def scan_mark(self, x, y):
+        self.mark = (x, y)
+
+    def scan_dragto(self, x, y, gain=10):
+        mx, my = self.mark
+        self.xoffset -= (x - mx) * gain
+        self.yoffset -= (y - my) * gain
+        self.mark = (x, y)
+
+
+class PhotoImage:
+    def __init__(self, name=None, master=None, width=0, height=0, **options):
+        self._width, self._height = width, height
+
+    def put(self, *args, **options):
+        pass
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+
+class Event:
+    def __init__(self, x=0, y=0, state=0, delta=0, widget=None, keysym=''):
+        self.x, self.y, self.state, self.delta = x, y, state, delta
+        self.widget, self.keysym = widget, keysym
+
+
+WIDGETS = ('Toplevel', 'Frame', 'LabelFrame', 'Label', 'Button', 'Entry', 'Text',
+           'Checkbutton', 'Radiobutton', 'Scrollbar', 'Listbox', 'Menu', 'Spinbox')
+CONSTANTS = ('TOP', 'BOTTOM', 'LEFT', 'RIGHT', 'X', 'Y', 'BOTH', 'NONE', 'END', 'INSERT',
+             'HORIZONTAL', 'VERTICAL', 'SUNKEN', 'RAISED', 'FLAT', 'GROOVE', 'RIDGE',
+             'N', 'S', 'E', 'W', 'NW', 'NE', 'SW', 'SE', 'CENTER', 'ALL',
+             'NORMAL', 'DISABLED', 'HIDDEN', 'WORD', 'CHAR')
+
+
+def module(name, **attributes):
+    mod = types.ModuleType(name)
+    mod.__dict__.update(attributes)
+    return mod
+
+
+def install():
+    """Replace tkinter for this process; returns the fake module."""
+    tk = module('tkinter', Tk=Tk, Misc=Misc, Canvas=Canvas, Scale=Scale, PhotoImage=PhotoImage,
+                Event=Event, TclError=TclError, Variable=Variable, StringVar=Variable,
+                IntVar=Variable, DoubleVar=Variable, BooleanVar=Variable)
+    for name in WIDGETS:
+        setattr(tk, name, type(name, (Misc,), {}))
+    for name in CONSTANTS:
+        setattr(tk, name, name.lower())
+    ttk = module('tkinter.ttk', Combobox=type('Combobox', (Misc,), {}),
+                 Scrollbar=tk.Scrollbar, Frame=tk.Frame, Label=tk.Label, Button=tk.Button)
+    filedialog = module('tkinter.filedialog',
+                        asksaveasfilename=lambda **options: answers['save'],
+                        askopenfilename=lambda **options: answers['open'])
+    messagebox = module('tkinter.messagebox',
+                        askyesno=lambda *args, **options: answers['yes'],
+                        askokcancel=lambda *args, **options: answers['yes'],
+                        showinfo=lambda *args, **options: 'ok',
+                        showwarning=lambda *args, **options: 'ok',
+                        showerror=lambda *args, **options: 'ok')
+    colorchooser = module('tkinter.colorchooser', askcolor=lambda *args, **options: (None, None))
+    tk.ttk, tk.filedialog, tk.messagebox, tk.colorchooser = ttk, filedialog, messagebox, colorchooser
+    sys.modules.update({'tkinter': tk, 'tkinter.ttk': ttk, 'tkinter.filedialog': filedialog,
+                        'tkinter.messagebox': messagebox, 'tkinter.colorchooser': colorchooser})
+    return tk
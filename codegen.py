@@ -0,0 +1,400 @@
+"""CustomTkinter code generation for builder projects.
+
+Each widget type has one template that is compiled once into a Python
+function. Output is produced fragment by fragment so it can be streamed
+straight into a file, and every widget's fragment is cached against the
+exact values it was rendered from, types included (150 and 150.0 compare
+equal but print differently), so re-exporting after a small edit only
+re-renders the widgets that changed.
+
+This module must not import tkinter: it is used by headless tools too.
+"""
+import re
+from operator import attrgetter, itemgetter
+from string import Formatter
+
+from model import Widget
+
+# Size of the exported window
+WINDOW = (700, 500)
+
+HEADER = f"""# Auto-generated by PyGUI Builder Pro
+import customtkinter as ctk
+
+ctk.set_appearance_mode("dark")
+ctk.set_default_color_theme("blue")
+
+root = ctk.CTk()
+root.title("My App")
+root.geometry("{WINDOW[0]}x{WINDOW[1]}")
+
+"""
+
+FOOTER = "root.mainloop()\n"
+
+# Constructor line(s) per widget type. Fields name widget keys and may use
+# simple expressions ({height*2}); {var} is the generated variable name.
+TEMPLATES = {
+    'Label': '{var} = ctk.CTkLabel(root, text="{text}", font=("{font}", {font_size}), '
+             'fg_color="{bg_color}", text_color="{text_color}", corner_radius={corner_radius})\n',
+    'Button': '{var} = ctk.CTkButton(root, text="{text}", font=("{font}", {font_size}), '
+              'fg_color="{fg_color}", hover_color="{hover_color}", corner_radius={corner_radius}, '
+              'width={width}, height={height})\n',
+    'Entry': '{var} = ctk.CTkEntry(root, font=("{font}", {font_size}), '
+             'corner_radius={corner_radius}, width={width})\n',
+    'Text': '{var} = ctk.CTkTextbox(root, font=("{font}", {font_size}), '
+            'corner_radius={corner_radius}, width={width}, height={height*2})\n',
+    'Checkbutton': '{var} = ctk.CTkCheckBox(root, text="{text}", '
+                   'font=("{font}", {font_size}), fg_color="{fg_color}")\n',
+    'Radiobutton': '{var} = ctk.CTkRadioButton(root, text="{text}", '
+                   'font=("{font}", {font_size}), fg_color="{fg_color}")\n',
+    'Frame': '{var} = ctk.CTkFrame(root, fg_color="{bg_color}", '
+             'corner_radius={corner_radius}, width={width}, height={height})\n',
+    'Scale': '{var} = ctk.CTkSlider(root, fg_color="{fg_color}", width={width})\n',
+    'Progressbar': '{var} = ctk.CTkProgressBar(root, fg_color="{fg_color}", '
+                   'corner_radius={corner_radius}, width={width})\n{var}.set(0.5)\n',
+}
+
+FRAGMENT = '# {type}\n{body}{var}.place(x={x}, y={y})\n\n'
+
+_NAME = re.compile(r"[A-Za-z_]\w*")
+
+
+class Emitter:
+    """A template compiled to an f-string function of the values it reads."""
+
+    def __init__(self, template):
+        keys = []
+        source = []
+        for literal, field, _, _ in Formatter().parse(template):
+            source.append(literal.replace('{', '{{').replace('}', '}}'))
+            if field is None:
+                continue
+            for name in _NAME.findall(field):
+                if name != 'var' and name not in keys:
+                    keys.append(name)
+            source.append('{' + field + '}')
+        self.keys = tuple(keys)
+        code = f"lambda var, {', '.join(self.keys)}: f{''.join(source)!r}"
+        self.emit = eval(compile(code, f"<template {template[:30]!r}>", 'eval'))
+        # Widget records are read by attribute, plain dicts (raw JSON) by key
+        self.attrs = attrgetter(*self.keys)
+        self.items = itemgetter(*self.keys)
+
+
+def compile_emitters(templates=TEMPLATES, fragment=FRAGMENT):
+    emitters = {kind: Emitter(fragment.replace('{body}', body))
+                for kind, body in templates.items()}
+    emitters[None] = Emitter(fragment.replace('{body}', ''))
+    return emitters
+
+
+EMITTERS = compile_emitters()
+
+
+class CodeGenerator:
+    """Renders projects to CustomTkinter source, caching per-widget output."""
+
+    def __init__(self, emitters=EMITTERS):
+        self.emitters = emitters
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fragments(self, widgets):
+        yield HEADER
+        cache, fresh, shared = self.cache, {}, {}
+        emitters, fallback = self.emitters, self.emitters[None]
+        for i, w in enumerate(widgets):
+            if type(w) is Widget:
+                kind, wid = w.type, w.id
+                emitter = emitters.get(kind, fallback)
+                values = emitter.attrs(w)
+            else:
+                kind, wid = w['type'], w['id']
+                emitter = emitters.get(kind, fallback)
+                values = emitter.items(w)
+            key = (f"{kind.lower()}{i+1}",) + values
+            types = tuple(map(type, values))
+            # Widgets of one kind nearly always share these: keep one copy
+            types = shared.setdefault(types, types)
+            cached = cache.get(wid)
+            if cached is not None and cached[0] == key and cached[1] == types:
+                self.hits += 1
+                fragment = cached[2]
+            else:
+                self.misses += 1
+                fragment = emitter.emit(*key)
+            fresh[wid] = (key, types, fragment)
+            yield fragment
+        # Only widgets from this export stay cached
+        self.cache = fresh
+        yield FOOTER
+
+    def write(self, widgets, sink):
+        write = sink.write
+        for fragment in self.fragments(widgets):
+            write(fragment)
+
+    def generate(self, widgets):
+        return ''.join(self.fragments(widgets))
+
+
+def generate_code(widgets, compact=False):
+    return (CompactGenerator() if compact else CodeGenerator()).generate(widgets)
+
+
+# Compact mode: the same constructor arguments, parsed out of TEMPLATES,
+# but written once per distinct style into a table that a loop builds from.
+_CONSTRUCTOR = re.compile(r"\{var\} = ctk\.(\w+)\(root(?:, (.*?))?\)\n(.*)", re.S)
+
+COMPACT_LOOP = '''
+widgets = []
+for style, x, y, *text in WIDGETS:
+    kind, options = STYLES[style]
+    if text:
+        options = dict(options, text=text[0])
+    widget = getattr(ctk, kind)(root, **options)
+    widget.place(x=x, y=y)
+{setup}    widgets.append(widget)
+
+'''
+
+# Frame contents are built the first time the frame is shown (<Map>)
+DEFERRED_LOOP = '''
+def build(rows):
+    for pos, style, x, y, *text in rows:
+        kind, options = STYLES[style]
+        if text:
+            options = dict(options, text=text[0])
+        widget = getattr(ctk, kind)(root, **options)
+        widget.place(x=x, y=y)
+{setup}        widgets[pos] = widget
+        if pos in DEFERRED:
+            widget.bind("<Map>", lambda event, pos=pos: build(DEFERRED.pop(pos, ())), add="+")
+
+
+widgets = {{}}
+build(WIDGETS)
+
+'''
+
+
+def split_arguments(text):
+    """Split 'a="x, y", b=(1, 2)' at its top-level commas."""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(text):
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch in '([{':
+            depth += 1
+        elif not quoted and ch in ')]}':
+            depth -= 1
+        elif not quoted and depth == 0 and text.startswith(', ', i):
+            parts.append(text[start:i])
+            start = i + 2
+    if text[start:]:
+        parts.append(text[start:])
+    return parts
+
+
+class Constructor:
+    """A template split into its class, style options, text and setup lines."""
+
+    def __init__(self, template):
+        match = _CONSTRUCTOR.match(template)
+        if match is None:
+            raise ValueError(f"not a constructor template: {template!r}")
+        self.cls = match.group(1)
+        self.text = None
+        options = []
+        for argument in split_arguments(match.group(2) or ''):
+            name, snippet = argument.split('=', 1)
+            if name == 'text':
+                # Text is per widget, everything else is shared style
+                self.text = Emitter(snippet)
+            else:
+                options.append((name, Emitter(snippet)))
+        self.options = options
+        # Lines after the constructor may only use {var}
+        self.setup = [line.replace('{var}', 'widget')
+                      for line in match.group(3).splitlines() if line.strip()]
+        keys = []
+        for _, emitter in options:
+            keys.extend(key for key in emitter.keys if key not in keys)
+        self.keys = tuple(keys)
+        self.attrs = attrgetter(*keys) if len(keys) > 1 else (lambda w: (getattr(w, keys[0]),))
+        self.items = itemgetter(*keys) if len(keys) > 1 else (lambda w: (w[keys[0]],))
+
+    def style(self, values):
+        """Python source for (class, options) given the values of self.keys."""
+        named = dict(zip(self.keys, values))
+        options = ', '.join(f'"{name}": {emitter.emit(None, *(named[k] for k in emitter.keys))}'
+                            for name, emitter in self.options)
+        return f'("{self.cls}", {{{options}}})'
+
+
+def compile_constructors(templates=TEMPLATES):
+    return {kind: Constructor(body) for kind, body in templates.items()}
+
+
+CONSTRUCTORS = compile_constructors()
+
+
+def deferred_groups(widgets, kinds):
+    """Map widget position -> the Frame position whose first showing builds it.
+
+    A widget is deferred when an earlier top-level Frame contains it and
+    deferring can't change what draws over what: everything overlapping
+    it is either created before it either way (an earlier top-level
+    widget) or deferred with it, keeping their relative order.
+    """
+    # lint imports this module for WINDOW, so import it lazily
+    from hittest import widget_bounds
+    from lint import overlapping_pairs
+
+    boxes, positions = [], []
+    for pos, w in enumerate(widgets):
+        if kinds[pos] is None:
+            continue
+        try:
+            box = widget_bounds(w)
+        except (KeyError, TypeError):
+            continue
+        if all(type(v) in (int, float) for v in box):
+            boxes.append(box)
+            positions.append(pos)
+    neighbours = {pos: [] for pos in positions}
+    for i, j in overlapping_pairs(boxes):
+        neighbours[positions[i]].append(positions[j])
+        neighbours[positions[j]].append(positions[i])
+    box_of = dict(zip(positions, boxes))
+
+    def inside(outer, inner):
+        a, b = box_of[outer], box_of[inner]
+        return a[0] <= b[0] and a[1] <= b[1] and a[2] >= b[2] and a[3] >= b[3]
+
+    # Frames inside no earlier frame are the roots; nested frames join the root's group
+    roots = set()
+    for pos in positions:
+        if kinds[pos] == 'Frame' and not any(
+                o < pos and o in roots and inside(o, pos) for o in neighbours[pos]):
+            roots.add(pos)
+    group = {}
+    for pos in positions:
+        if pos not in roots:
+            frames = [o for o in neighbours[pos] if o < pos and o in roots and inside(o, pos)]
+            if frames:
+                group[pos] = max(frames)
+
+    changed = True
+    while changed:
+        changed = False
+        for pos in list(group):
+            frame = group[pos]
+            for o in neighbours[pos]:
+                if o == frame or group.get(o) == frame or (o < pos and o not in group):
+                    continue
+                del group[pos]
+                changed = True
+                break
+    return group
+
+
+class CompactGenerator:
+    """Renders projects as a style table plus a loop, for fast-loading exports.
+
+    Each distinct (class, options) combination is written once; rows hold
+    only a style index, the position and any text. Options are the very
+    code the unrolled templates would emit, so both exports look the same.
+    With defer_frames, widgets lying inside a Frame are built when that
+    frame is first shown.
+    """
+
+    def __init__(self, constructors=CONSTRUCTORS, defer_frames=False):
+        self.constructors = constructors
+        self.defer_frames = defer_frames
+        self.cache = {}
+
+    def fragments(self, widgets):
+        widgets = widgets if isinstance(widgets, list) else list(widgets)
+        constructors, cache = self.constructors, self.cache
+        styles, rows, kinds, skipped = {}, [], [], []
+        for i, w in enumerate(widgets):
+            record = type(w) is Widget
+            kind = w.type if record else w['type']
+            ctor = constructors.get(kind)
+            if ctor is None:
+                skipped.append(f"{str(kind).lower()}{i+1}")
+                kinds.append(None)
+                rows.append(None)
+                continue
+            kinds.append(kind)
+            values = ctor.attrs(w) if record else ctor.items(w)
+            # Types too: 150 and 150.0 hash alike but are written differently
+            key = (kind,) + values + tuple(map(type, values))
+            style = cache.get(key)
+            if style is None:
+                style = cache[key] = ctor.style(values)
+            index = styles.setdefault(style, len(styles))
+            x, y = (w.x, w.y) if record else (w['x'], w['y'])
+            if ctor.text is not None:
+                text = ctor.text.emit(None, *((w.text,) if record else (w['text'],)))
+                rows.append(f"{index}, {x}, {y}, {text}")
+            else:
+                rows.append(f"{index}, {x}, {y}")
+
+        yield HEADER
+        yield "# Compact export: STYLES holds each (class, options) once,\n"
+        yield "# WIDGETS one row per widget: " + (
+            "(position, style, x, y[, text])\n" if self.defer_frames else "(style, x, y[, text])\n")
+        if skipped:
+            yield f"# Skipped, no constructor for their type: {', '.join(skipped)}\n"
+        yield "STYLES = [\n"
+        for style in styles:
+            yield f"    {style},\n"
+        yield "]\n\n"
+
+        setup = {}
+        for ctor in constructors.values():
+            if ctor.setup:
+                setup[ctor.cls] = ctor.setup
+        indent = '        ' if self.defer_frames else '    '
+        setup_code = ''.join(f'{indent}if kind == "{cls}":\n' + ''.join(
+            f'{indent}    {line}\n' for line in lines) for cls, lines in setup.items())
+
+        if not self.defer_frames:
+            yield "WIDGETS = [\n"
+            for row in rows:
+                if row is not None:
+                    yield f"    ({row}),\n"
+            yield "]\n"
+            yield COMPACT_LOOP.format(setup=setup_code)
+        else:
+            group = deferred_groups(widgets, kinds)
+            deferred = {}
+            yield "WIDGETS = [\n"
+            for pos, row in enumerate(rows):
+                if row is None:
+                    continue
+                if pos in group:
+                    deferred.setdefault(group[pos], []).append(f"({pos}, {row})")
+                else:
+                    yield f"    ({pos}, {row}),\n"
+            yield "]\n\nDEFERRED = {\n"
+            for frame, frame_rows in deferred.items():
+                yield f"    {frame}: [\n"
+                for row in frame_rows:
+                    yield f"        {row},\n"
+                yield "    ],\n"
+            yield "}\n"
+            yield DEFERRED_LOOP.format(setup=setup_code)
+        yield FOOTER
+
+    def write(self, widgets, sink):
+        write = sink.write
+        for fragment in self.fragments(widgets):
+            write(fragment)
+
+    def generate(self, widgets):
+        return ''.join(self.fragments(widgets))
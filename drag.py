@@ -0,0 +1,109 @@
+"""Tag-based dragging for the design canvas.
+
+Motion events only accumulate an offset; the canvas is touched at most
+once per frame, when the pending offset is applied with a single
+`canvas.move` on the shared drag tag. The model is written back once, on
+release. An optional `snap` callable (see snap.Snapper) turns the raw
+offset into the one to apply, at the same once-per-frame rate, and an
+`on_move(wids, dx, dy)` hook sees each applied offset (the live preview
+follows drags through it).
+"""
+import time
+
+from render import widget_tag
+
+FRAME_MS = 16
+DRAG_TAG = "dragging"
+
+
+class DragEngine:
+    def __init__(self, canvas, on_release, frame_ms=FRAME_MS):
+        self.canvas = canvas
+        self.on_release = on_release
+        self.frame_ms = frame_ms
+        self.wids = []
+        self.last = (0, 0)
+        self.raw = (0, 0)
+        self.total = (0, 0)
+        self.snap = None
+        self.on_move = None
+        self.job = None
+        # Stats for the current or most recent drag
+        self.events = 0
+        self.frames = 0
+        self.frame_time = 0.0
+
+    @property
+    def active(self):
+        return bool(self.wids)
+
+    def start(self, wids, x, y, extra_tags=(), snap=None):
+        self.release()
+        self.wids = list(wids)
+        self.last = (x, y)
+        self.raw = (0, 0)
+        self.total = (0, 0)
+        self.snap = snap
+        self.events = self.frames = 0
+        self.frame_time = 0.0
+        for wid in self.wids:
+            self.canvas.addtag_withtag(DRAG_TAG, widget_tag(wid))
+        for tag in extra_tags:
+            self.canvas.addtag_withtag(DRAG_TAG, tag)
+
+    def motion(self, x, y):
+        if not self.wids:
+            return
+        self.events += 1
+        rx, ry = self.raw
+        self.raw = (rx + x - self.last[0], ry + y - self.last[1])
+        self.last = (x, y)
+        if self.job is None:
+            self.job = self.canvas.after(self.frame_ms, self.flush)
+
+    def flush(self):
+        self.job = None
+        target = self.raw
+        if self.snap is not None and target != (0, 0):
+            # A click without motion leaves the selection where it is
+            target = self.snap(*target)
+        dx, dy = target[0] - self.total[0], target[1] - self.total[1]
+        if not (dx or dy):
+            return
+        start = time.perf_counter()
+        self.canvas.move(DRAG_TAG, dx, dy)
+        self.frame_time += time.perf_counter() - start
+        self.frames += 1
+        self.total = target
+        if self.on_move is not None:
+            self.on_move(self.wids, *target)
+
+    def release(self):
+        if not self.wids:
+            return
+        if self.job is not None:
+            self.canvas.after_cancel(self.job)
+        self.flush()
+        self.canvas.dtag(DRAG_TAG, DRAG_TAG)
+        self.end_snap()
+        wids, (dx, dy) = self.wids, self.total
+        self.wids = []
+        if dx or dy:
+            self.on_release(wids, dx, dy)
+
+    def cancel(self):
+        if self.job is not None:
+            self.canvas.after_cancel(self.job)
+            self.job = None
+        if self.wids:
+            self.canvas.dtag(DRAG_TAG, DRAG_TAG)
+            self.end_snap()
+            self.wids = []
+
+    def end_snap(self):
+        if self.snap is not None:
+            self.snap.end()
+            self.snap = None
+
+    def frame_cost_ms(self):
+        return self.frame_time / self.frames * 1000 if self.frames else 0.0
@@ -0,0 +1,126 @@
+"""Headless batch export: convert saved project files to CustomTkinter programs.
+
+    python export_cli.py projects/ more.json -o build/ -j 8 [--compact [--defer-frames]]
+
+Arguments may be project files or directories (searched for *.json,
+*.pgb and *.pgdb). Each project is written as <name>.py, next to the project or into
+--out-dir. Files are converted in parallel and reported as they finish.
+This never imports tkinter, so it runs on display-less CI machines.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from multiprocessing import Pool
+
+import projectbin
+import projectdb
+from codegen import CodeGenerator, CompactGenerator
+
+
+def find_projects(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(('.json', '.pgb', '.pgdb')):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def output_path(src, out_dir):
+    name = os.path.splitext(os.path.basename(src))[0] + '.py'
+    return os.path.join(out_dir or os.path.dirname(src), name)
+
+
+def read_project(src):
+    """A project file of any format as a list of widget dicts."""
+    if projectbin.is_binary(src):
+        with projectbin.BinaryProject(src) as project:
+            return project.to_list()
+    if projectdb.is_database(src):
+        with projectdb.ProjectDB(src) as project:
+            return project.to_list()
+    with open(src, 'r') as f:
+        return json.load(f)
+
+
+def generator(mode):
+    if mode == 'compact':
+        return CompactGenerator()
+    if mode == 'deferred':
+        return CompactGenerator(defer_frames=True)
+    return CodeGenerator()
+
+
+def convert(job):
+    """Export one project; returns (src, dst, widget count, seconds, error)."""
+    src, dst, mode = job
+    start = time.perf_counter()
+    try:
+        widgets = read_project(src)
+        with open(dst, 'w') as f:
+            generator(mode).write(widgets, f)
+    except (OSError, ValueError, KeyError, TypeError, sqlite3.Error) as e:
+        return src, dst, 0, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return src, dst, len(widgets), time.perf_counter() - start, None
+
+
+def run(jobs, workers, chunksize, out=sys.stdout):
+    if workers == 1:
+        results = map(convert, jobs)
+        pool = None
+    else:
+        pool = Pool(workers)
+        results = pool.imap_unordered(convert, jobs, chunksize)
+    done = failed = 0
+    try:
+        for src, dst, count, seconds, error in results:
+            done += 1
+            if error:
+                failed += 1
+                out.write(f"FAILED {src}: {error}\n")
+            else:
+                out.write(f"{seconds * 1000:8.2f} ms  {src} -> {dst} ({count} widgets)\n")
+            out.flush()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return done, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export PyGUI Builder projects to Python.")
+    parser.add_argument('paths', nargs='+', help="project .json files or directories")
+    parser.add_argument('-o', '--out-dir', help="write exports here instead of next to each project")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--chunksize', type=int, default=8,
+                        help="projects handed to a worker at a time")
+    parser.add_argument('--compact', action='store_true',
+                        help="emit a widget table and a loop instead of one call per widget")
+    parser.add_argument('--defer-frames', action='store_true',
+                        help="with --compact, build Frame contents when the frame is first shown")
+    args = parser.parse_args(argv)
+    mode = ('deferred' if args.defer_frames else 'compact') if args.compact else 'unrolled'
+
+    start = time.perf_counter()
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    jobs = [(src, output_path(src, args.out_dir), mode) for src in find_projects(args.paths)]
+    if not jobs:
+        print("no project files found", file=sys.stderr)
+        return 2
+
+    done, failed = run(jobs, max(1, min(args.jobs, len(jobs))), args.chunksize)
+    elapsed = time.perf_counter() - start
+    print(f"{done - failed}/{done} exported in {elapsed:.2f} s "
+          f"({done / elapsed:.1f} files/s)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
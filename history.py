@@ -0,0 +1,327 @@
+"""Undo/redo as a log of small invertible commands.
+
+Every edit is recorded as the delta it made (one property, one move, the
+widgets added or removed), so undoing or redoing a step costs as much as
+the change itself, never a copy of the project. Consecutive edits of the
+same kind on the same target within MERGE_SECONDS fold into one step:
+typing into a field or nudging a widget is a single undo.
+
+Every SNAPSHOT_EVERY steps a compressed copy of the project is kept. A
+jump across many heavy steps (mass deletes, pastes) restores the nearest
+snapshot and replays from there when that is cheaper than walking every
+command. Commands and snapshots share a byte budget; the oldest history
+is dropped to stay within it. No snapshots are taken while the app is
+still loading a project (`app.loading`): restoring a partial copy would
+drop the rows not read yet.
+
+Commands talk to the app only through its non-recording primitives:
+apply_prop, move_widgets, insert_widgets, remove_widgets, restore_widgets
+and load_widgets.
+"""
+import json
+import sys
+import time
+import zlib
+from contextlib import contextmanager
+
+from model import WidgetStore
+
+MERGE_SECONDS = 1.0
+SNAPSHOT_EVERY = 200
+HISTORY_BUDGET = 16 * 1024 * 1024
+COMMAND_BYTES = 64
+# Replay cost is estimated from command sizes; restoring a snapshot costs
+# about as much as replaying this many bytes per widget in the project
+RESTORE_BYTES = 1024
+
+
+def dict_size(d):
+    return sys.getsizeof(d) + sum(sys.getsizeof(v) for v in d.values())
+
+
+class SetProp:
+    __slots__ = ('wid', 'key', 'old', 'new', 'time')
+
+    def __init__(self, wid, key, old, new):
+        self.wid = wid
+        self.key = key
+        self.old = old
+        self.new = new
+        self.time = time.monotonic()
+
+    @property
+    def merge_key(self):
+        return ('prop', self.wid, self.key)
+
+    def absorb(self, other):
+        self.new = other.new
+        self.time = other.time
+
+    def apply(self, app):
+        app.apply_prop(self.wid, self.key, self.new)
+
+    def revert(self, app):
+        app.apply_prop(self.wid, self.key, self.old)
+
+    def size(self):
+        return COMMAND_BYTES + sys.getsizeof(self.old) + sys.getsizeof(self.new)
+
+
+class Move:
+    __slots__ = ('wids', 'dx', 'dy', 'time')
+
+    def __init__(self, wids, dx, dy):
+        self.wids = tuple(wids)
+        self.dx = dx
+        self.dy = dy
+        self.time = time.monotonic()
+
+    @property
+    def merge_key(self):
+        return ('move', self.wids)
+
+    def absorb(self, other):
+        self.dx += other.dx
+        self.dy += other.dy
+        self.time = other.time
+
+    def apply(self, app):
+        app.move_widgets(self.wids, self.dx, self.dy)
+
+    def revert(self, app):
+        app.move_widgets(self.wids, -self.dx, -self.dy)
+
+    def size(self):
+        return COMMAND_BYTES + 8 * len(self.wids)
+
+
+class Add:
+    """Widgets appended to the project, kept as plain dicts, and their stacking keys.
+
+    Redoing puts the widgets back under the keys they were first given, so
+    every command and snapshot in the log agrees on a widget's key.
+    """
+
+    __slots__ = ('widgets', 'keys', 'time')
+    merge_key = None
+
+    def __init__(self, widgets, keys):
+        self.widgets = widgets
+        self.keys = keys
+        self.time = time.monotonic()
+
+    def apply(self, app):
+        app.insert_widgets(self.widgets, self.keys)
+
+    def revert(self, app):
+        app.remove_widgets([d['id'] for d in self.widgets])
+
+    def size(self):
+        return COMMAND_BYTES + 8 * len(self.keys) + sum(dict_size(d) for d in self.widgets)
+
+
+class Remove:
+    """Widgets taken out of the project, with their stacking keys."""
+
+    __slots__ = ('removed', 'time')
+    merge_key = None
+
+    def __init__(self, removed):
+        self.removed = removed
+        self.time = time.monotonic()
+
+    def apply(self, app):
+        app.remove_widgets([d['id'] for _, d in self.removed])
+
+    def revert(self, app):
+        app.restore_widgets(self.removed)
+
+    def size(self):
+        return COMMAND_BYTES + sum(dict_size(d) for _, d in self.removed)
+
+
+class Group:
+    """Commands recorded inside one `History.batch()`, undone as a unit."""
+
+    __slots__ = ('commands', 'time')
+
+    def __init__(self, commands):
+        self.commands = commands
+        self.time = commands[-1].time
+
+    @property
+    def merge_key(self):
+        keys = tuple(c.merge_key for c in self.commands)
+        return None if None in keys else keys
+
+    def absorb(self, other):
+        for mine, theirs in zip(self.commands, other.commands):
+            mine.absorb(theirs)
+        self.time = other.time
+
+    def apply(self, app):
+        for command in self.commands:
+            command.apply(app)
+
+    def revert(self, app):
+        for command in reversed(self.commands):
+            command.revert(app)
+
+    def size(self):
+        return COMMAND_BYTES + sum(c.size() for c in self.commands)
+
+
+class History:
+    """The command log, the undo cursor and periodic snapshots.
+
+    Steps are numbered from the start of the session; `base` is the oldest
+    step still reachable once the budget has trimmed the log.
+    """
+
+    def __init__(self, app, budget=HISTORY_BUDGET, snapshot_every=SNAPSHOT_EVERY):
+        self.app = app
+        self.budget = budget
+        self.snapshot_every = snapshot_every
+        self.log = []
+        self.sizes = []
+        self.cursor = 0
+        self.base = 0
+        self.snapshots = {}
+        self.bytes = 0
+        self.pending = None
+        self.depth = 0
+
+    @property
+    def step(self):
+        return self.base + self.cursor
+
+    def can_undo(self):
+        return self.cursor > 0
+
+    def can_redo(self):
+        return self.cursor < len(self.log)
+
+    def clear(self):
+        """Forget all history; the current project becomes step 0."""
+        self.log = []
+        self.sizes = []
+        self.cursor = 0
+        self.base = 0
+        self.snapshots = {}
+        self.bytes = 0
+        if self.app.widgets:
+            self.snapshot()
+
+    @contextmanager
+    def batch(self):
+        """Record everything inside the block as one undo step."""
+        if self.depth == 0:
+            self.pending = []
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                commands, self.pending = self.pending, None
+                if len(commands) == 1:
+                    self.record(commands[0])
+                elif commands:
+                    self.record(Group(commands))
+
+    def record(self, command):
+        if self.pending is not None:
+            self.pending.append(command)
+            return
+        if self.cursor < len(self.log):
+            self.truncate()
+        # A snapshot pins the state after the last step, so it can't merge
+        if self.log and self.step not in self.snapshots:
+            last = self.log[-1]
+            key = last.merge_key
+            if (key is not None and key == command.merge_key
+                    and command.time - last.time <= MERGE_SECONDS):
+                last.absorb(command)
+                size = last.size()
+                self.bytes += size - self.sizes[-1]
+                self.sizes[-1] = size
+                return
+        size = command.size()
+        self.log.append(command)
+        self.sizes.append(size)
+        self.bytes += size
+        self.cursor += 1
+        # Callers record after mutating, so the project is now at this step
+        if self.step % self.snapshot_every == 0:
+            self.snapshot()
+        self.trim()
+
+    def truncate(self):
+        """Drop the redo tail when a new edit branches off."""
+        self.bytes -= sum(self.sizes[self.cursor:])
+        del self.log[self.cursor:]
+        del self.sizes[self.cursor:]
+        for step in [s for s in self.snapshots if s > self.step]:
+            self.bytes -= len(self.snapshots.pop(step))
+
+    def snapshot(self):
+        if self.app.loading:
+            return
+        data = zlib.compress(json.dumps(self.app.widgets.to_snapshot()).encode('utf-8'))
+        self.snapshots[self.step] = data
+        self.bytes += len(data)
+
+    def trim(self):
+        if self.bytes <= self.budget:
+            return
+        excess = self.bytes - self.budget
+        drop = 0
+        # Keep the step just done undoable, however large it is
+        while drop < self.cursor - 1 and excess > 0:
+            excess -= self.sizes[drop]
+            drop += 1
+        if not drop:
+            return
+        self.bytes -= sum(self.sizes[:drop])
+        del self.log[:drop]
+        del self.sizes[:drop]
+        self.cursor -= drop
+        self.base += drop
+        for step in [s for s in self.snapshots if s < self.base]:
+            self.bytes -= len(self.snapshots.pop(step))
+
+    def undo(self, steps=1):
+        return self.jump(self.step - steps)
+
+    def redo(self, steps=1):
+        return self.jump(self.step + steps)
+
+    def jump(self, target):
+        """Move to absolute step `target`; returns the number of steps moved."""
+        target = max(self.base, min(target, self.base + len(self.log)))
+        start = self.step
+        if target == start:
+            return 0
+        if abs(target - start) > 1 and self.snapshots:
+            nearest = min(self.snapshots, key=lambda s: abs(s - target))
+            restore = len(self.app.widgets) * RESTORE_BYTES + self.replay_bytes(nearest, target)
+            if restore < self.replay_bytes(start, target):
+                snapshot = json.loads(zlib.decompress(self.snapshots[nearest]))
+                self.app.load_widgets(WidgetStore.from_snapshot(snapshot))
+                self.cursor = nearest - self.base
+        app = self.app
+        while self.step > target:
+            self.cursor -= 1
+            self.log[self.cursor].revert(app)
+        while self.step < target:
+            self.log[self.cursor].apply(app)
+            self.cursor += 1
+        return abs(target - start)
+
+    def replay_bytes(self, a, b):
+        a, b = sorted((a - self.base, b - self.base))
+        return sum(self.sizes[a:b])
+
+    def stats(self):
+        return {'steps': len(self.log), 'cursor': self.cursor, 'base': self.base,
+                'snapshots': len(self.snapshots), 'bytes': self.bytes}
@@ -0,0 +1,241 @@
+"""Spatial hit-testing for the design canvas.
+
+Widgets are bucketed into a uniform grid of square cells, so a click only
+looks at the handful of widgets sharing its cell instead of every widget
+on the canvas. An EdgeIndex alongside keeps widget edges sorted per axis
+for snapping.
+"""
+from bisect import bisect_left, insort
+
+CELL_SIZE = 64
+
+
+def widget_bounds(data):
+    """Return the (x1, y1, x2, y2) box a widget covers on the design canvas."""
+    x, y = data['x'], data['y']
+    w, h = data['width'], data['height']
+    kind = data['type']
+    if kind == 'Text':
+        return (x, y, x + w, y + h * 2)
+    if kind in ('Checkbutton', 'Radiobutton'):
+        return (x, y, x + max(w, 25), y + 25)
+    if kind == 'Scale':
+        return (x, y + 5, x + w, y + 30)
+    if kind == 'Progressbar':
+        return (x, y, x + w, y + 25)
+    return (x, y, x + w, y + h)
+
+
+class EdgeIndex:
+    """Sorted distinct edge values per axis, for nearest-edge lookups.
+
+    Axis 0 holds every widget's left, center and right x; axis 1 its top,
+    middle and bottom y. Each distinct value is stored once with the set
+    of widgets owning it, so a thousand widgets at x=100 cost one entry.
+    Bounds are read from the SpatialIndex entries; changes are only noted
+    and applied on the next lookup - one by one when few widgets changed,
+    by re-sorting when many did (a bulk insert, a load).
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.values = None
+        self.owners = None
+        self.built = {}
+        self.changed = set()
+
+    def touch(self, wid):
+        if self.values is not None:
+            self.changed.add(wid)
+
+    def reset(self):
+        self.values = self.owners = None
+        self.built = {}
+        self.changed = set()
+
+    @staticmethod
+    def edges(bounds):
+        x1, y1, x2, y2 = bounds
+        return (x1, (x1 + x2) / 2, x2), (y1, (y1 + y2) / 2, y2)
+
+    def _link(self, wid, bounds, sort=True):
+        for axis, edges in enumerate(self.edges(bounds)):
+            owners = self.owners[axis]
+            for value in edges:
+                wids = owners.get(value)
+                if wids is None:
+                    owners[value] = {wid}
+                    if sort:
+                        insort(self.values[axis], value)
+                else:
+                    wids.add(wid)
+        self.built[wid] = bounds
+
+    def _unlink(self, wid, bounds):
+        for axis, edges in enumerate(self.edges(bounds)):
+            owners = self.owners[axis]
+            for value in edges:
+                wids = owners.get(value)
+                if wids is not None:
+                    wids.discard(wid)
+                    if not wids:
+                        del owners[value]
+                        values = self.values[axis]
+                        del values[bisect_left(values, value)]
+
+    def sync(self):
+        if self.values is None or len(self.changed) > max(64, len(self.entries) // 8):
+            self.owners = ({}, {})
+            self.built = {}
+            for wid, (bounds, _) in self.entries.items():
+                self._link(wid, bounds, sort=False)
+            self.values = [sorted(self.owners[0]), sorted(self.owners[1])]
+        else:
+            for wid in self.changed:
+                old = self.built.pop(wid, None)
+                if old is not None:
+                    self._unlink(wid, old)
+                entry = self.entries.get(wid)
+                if entry is not None:
+                    self._link(wid, entry[0])
+        self.changed.clear()
+
+    def nearest(self, axis, value, tolerance, exclude=()):
+        """(edge value, owner id) closest to `value` within tolerance, or None."""
+        if self.values is None or self.changed:
+            self.sync()
+        values, owners = self.values[axis], self.owners[axis]
+        hi = bisect_left(values, value)
+        lo = hi - 1
+        while True:
+            below = value - values[lo] if lo >= 0 else None
+            above = values[hi] - value if hi < len(values) else None
+            if above is not None and (below is None or above <= below):
+                if above > tolerance:
+                    return None
+                candidate = values[hi]
+                hi += 1
+            elif below is not None:
+                if below > tolerance:
+                    return None
+                candidate = values[lo]
+                lo -= 1
+            else:
+                return None
+            for wid in owners[candidate]:
+                if wid not in exclude:
+                    return candidate, wid
+
+
+class SpatialIndex:
+    """Uniform-grid index of widget boxes with a stacking order.
+
+    Every insert puts the widget on top, mirroring how the canvas stacks
+    freshly created items; `move` keeps the current stacking position.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+        self.edges = EdgeIndex(self.entries)
+        self._z = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, wid):
+        return wid in self.entries
+
+    def _cell_range(self, x1, y1, x2, y2):
+        size = self.cell_size
+        for cx in range(int(x1 // size), int(x2 // size) + 1):
+            for cy in range(int(y1 // size), int(y2 // size) + 1):
+                yield cx, cy
+
+    def _link(self, wid, bounds):
+        for key in self._cell_range(*bounds):
+            bucket = self.cells.get(key)
+            if bucket is None:
+                self.cells[key] = {wid}
+            else:
+                bucket.add(wid)
+
+    def _unlink(self, wid, bounds):
+        for key in self._cell_range(*bounds):
+            bucket = self.cells.get(key)
+            if bucket is not None:
+                bucket.discard(wid)
+                if not bucket:
+                    del self.cells[key]
+
+    def insert(self, wid, bounds, z=None):
+        """Add or re-add a widget, on top unless an explicit z is given."""
+        if wid in self.entries:
+            self._unlink(wid, self.entries[wid][0])
+        if z is None:
+            self._z += 1
+            z = self._z
+        elif z > self._z:
+            # Loaded with stored depths: new widgets still go on top
+            self._z = z
+        self.entries[wid] = (bounds, z)
+        self._link(wid, bounds)
+        self.edges.touch(wid)
+
+    def move(self, wid, bounds):
+        old = self.entries.get(wid)
+        if old is None:
+            self.insert(wid, bounds)
+            return
+        if old[0] != bounds:
+            self._unlink(wid, old[0])
+            self._link(wid, bounds)
+            self.edges.touch(wid)
+        self.entries[wid] = (bounds, old[1])
+
+    def remove(self, wid):
+        entry = self.entries.pop(wid, None)
+        if entry is not None:
+            self._unlink(wid, entry[0])
+            self.edges.touch(wid)
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+        self.edges.reset()
+        self._z = 0
+
+    def topmost(self, x, y):
+        """Return the id of the highest-stacked widget containing (x, y)."""
+        size = self.cell_size
+        bucket = self.cells.get((int(x // size), int(y // size)))
+        if not bucket:
+            return None
+        best, best_z = None, -1
+        for wid in bucket:
+            (x1, y1, x2, y2), z = self.entries[wid]
+            if x1 <= x <= x2 and y1 <= y <= y2 and z > best_z:
+                best, best_z = wid, z
+        return best
+
+    def query(self, x1, y1, x2, y2):
+        """Return ids of widgets intersecting the rectangle, bottom to top."""
+        size = self.cell_size
+        spanned = (int(x2 // size) - int(x1 // size) + 1) * (int(y2 // size) - int(y1 // size) + 1)
+        if spanned > len(self.cells):
+            # Zoomed far out: checking every widget beats walking empty cells
+            found = self.entries
+        else:
+            found = set()
+            for key in self._cell_range(x1, y1, x2, y2):
+                bucket = self.cells.get(key)
+                if bucket:
+                    found.update(bucket)
+        hits = []
+        for wid in found:
+            (bx1, by1, bx2, by2), z = self.entries[wid]
+            if bx1 <= x2 and bx2 >= x1 and by1 <= y2 and by2 >= y1:
+                hits.append((z, wid))
+        hits.sort()
+        return [wid for _, wid in hits]
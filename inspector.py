@@ -0,0 +1,258 @@
+"""Persistent property inspector for the builder's right-hand panel.
+
+Every editor is built once. Selecting a widget only rebinds values and
+shows or hides the rows that apply to its type, instead of destroying and
+recreating the whole panel.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+PANEL_BG = "#2d2d2d"
+ENTRY_BG = "#34495e"
+
+FONTS = ['Arial', 'Helvetica', 'Times New Roman', 'Courier']
+TEXT_TYPES = ('Label', 'Button', 'Checkbutton', 'Radiobutton')
+MAIN_COLOR_TYPES = ('Button', 'Checkbutton', 'Radiobutton', 'Scale', 'Progressbar')
+
+# (key, label, editor kind, widget types it applies to or None for all, options)
+FIELDS = [
+    ('text', 'Text:', 'input', TEXT_TYPES, None),
+    ('font', 'Font:', 'combo', None, FONTS),
+    ('font_size', 'Font Size:', 'number', None, None),
+    ('geometry', 'Position & Size', 'geometry', None, None),
+    ('bg_color', 'Background', 'color', None, None),
+    ('fg_color', 'Main Color', 'color', MAIN_COLOR_TYPES, None),
+    ('text_color', 'Text Color', 'color', None, None),
+    ('border_color', 'Border', 'color', None, None),
+    ('corner_radius', 'Corner Radius', 'slider', None, (0, 50)),
+    ('border_width', 'Border Width', 'slider', None, (0, 10)),
+]
+
+# Entry key, label, grid row/column and the value used when left blank
+GEOMETRY = [('x', 'X:', 0, 0, 0), ('y', 'Y:', 0, 2, 0),
+            ('width', 'W:', 1, 0, 100), ('height', 'H:', 1, 2, 30)]
+
+
+def set_entry(ent, value):
+    ent.delete(0, tk.END)
+    ent.insert(0, value)
+
+
+class PropertyInspector:
+    def __init__(self, parent, app):
+        self.parent = parent
+        self.app = app
+        self.targets = []
+        self.setters = {}
+        self.rows = []
+        self.slider_values = {}
+        self.shown = {}
+
+        self.empty = tk.Label(parent, text="Select a widget\nto edit properties",
+                              font=("Arial", 10), fg="#95a5a6", bg=PANEL_BG)
+        self.body = tk.Frame(parent, bg=PANEL_BG)
+        self.body.columnconfigure(0, weight=1)
+
+        header = tk.Frame(self.body, bg="#34495e")
+        header.grid(row=0, column=0, sticky='ew', pady=(0, 10))
+        self.title = tk.Label(header, font=("Arial", 11, "bold"), bg="#34495e", fg="white")
+        self.title.pack(side=tk.LEFT, padx=10, pady=5)
+        tk.Button(header, text="🗑️", command=self.delete_targets,
+                  bg="#e74c3c", fg="white").pack(side=tk.RIGHT, padx=10)
+
+        for row, (key, label, kind, types, options) in enumerate(FIELDS, start=1):
+            frame = getattr(self, f"build_{kind}")(key, label, options)
+            pady = 5 if kind == 'geometry' else 3
+            frame.grid(row=row, column=0, sticky='ew', padx=10, pady=pady)
+            self.rows.append((frame, types))
+
+        self.empty.pack(pady=50)
+
+    # Editors
+
+    def field_frame(self, label):
+        f = tk.Frame(self.body, bg=PANEL_BG)
+        tk.Label(f, text=label, bg=PANEL_BG, fg="white", font=("Arial", 9)).pack(anchor='w')
+        return f
+
+    def build_input(self, key, label, options, number=False):
+        f = self.field_frame(label)
+        ent = tk.Entry(f, bg=ENTRY_BG, fg="white")
+        ent.pack(fill=tk.X, pady=2)
+
+        def typed(e):
+            if number:
+                self.typed_number(key, ent.get())
+            elif self.edited(key, ent.get()):
+                self.apply(key, ent.get())
+
+        ent.bind('<KeyRelease>', typed)
+        self.setters[key] = lambda value: self.fill(key, ent, value)
+        return f
+
+    def build_number(self, key, label, options):
+        return self.build_input(key, label, options, number=True)
+
+    def build_combo(self, key, label, values):
+        f = self.field_frame(label)
+        var = tk.StringVar()
+        combo = ttk.Combobox(f, textvariable=var, values=values, state='readonly')
+        combo.pack(fill=tk.X, pady=2)
+        combo.bind('<<ComboboxSelected>>', lambda e: self.apply(key, var.get()))
+        self.setters[key] = var.set
+        return f
+
+    def build_geometry(self, key, label, options):
+        sec = tk.LabelFrame(self.body, text=label, bg=PANEL_BG,
+                            fg="white", font=("Arial", 9, "bold"))
+        lines = {}
+        for field, text, line, col, blank in GEOMETRY:
+            if line not in lines:
+                lines[line] = tk.Frame(sec, bg=PANEL_BG)
+                lines[line].pack(fill=tk.X, padx=5, pady=3)
+            f = lines[line]
+            tk.Label(f, text=text, bg=PANEL_BG, fg="white").grid(
+                row=0, column=col, padx=(10, 0) if col else 0)
+            ent = tk.Entry(f, width=6, bg=ENTRY_BG, fg="white")
+            ent.grid(row=0, column=col + 1, padx=3)
+            ent.bind('<Return>', lambda e, k=field, d=blank, w=ent: self.typed_number(k, w.get(), d))
+            self.setters[field] = lambda value, k=field, w=ent: self.fill(k, w, value)
+        return sec
+
+    def build_color(self, key, label, options):
+        f = self.field_frame(f"{label}:")
+        cf = tk.Frame(f, bg=PANEL_BG)
+        cf.pack(fill=tk.X, pady=2)
+
+        display = tk.Canvas(cf, width=25, height=20, bg=PANEL_BG, highlightthickness=1)
+        display.pack(side=tk.LEFT, padx=(0, 5))
+
+        ent = tk.Entry(cf, bg=ENTRY_BG, fg="white", width=12)
+        ent.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+
+        def show(color):
+            self.fill(key, ent, color)
+            try:
+                display.config(bg=color or PANEL_BG)
+            except tk.TclError:
+                display.config(bg=PANEL_BG)
+
+        def pick():
+            # The dialog module loads on first use, not with the panel
+            from tkinter import colorchooser
+            color = colorchooser.askcolor(ent.get() or None)[1]
+            if color:
+                show(color)
+                self.apply(key, color)
+
+        def typed(e):
+            color = ent.get()
+            if self.edited(key, color):
+                show(color)
+                self.apply(key, color)
+
+        tk.Button(cf, text="🎨", command=pick, bg="#3498db", fg="white").pack(side=tk.LEFT)
+        ent.bind('<Return>', typed)
+        self.setters[key] = show
+        return f
+
+    def build_slider(self, key, label, bounds):
+        f = tk.Frame(self.body, bg=PANEL_BG)
+        lf = tk.Frame(f, bg=PANEL_BG)
+        lf.pack(fill=tk.X)
+        tk.Label(lf, text=f"{label}:", bg=PANEL_BG, fg="white", font=("Arial", 9)).pack(side=tk.LEFT)
+        val_lbl = tk.Label(lf, bg=PANEL_BG, fg="#3498db", font=("Arial", 9, "bold"))
+        val_lbl.pack(side=tk.RIGHT)
+
+        def on_change(v):
+            v = int(float(v))
+            val_lbl.config(text=str(v))
+            # Tk reports programmatic set() calls too, later, from the idle loop
+            if v == self.slider_values.get(key):
+                return
+            self.slider_values[key] = v
+            self.apply(key, v)
+
+        slider = tk.Scale(f, from_=bounds[0], to=bounds[1], orient=tk.HORIZONTAL,
+                          bg=ENTRY_BG, fg="white", command=on_change, highlightthickness=0)
+        slider.pack(fill=tk.X, pady=2)
+
+        def show(value):
+            if value == '':
+                val_lbl.config(text="mixed")
+                value = self.targets[0][key]
+            else:
+                val_lbl.config(text=str(value))
+            self.slider_values[key] = value
+            slider.set(value)
+
+        self.setters[key] = show
+        return f
+
+    # Binding
+
+    def fill(self, key, ent, value):
+        self.shown[key] = str(value)
+        set_entry(ent, value)
+
+    def edited(self, key, text):
+        # Key releases include Tab, arrows and modifiers, and a multi-selection
+        # shows differing values as a blank: only text the user changed applies
+        if text == self.shown.get(key):
+            return False
+        self.shown[key] = text
+        return True
+
+    def show(self, targets):
+        self.targets = [t for t in targets if t is not None]
+        if not self.targets:
+            self.body.pack_forget()
+            self.empty.pack(pady=50)
+            return
+        self.empty.pack_forget()
+        if len(self.targets) == 1:
+            data = self.targets[0]
+            self.title.config(text=f"{data['type']} #{data['id']}")
+        else:
+            self.title.config(text=f"{len(self.targets)} widgets")
+
+        kinds = {t['type'] for t in self.targets}
+        for frame, types in self.rows:
+            if types is None or kinds.issubset(types):
+                frame.grid()
+            else:
+                frame.grid_remove()
+        self.refresh()
+        self.body.pack(fill=tk.X)
+
+    def refresh(self):
+        if not self.targets:
+            return
+        for key, setter in self.setters.items():
+            setter(self.shared_value(key))
+
+    def shared_value(self, key):
+        first = self.targets[0][key]
+        for t in self.targets[1:]:
+            if t[key] != first:
+                return ''
+        return first
+
+    def typed_number(self, key, text, blank=None):
+        # A blank geometry entry means its default; elsewhere it isn't a number yet
+        try:
+            value = int(text) if text or blank is None else blank
+        except ValueError:
+            return
+        if self.edited(key, text):
+            self.apply(key, value)
+
+    def apply(self, key, value):
+        with self.app.history.batch():
+            for data in self.targets:
+                self.app.update_prop(data['id'], key, value)
+
+    def delete_targets(self):
+        with self.app.history.batch():
+            for data in list(self.targets):
+                self.app.delete_widget(data['id'])
@@ -0,0 +1,267 @@
+"""Layout checks for exported windows: overlaps, off-window widgets, near misses.
+
+Boxes are the ones the design canvas draws (hittest.widget_bounds), so a
+Text counts at twice its height and check/radio buttons at their fixed
+25px. Overlapping pairs come from a sweep over x: boxes enter in order of
+their left edge and leave once the sweep passes their right edge. The
+boxes still active are kept sorted by top edge, so each new box only
+compares against the ones starting less than the tallest box's height
+above it. When one box is far taller than the rest (a Frame around the
+whole form) that window would cover most of the form, so the active
+boxes go into a tree over all top edges that keeps the largest bottom
+edge in each subtree instead: a new box then only visits subtrees
+holding a box that reaches down into it. Boxes with no width or height
+overlap nothing. Widgets lying fully inside a Frame are its contents,
+not an overlap.
+
+Near-miss misalignment groups equal edges (left, right, top, bottom) that
+are between 1 and NEAR_MISS pixels apart - the x=91 / x=92 kind of slip a
+free-hand drag leaves behind.
+
+    python lint.py project.json more.pgb ...
+
+This never imports tkinter, so it runs on display-less CI machines.
+"""
+import sys
+from bisect import bisect_left, bisect_right, insort
+from heapq import heappop, heappush
+
+from codegen import WINDOW
+from hittest import widget_bounds
+
+NEAR_MISS = 3
+NUMBER = (int, float)
+EDGES = ('left', 'top', 'right', 'bottom')
+NONE_ACTIVE = float('-inf')
+# Overlaps are searched with the max-bottom tree once the tallest box is
+# this many times the average height: the window sweep would scan too far
+TALL = 4
+
+
+class Issue:
+    """One finding: kind is 'overlap', 'bounds', 'misaligned' or 'invalid'.
+
+    Names and messages are only formatted when asked for: a large
+    project can have thousands of findings.
+    """
+
+    __slots__ = ('kind', 'rows', 'table', 'detail')
+
+    def __init__(self, kind, rows, table, detail=None):
+        self.kind = kind
+        self.rows = rows
+        self.table = table
+        self.detail = detail
+
+    def __repr__(self):
+        return f"Issue({self.kind!r}, {self.ids!r})"
+
+    @property
+    def ids(self):
+        return [self.table[row][0] for row in self.rows]
+
+    @property
+    def names(self):
+        # The variable names the export gives these widgets
+        return [f"{str(kind).lower()}{position + 1}" for _, kind, position in
+                (self.table[row] for row in self.rows)]
+
+    @property
+    def message(self):
+        names = self.names
+        if self.kind == 'overlap':
+            return f"{names[0]} and {names[1]} overlap"
+        if self.kind == 'bounds':
+            (x1, y1, x2, y2), (width, height) = self.detail
+            return f"{names[0]} spans ({x1}, {y1})-({x2}, {y2}), outside the {width}x{height} window"
+        if self.kind == 'misaligned':
+            edge, values = self.detail
+            where = ', '.join(f"{name} at {value}" for name, value in zip(names, values))
+            return f"{edge} edges almost line up: {where}"
+        return f"{names[0]}: bad geometry"
+
+
+def overlapping_pairs(boxes):
+    """(i, j) index pairs of boxes (x1, y1, x2, y2) whose interiors intersect.
+
+    Both sweeps give the same pairs in the same order: by the left edge of
+    the later box, then by the top edge of the earlier one.
+    """
+    # A box with no width or no height has no interior to overlap
+    solid = [i for i, b in enumerate(boxes) if b[0] < b[2] and b[1] < b[3]]
+    if not solid:
+        return []
+    order = sorted(solid, key=boxes.__getitem__)
+    heights = [boxes[i][3] - boxes[i][1] for i in solid]
+    max_h = max(heights)
+    if max_h > TALL * sum(heights) / len(heights):
+        return tree_sweep(boxes, order)
+    return window_sweep(boxes, order, max_h)
+
+
+def window_sweep(boxes, order, max_h):
+    """Active boxes sorted by top edge; each new box scans those starting within max_h above it."""
+    leaving = []
+    active = []
+    pairs = []
+    end = len(boxes)
+    for i in order:
+        x1, y1, x2, y2 = boxes[i]
+        while leaving and leaving[0][0] <= x1:
+            _, top, j = heappop(leaving)
+            del active[bisect_left(active, (top, j))]
+        lo = bisect_right(active, (y1 - max_h, end))
+        hi = bisect_left(active, (y2, -1))
+        for k in range(lo, hi):
+            j = active[k][1]
+            if boxes[j][3] > y1:
+                pairs.append((j, i))
+        insort(active, (y1, i))
+        heappush(leaving, (x2, y1, i))
+    return pairs
+
+
+def tree_sweep(boxes, order):
+    """Active boxes in a tree over top edges holding the largest bottom edge per subtree."""
+    # Leaves are the boxes in order of top edge; a node holds the largest
+    # bottom edge among the active boxes below it (-inf if there are none)
+    by_top = sorted(order, key=lambda i: (boxes[i][1], i))
+    tops = [boxes[i][1] for i in by_top]
+    size = 1
+    while size < len(by_top):
+        size *= 2
+    leaf = [0] * len(boxes)
+    for rank, i in enumerate(by_top):
+        leaf[i] = size + rank
+    bottom = [NONE_ACTIVE] * (2 * size)
+    # Above the root: stops the climbs in the sweep below
+    bottom[0] = float('inf')
+    leaving = []
+    pairs = []
+    for i in order:
+        x1, y1, x2, y2 = boxes[i]
+        while leaving and leaving[0][0] <= x1:
+            node = leaf[heappop(leaving)[1]]
+            bottom[node] = NONE_ACTIVE
+            node >>= 1
+            while node:
+                left, right = bottom[2 * node], bottom[2 * node + 1]
+                reach = left if left > right else right
+                if bottom[node] == reach:
+                    break
+                bottom[node] = reach
+                node >>= 1
+        # Active boxes with a top edge above y2 and a bottom edge below y1.
+        # The leaves [0, end) make up at most log n whole subtrees; only
+        # those holding a box that reaches y1 are searched
+        if bottom[1] > y1:
+            lo, hi = size, size + bisect_left(tops, y2)
+            stack = []
+            while lo < hi:
+                if lo & 1:
+                    # lo is 1: the range is the whole tree
+                    stack.append(lo)
+                    break
+                if hi & 1:
+                    hi -= 1
+                    if bottom[hi] > y1:
+                        stack.append(hi)
+                lo >>= 1
+                hi >>= 1
+            # Subtrees come off the stack left to right, so pairs are in order of top edge
+            while stack:
+                node = stack.pop()
+                if node >= size:
+                    pairs.append((by_top[node - size], i))
+                    continue
+                node *= 2
+                if bottom[node + 1] > y1:
+                    stack.append(node + 1)
+                if bottom[node] > y1:
+                    stack.append(node)
+        node = leaf[i]
+        while bottom[node] < y2:
+            bottom[node] = y2
+            node >>= 1
+        heappush(leaving, (x2, i))
+    return pairs
+
+
+def near_misses(values, tolerance=NEAR_MISS):
+    """Groups of indexes whose values differ, but by no more than `tolerance`."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    groups = []
+    start = 0
+    for k in range(1, len(order) + 1):
+        if k == len(order) or values[order[k]] - values[order[start]] > tolerance:
+            if values[order[k - 1]] != values[order[start]]:
+                groups.append(order[start:k])
+            start = k
+    return groups
+
+
+def contains(outer, inner):
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and outer[2] >= inner[2] and outer[3] >= inner[3])
+
+
+def lint(widgets, window=WINDOW):
+    """Check a project (Widgets or widget dicts, in stacking order)."""
+    width, height = window
+    issues = []
+    # table rows are (id, type, position in the project), boxes line up with them
+    boxes, table, invalid = [], [], []
+    for i, w in enumerate(widgets):
+        try:
+            box = widget_bounds(w)
+        except (KeyError, TypeError):
+            box = None
+        if (box is None or type(box[0]) not in NUMBER or type(box[1]) not in NUMBER
+                or type(box[2]) not in NUMBER or type(box[3]) not in NUMBER):
+            invalid.append((w.get('id'), w.get('type'), i))
+            continue
+        boxes.append(box)
+        table.append((w['id'], w['type'], i))
+    for row in invalid:
+        table.append(row)
+        issues.append(Issue('invalid', [len(table) - 1], table))
+
+    for i, box in enumerate(boxes):
+        if box[0] < 0 or box[1] < 0 or box[2] > width or box[3] > height:
+            issues.append(Issue('bounds', [i], table, (box, window)))
+
+    for i, j in overlapping_pairs(boxes):
+        if table[i][1] == 'Frame' and contains(boxes[i], boxes[j]):
+            continue
+        if table[j][1] == 'Frame' and contains(boxes[j], boxes[i]):
+            continue
+        issues.append(Issue('overlap', [i, j] if i < j else [j, i], table))
+
+    seen = set()
+    for edge, column in zip(EDGES, zip(*boxes) if boxes else ((),) * 4):
+        for group in near_misses(column):
+            # Equal-width widgets repeat their left-edge slip on the right edge
+            key = (edge in ('left', 'right'), frozenset(group))
+            if key in seen:
+                continue
+            seen.add(key)
+            issues.append(Issue('misaligned', group, table, (edge, [column[i] for i in group])))
+    return issues
+
+
+def main(argv=None):
+    from export_cli import find_projects, read_project
+
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        sys.exit("usage: lint.py PROJECT_OR_DIR ...")
+    found = 0
+    for src in find_projects(paths):
+        for issue in lint(read_project(src)):
+            found += 1
+            print(f"{src}: {issue.kind}: {issue.message}")
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
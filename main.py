@@ -1,23 +1,202 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, colorchooser
+import gc
 import json
+import os
+import threading
+import time
+
+# Only what the first frame needs is imported here. Dialogs, file formats,
+# code generation, the layout check, the profiler and the live preview are
+# imported where they are first used (see PyGUIBuilder's `lazy` mode).
+from autosave import (RECOVER_ERRORS, UNTITLED, Journal, has_changes, last_project, recover,
+                      remember_project)
+from drag import DragEngine
+from history import Add, History, Move, Remove, SetProp
+from hittest import SpatialIndex, widget_bounds
+from model import Widget, WidgetStore
+from render import OVERLAY_TAG, CanvasRenderer, RenderScheduler
+from snap import Snapper
+from sprites import SpriteCache
+
+ZOOM_STEPS = [0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0]
+# Layout issues listed in the check dialog; the rest are only counted
+LINT_SHOWN = 12
+
+# Startup: panels are built once the canvas has painted, or after this long
+# if it never does (a withdrawn window)
+FIRST_FRAME_TIMEOUT_MS = 1000
+RESTORE_POLL_MS = 20
+# Opening a .pgdb: rows are merged in slices of this long between events,
+# and a newly exposed view reads at most VIEW_ROWS rows up front
+LOAD_SLICE_MS = 8
+LOAD_BATCH = 256
+VIEW_ROWS = 2000
+
+PROJECT_TYPES = [("JSON files", "*.json"), ("PyGUI binary project", "*.pgb"),
+                 ("PyGUI project database", "*.pgdb")]
 
 class PyGUIBuilder:
-    def __init__(self, root):
+    def __init__(self, root, autosave=True, lazy=True):
+        # lazy: show the canvas first, then build the side panels and reopen
+        # the last project; otherwise everything is ready on return
         self.root = root
         self.root.title("PyGUI Builder Pro - CustomTkinter Edition")
         self.root.geometry("1400x800")
         self.root.configure(bg="#1a1a1a")
         
-        self.widgets = []
+        self.widgets = WidgetStore()
         self.next_id = 1
         self.selected_widget = None
-        self.canvas_widgets = {}
-        self.drag_data = {"item": None, "x": 0, "y": 0}
+        self.selected_ids = []
+        self.clipboard = []
+        self.hit_index = SpatialIndex()
+        self._codegen = None
+        self._compact_codegen = None
+        self._profiler = None
+        self._preview = None
+        self.inspector = None
+        self.autosave = autosave
+        self.lazy = lazy
+        self.started = False
+        self.restore_job = None
+        self.history = History(self)
+        self.project_path = None
+        self.journal = None
+        self.sync_job = None
+        # Open .pgdb project: rows changed since the last save, written back on save
+        self.db = None
+        self.db_changed = set()
+        self.db_removed = set()
+        self.db_full = False
+        # Rows of an opening .pgdb not merged yet, and the views already read
+        self.db_rows = None
+        self.db_views = []
+        self.load_job = None
+        self.gc_paused = False
+        self.gc_frozen = False
         
         self.setup_ui()
-        self.canvas.bind("<Button-1>", self.on_canvas_click)
-        self.canvas.bind("<B1-Motion>", self.on_canvas_drag)
+        self.renderer = CanvasRenderer(self.canvas, self.hit_index, lambda wid: self.widgets.get(wid),
+                                       depth=lambda wid: self.widgets.z(wid))
+        self.render = RenderScheduler(self.canvas, self.redraw)
+        self.drag = DragEngine(self.canvas, self.finish_drag)
+        self.snapper = Snapper(self.canvas, self.hit_index.edges)
+        # Looked up per event so the profiler's timing wrappers take effect
+        self.canvas.bind("<Button-1>", lambda e: self.on_canvas_click(e))
+        self.canvas.bind("<B1-Motion>", lambda e: self.on_canvas_drag(e))
+        self.canvas.bind("<ButtonRelease-1>", lambda e: self.on_canvas_release(e))
+        # Pan with the middle button or the wheel, zoom with Ctrl+wheel
+        self.canvas.bind("<ButtonPress-2>", lambda e: self.canvas.scan_mark(e.x, e.y))
+        self.canvas.bind("<B2-Motion>", self.on_canvas_pan)
+        self.canvas.bind("<MouseWheel>", self.on_canvas_wheel)
+        self.canvas.bind("<Button-4>", self.on_canvas_wheel)
+        self.canvas.bind("<Button-5>", self.on_canvas_wheel)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_sync())
+        # Clipboard keys live on the canvas so they don't steal them from property entries
+        self.canvas.bind("<Control-c>", lambda e: self.copy_selection())
+        self.canvas.bind("<Control-v>", lambda e: self.paste())
+        self.canvas.bind("<Control-d>", lambda e: self.duplicate_selection())
+        self.root.bind("<Control-z>", lambda e: self.undo())
+        self.root.bind("<Control-y>", lambda e: self.redo())
+        self.root.bind("<Control-Shift-Z>", lambda e: self.redo())
+        # F12 toggles profiling and its HUD, Shift+F12 saves what it measured
+        self.root.bind("<F12>", lambda e: self.profiler.toggle())
+        self.root.bind("<Shift-F12>", lambda e: self.export_profile())
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        if lazy:
+            self.canvas.bind("<Expose>", lambda e: self.first_frame())
+            self.root.after(FIRST_FRAME_TIMEOUT_MS, self.first_frame)
+        else:
+            self.first_frame()
+    
+    # Startup
+    def first_frame(self):
+        if self.started:
+            return
+        self.started = True
+        if self.lazy:
+            # Idle callbacks run after the canvas has drawn itself
+            self.root.after_idle(self.finish_startup)
+        else:
+            self.finish_startup()
+    
+    def finish_startup(self):
+        self.build_panels()
+        if os.environ.get('PYGUI_PROFILE'):
+            self.profiler.toggle()
+        if self.autosave:
+            self.start_autosave()
+            self.restore_last_project()
+    
+    def restore_last_project(self):
+        # Reopen last session's project, unless its unsaved work was just recovered
+        # or a project was opened before startup finished
+        filename = last_project()
+        if (not filename or self.widgets or self.project_path is not None
+                or not os.path.exists(filename)):
+            return
+        if self.lazy:
+            self.restore_project(filename)
+        else:
+            self.open_project(filename)
+    
+    def restore_project(self, filename):
+        # Opens a project without blocking the UI: a .pgdb already loads the
+        # visible region first, other files are read on a worker thread and
+        # shown when done, unless something was opened or drawn meanwhile
+        import projectdb
+        journaled = self.journal is not None and has_changes(filename)
+        if not journaled and projectdb.is_database(filename):
+            self.open_project(filename)
+            return
+        result = {}
+        
+        def read():
+            try:
+                result['widgets'] = (recover(filename, self.read_project) if journaled
+                                     else self.read_project(filename))
+            except RECOVER_ERRORS:
+                pass
+        worker = threading.Thread(target=read, daemon=True)
+        worker.start()
+        
+        def check():
+            if worker.is_alive():
+                self.restore_job = self.root.after(RESTORE_POLL_MS, check)
+                return
+            self.restore_job = None
+            if 'widgets' in result and not self.widgets and self.project_path is None:
+                self.open_project(filename, result['widgets'])
+        self.restore_job = self.root.after(RESTORE_POLL_MS, check)
+    
+    # Created on first use
+    @property
+    def codegen(self):
+        if self._codegen is None:
+            from codegen import CodeGenerator
+            self._codegen = CodeGenerator()
+        return self._codegen
+    
+    @property
+    def compact_codegen(self):
+        if self._compact_codegen is None:
+            from codegen import CompactGenerator
+            self._compact_codegen = CompactGenerator()
+        return self._compact_codegen
+    
+    @property
+    def profiler(self):
+        if self._profiler is None:
+            from perf import Profiler
+            self._profiler = Profiler(self)
+        return self._profiler
+    
+    @property
+    def preview(self):
+        if self._preview is None:
+            from preview import LivePreview
+            self._preview = LivePreview(self, on_exit=self.preview_closed)
+        return self._preview
     
     def setup_ui(self):
         # Top toolbar
@@ -31,6 +210,10 @@ class PyGUIBuilder:
                  bg="#3498db", fg="white", font=("Arial", 10, "bold"),
                  padx=15, pady=8).pack(side=tk.RIGHT, padx=10, pady=15)
         
+        tk.Button(toolbar, text="🔍 Check", command=self.check_layout,
+                 bg="#8e44ad", fg="white", font=("Arial", 10, "bold"),
+                 padx=15, pady=8).pack(side=tk.RIGHT, padx=5, pady=15)
+        
         tk.Button(toolbar, text="💾 Save", command=self.save_project,
                  bg="#2ecc71", fg="white", font=("Arial", 10, "bold"),
                  padx=15, pady=8).pack(side=tk.RIGHT, padx=5, pady=15)
@@ -43,6 +226,47 @@ class PyGUIBuilder:
                  bg="#e74c3c", fg="white", font=("Arial", 10, "bold"),
                  padx=15, pady=8).pack(side=tk.RIGHT, padx=5, pady=15)
         
+        self.compact_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(toolbar, text="📦 Compact", variable=self.compact_var,
+                      bg="#2c3e50", fg="white",
+                      selectcolor="#34495e", activebackground="#2c3e50",
+                      font=("Arial", 10, "bold")).pack(side=tk.RIGHT, padx=10, pady=15)
+        
+        self.snap_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(toolbar, text="🧲 Snap", variable=self.snap_var,
+                      bg="#2c3e50", fg="white",
+                      selectcolor="#34495e", activebackground="#2c3e50",
+                      font=("Arial", 10, "bold")).pack(side=tk.RIGHT, padx=10, pady=15)
+        
+        self.preview_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(toolbar, text="👁️ Preview", variable=self.preview_var,
+                      command=self.toggle_preview, bg="#2c3e50", fg="white",
+                      selectcolor="#34495e", activebackground="#2c3e50",
+                      font=("Arial", 10, "bold")).pack(side=tk.RIGHT, padx=10, pady=15)
+        
+        self.sprite_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(toolbar, text="🖼️ Sprites", variable=self.sprite_var,
+                      command=self.toggle_sprites, bg="#2c3e50", fg="white",
+                      selectcolor="#34495e", activebackground="#2c3e50",
+                      font=("Arial", 10, "bold")).pack(side=tk.RIGHT, padx=10, pady=15)
+        
+        tk.Button(toolbar, text="↷", command=self.redo,
+                 bg="#34495e", fg="white", font=("Arial", 10, "bold"),
+                 padx=8, pady=8).pack(side=tk.RIGHT, padx=(0, 10), pady=15)
+        tk.Button(toolbar, text="↶", command=self.undo,
+                 bg="#34495e", fg="white", font=("Arial", 10, "bold"),
+                 padx=8, pady=8).pack(side=tk.RIGHT, pady=15)
+        
+        tk.Button(toolbar, text="➕", command=lambda: self.step_zoom(1),
+                 bg="#34495e", fg="white", font=("Arial", 10, "bold"),
+                 padx=8, pady=8).pack(side=tk.RIGHT, padx=(0, 20), pady=15)
+        self.zoom_label = tk.Label(toolbar, text="100%", width=5, font=("Arial", 10, "bold"),
+                                   bg="#2c3e50", fg="white")
+        self.zoom_label.pack(side=tk.RIGHT, pady=15)
+        tk.Button(toolbar, text="➖", command=lambda: self.step_zoom(-1),
+                 bg="#34495e", fg="white", font=("Arial", 10, "bold"),
+                 padx=8, pady=8).pack(side=tk.RIGHT, pady=15)
+        
         # Main container
         main = tk.Frame(self.root, bg="#1a1a1a")
         main.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
@@ -54,17 +278,7 @@ class PyGUIBuilder:
         
         tk.Label(left, text="Widgets", font=("Arial", 12, "bold"),
                 bg="#2d2d2d", fg="white").pack(pady=10)
-        
-        widgets_list = [
-            ("Label", "#3498db"), ("Button", "#2ecc71"), ("Entry", "#9b59b6"),
-            ("Text", "#e67e22"), ("Checkbutton", "#1abc9c"), ("Radiobutton", "#34495e"),
-            ("Frame", "#95a5a6"), ("Scale", "#c0392b"), ("Progressbar", "#27ae60")
-        ]
-        
-        for name, color in widgets_list:
-            tk.Button(left, text=name, command=lambda n=name: self.add_widget(n),
-                     bg=color, fg="white", font=("Arial", 9, "bold"),
-                     width=15, pady=8).pack(pady=3, padx=10)
+        self.palette = left
         
         # Center canvas
         center = tk.Frame(main, bg="#1a1a1a")
@@ -77,6 +291,13 @@ class PyGUIBuilder:
         canvas_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         self.canvas = tk.Canvas(canvas_frame, bg="white")
+        xscroll = tk.Scrollbar(canvas_frame, orient="horizontal",
+                               command=lambda *a: self.scroll_canvas(self.canvas.xview, *a))
+        yscroll = tk.Scrollbar(canvas_frame, orient="vertical",
+                               command=lambda *a: self.scroll_canvas(self.canvas.yview, *a))
+        self.canvas.configure(xscrollcommand=xscroll.set, yscrollcommand=yscroll.set)
+        xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        yscroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
         # Right panel with scrollbar
@@ -86,7 +307,27 @@ class PyGUIBuilder:
         
         tk.Label(right, text="⚙️ Properties", font=("Arial", 12, "bold"),
                 bg="#2d2d2d", fg="white").pack(pady=10)
+        self.props_panel = right
+    
+    def build_panels(self):
+        # Palette buttons and the property editor; part of setup_ui, but
+        # built after the first frame (or as soon as something needs them)
+        if self.inspector is not None:
+            return
+        from inspector import PropertyInspector
+        
+        widgets_list = [
+            ("Label", "#3498db"), ("Button", "#2ecc71"), ("Entry", "#9b59b6"),
+            ("Text", "#e67e22"), ("Checkbutton", "#1abc9c"), ("Radiobutton", "#34495e"),
+            ("Frame", "#95a5a6"), ("Scale", "#c0392b"), ("Progressbar", "#27ae60")
+        ]
+        
+        for name, color in widgets_list:
+            tk.Button(self.palette, text=name, command=lambda n=name: self.add_widget(n),
+                     bg=color, fg="white", font=("Arial", 9, "bold"),
+                     width=15, pady=8).pack(pady=3, padx=10)
         
+        right = self.props_panel
         canvas_props = tk.Canvas(right, bg="#2d2d2d", highlightthickness=0)
         scrollbar = tk.Scrollbar(right, orient="vertical", command=canvas_props.yview)
         self.props_frame = tk.Frame(canvas_props, bg="#2d2d2d")
@@ -99,380 +340,686 @@ class PyGUIBuilder:
         canvas_props.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.show_empty_props()
+        self.inspector = PropertyInspector(self.props_frame, self)
+    
+    def properties(self):
+        self.build_panels()
+        return self.inspector
     
     def show_empty_props(self):
-        for w in self.props_frame.winfo_children():
-            w.destroy()
-        tk.Label(self.props_frame, text="Select a widget\nto edit properties",
-                font=("Arial", 10), fg="#95a5a6", bg="#2d2d2d").pack(pady=50)
+        self.properties().show([])
     
     def add_widget(self, widget_type):
-        data = {
-            'id': self.next_id,
-            'type': widget_type,
-            'text': f'{widget_type} {self.next_id}',
-            'x': 100 + len(self.widgets) * 20,
-            'y': 100 + len(self.widgets) * 20,
-            'width': 150, 'height': 35,
-            'font': 'Arial', 'font_size': 12,
-            'bg_color': '#f0f0f0', 'fg_color': '#3498db',
-            'text_color': '#000000', 'border_color': '#cccccc',
-            'corner_radius': 10, 'border_width': 2,
-            'hover_color': '#2980b9'
-        }
-        self.widgets.append(data)
-        self.draw_widget(data)
-        self.select_widget(data)
-        self.next_id += 1
+        return self.add_widgets([{'type': widget_type}])[0]
+    
+    def add_widgets(self, specs, select='last'):
+        # One transaction: ids are handed out in a block, widgets are drawn in
+        # a single pass and the selection/property panel is updated once.
+        # Missing text and position default like palette clicks.
+        # select: 'last', 'all' or None
+        added = []
+        start = len(self.widgets)
+        wid = self.next_id
+        for i, spec in enumerate(specs):
+            offset = 100 + (start + i) * 20
+            values = {'text': f"{spec['type']} {wid}", 'x': offset, 'y': offset}
+            values.update(spec)
+            values['id'] = wid
+            data = self.widgets.add(Widget.from_dict(values))
+            self.renderer.draw(data)
+            added.append(data)
+            wid += 1
+        self.next_id = wid
+        if added:
+            dicts = [data.to_dict() for data in added]
+            keys = [self.widgets.z(data.id) for data in added]
+            self.history.record(Add(dicts, keys))
+            self.record_change('a', dicts, keys)
+        if added and select == 'last':
+            self.select_widget(added[-1])
+        elif added and select == 'all':
+            self.selected_widget = added[-1]
+            self.selected_ids = [data['id'] for data in added]
+            self.draw_selection()
+            self.show_selection_props()
+        return added
+    
+    def copy_selection(self):
+        self.clipboard = []
+        for wid in self.selected_ids:
+            data = self.widgets.get(wid)
+            if data:
+                spec = data.to_dict()
+                del spec['id']
+                self.clipboard.append(spec)
+    
+    def paste(self):
+        if not self.clipboard:
+            return []
+        # Each paste lands one step further down-right than the last
+        for spec in self.clipboard:
+            spec['x'] += 20
+            spec['y'] += 20
+        return self.add_widgets([dict(spec) for spec in self.clipboard], select='all')
+    
+    def duplicate_selection(self):
+        self.copy_selection()
+        return self.paste()
     
     def draw_widget(self, data):
-        wid = data['id']
-        if wid in self.canvas_widgets:
-            for item in self.canvas_widgets[wid]:
-                self.canvas.delete(item)
-        
-        items = []
-        x, y = data['x'], data['y']
-        w, h = data['width'], data['height']
-        r = data['corner_radius']
-        
-        if data['type'] == 'Label':
-            rect = self.rounded_rect(x, y, x+w, y+h, r, data['bg_color'], data['border_color'], 2)
-            text = self.canvas.create_text(x+w//2, y+h//2, text=data['text'],
-                                          font=(data['font'], data['font_size']),
-                                          fill=data['text_color'])
-            items = [rect, text]
-        
-        elif data['type'] == 'Button':
-            rect = self.rounded_rect(x, y, x+w, y+h, r, data['fg_color'], data['border_color'], 2)
-            text = self.canvas.create_text(x+w//2, y+h//2, text=data['text'],
-                                          font=(data['font'], data['font_size'], 'bold'),
-                                          fill='white')
-            items = [rect, text]
-        
-        elif data['type'] == 'Entry':
-            rect = self.rounded_rect(x, y, x+w, y+h, r, 'white', data['border_color'], 2)
-            text = self.canvas.create_text(x+10, y+h//2, text="Enter text...",
-                                          font=(data['font'], data['font_size']),
-                                          fill='#999', anchor='w')
-            items = [rect, text]
-        
-        elif data['type'] == 'Text':
-            rect = self.rounded_rect(x, y, x+w, y+h*2, r, 'white', data['border_color'], 2)
-            text = self.canvas.create_text(x+10, y+10, text="Text area...",
-                                          font=(data['font'], data['font_size']),
-                                          fill='#999', anchor='nw')
-            items = [rect, text]
-        
-        elif data['type'] == 'Checkbutton':
-            box = self.rounded_rect(x, y, x+25, y+25, 5, 'white', data['border_color'], 2)
-            check = self.canvas.create_text(x+12, y+12, text="✓",
-                                           font=('Arial', 16, 'bold'), fill=data['fg_color'])
-            text = self.canvas.create_text(x+35, y+12, text=data['text'],
-                                          font=(data['font'], data['font_size']),
-                                          fill=data['text_color'], anchor='w')
-            items = [box, check, text]
-        
-        elif data['type'] == 'Radiobutton':
-            circle = self.canvas.create_oval(x, y, x+25, y+25, fill='white',
-                                            outline=data['border_color'], width=2)
-            dot = self.canvas.create_oval(x+7, y+7, x+18, y+18, fill=data['fg_color'], outline='')
-            text = self.canvas.create_text(x+35, y+12, text=data['text'],
-                                          font=(data['font'], data['font_size']),
-                                          fill=data['text_color'], anchor='w')
-            items = [circle, dot, text]
-        
-        elif data['type'] == 'Frame':
-            rect = self.rounded_rect(x, y, x+w, y+h, r, data['bg_color'], data['border_color'], 2)
-            text = self.canvas.create_text(x+w//2, y+10, text="Frame",
-                                          font=(data['font'], 9), fill='#999')
-            items = [rect, text]
-        
-        elif data['type'] == 'Scale':
-            track = self.rounded_rect(x, y+10, x+w, y+25, 15, '#e0e0e0', data['border_color'], 1)
-            thumb = self.canvas.create_oval(x+w//2-10, y+5, x+w//2+10, y+30,
-                                           fill=data['fg_color'], outline=data['border_color'], width=2)
-            items = [track, thumb]
-        
-        elif data['type'] == 'Progressbar':
-            bg = self.rounded_rect(x, y, x+w, y+25, r, '#e0e0e0', data['border_color'], 1)
-            prog = self.rounded_rect(x+2, y+2, x+w//2, y+23, r-2, data['fg_color'], '', 0)
-            items = [bg, prog]
-        
-        self.canvas_widgets[wid] = items
-    
-    def rounded_rect(self, x1, y1, x2, y2, r, fill, outline, width):
-        if r > 0:
-            points = [x1+r,y1, x2-r,y1, x2,y1, x2,y1+r, x2,y2-r, x2,y2,
-                     x2-r,y2, x1+r,y2, x1,y2, x1,y2-r, x1,y1+r, x1,y1]
-            return self.canvas.create_polygon(points, fill=fill, outline=outline,
-                                             width=width, smooth=True)
-        return self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline=outline, width=width)
+        self.renderer.draw(data)
+        if data['id'] in self.selected_ids:
+            self.draw_selection()
+    
+    def redraw(self, wid):
+        data = self.widgets.get(wid)
+        if data is None:
+            return False
+        self.draw_widget(data)
+    
+    def draw_selection(self):
+        self.canvas.delete("selection")
+        z = self.renderer.zoom
+        for wid in self.selected_ids:
+            data = self.widgets.get(wid)
+            if data:
+                x1, y1, x2, y2 = widget_bounds(data)
+                self.canvas.create_rectangle(x1*z-3, y1*z-3, x2*z+3, y2*z+3, outline="#e67e22", dash=(4, 2),
+                                             tags=("selection", OVERLAY_TAG, f"sel{wid}"))
+    
+    def canvas_point(self, event):
+        return self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+    
+    def find_widget_at(self, x, y):
+        z = self.renderer.zoom
+        wid = self.hit_index.topmost(x / z, y / z)
+        if wid is None:
+            # Text can spill past a widget's box; fall back to the item under the pointer
+            current = self.canvas.find_withtag("current")
+            if current:
+                wid = self.renderer.owner.get(current[0])
+        return wid
     
     def on_canvas_click(self, event):
-        item = self.canvas.find_closest(event.x, event.y)[0]
-        for wid, items in self.canvas_widgets.items():
-            if item in items:
-                data = next((w for w in self.widgets if w['id'] == wid), None)
-                if data:
-                    self.select_widget(data)
-                    self.drag_data = {"item": wid, "x": event.x, "y": event.y}
+        self.canvas.focus_set()
+        x, y = self.canvas_point(event)
+        wid = self.find_widget_at(x, y)
+        if wid is None:
+            return
+        data = self.widgets.get(wid)
+        if not data:
+            return
+        if event.state & 0x0001:
+            # Shift-click toggles the widget in the multi-selection
+            if wid in self.selected_ids:
+                self.selected_ids.remove(wid)
+                self.draw_selection()
+                self.show_selection_props()
                 return
+            self.selected_ids.append(wid)
+            self.selected_widget = data
+            self.draw_selection()
+            self.show_selection_props()
+        elif wid not in self.selected_ids:
+            self.select_widget(data)
+        snap = None
+        if self.snap_var.get():
+            entries = self.hit_index.entries
+            self.snapper.begin(self.selected_ids, [entries[w][0] for w in self.selected_ids],
+                               self.renderer.zoom)
+            snap = self.snapper
+        self.drag.start(self.selected_ids, x, y, [f"sel{w}" for w in self.selected_ids], snap)
     
     def on_canvas_drag(self, event):
-        if self.drag_data["item"]:
-            dx = event.x - self.drag_data["x"]
-            dy = event.y - self.drag_data["y"]
-            
-            data = next((w for w in self.widgets if w['id'] == self.drag_data["item"]), None)
-            if data:
-                data['x'] += dx
-                data['y'] += dy
-                self.draw_widget(data)
-            
-            self.drag_data["x"] = event.x
-            self.drag_data["y"] = event.y
+        self.drag.motion(*self.canvas_point(event))
+    
+    def on_canvas_release(self, event):
+        self.drag.motion(*self.canvas_point(event))
+        self.drag.release()
+        self.schedule_sync()
+    
+    def finish_drag(self, wids, dx, dy):
+        # Canvas pixels back to model units; the redraw snaps items to the result
+        z = self.renderer.zoom
+        dx, dy = round(dx / z), round(dy / z)
+        self.move_widgets(wids, dx, dy)
+        if dx or dy:
+            self.history.record(Move(wids, dx, dy))
+        self.properties().refresh()
+    
+    def on_canvas_pan(self, event):
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.schedule_sync()
+    
+    def on_canvas_wheel(self, event):
+        up = event.num == 4 or event.delta > 0
+        if event.state & 0x0004:
+            self.step_zoom(1 if up else -1, event.x, event.y)
+            return
+        view = self.canvas.xview if event.state & 0x0001 else self.canvas.yview
+        self.scroll_canvas(view, "scroll", -2 if up else 2, "units")
+    
+    def scroll_canvas(self, view, *args):
+        view(*args)
+        self.schedule_sync()
+    
+    def step_zoom(self, step, sx=None, sy=None):
+        current = self.renderer.zoom
+        if step > 0:
+            zoom = next((z for z in ZOOM_STEPS if z > current), ZOOM_STEPS[-1])
+        else:
+            zoom = next((z for z in reversed(ZOOM_STEPS) if z < current), ZOOM_STEPS[0])
+        if zoom != current:
+            self.renderer.set_zoom(zoom, sx, sy)
+            self.zoom_label.config(text=f"{round(zoom * 100)}%")
+            self.draw_selection()
+    
+    # Live preview
+    def toggle_preview(self):
+        from tkinter import messagebox
+        if not self.preview_var.get():
+            self.drag.on_move = None
+            self.preview.stop()
+            return
+        try:
+            self.preview.start()
+        except OSError as e:
+            self.preview_var.set(False)
+            messagebox.showwarning("Preview", f"Could not start the preview:\n{e}")
+            return
+        self.drag.on_move = self.preview.dragged
+    
+    def preview_closed(self, errors):
+        # The preview window was closed, or the child failed (e.g. no customtkinter)
+        from tkinter import messagebox
+        self.preview_var.set(False)
+        self.drag.on_move = None
+        if errors.strip():
+            messagebox.showwarning("Preview", f"The preview stopped:\n\n{errors}")
+    
+    def toggle_sprites(self):
+        # Only the canvas items change; widget data is untouched
+        self.renderer.set_sprites(SpriteCache(self.canvas) if self.sprite_var.get() else None)
+        self.canvas.tag_raise(OVERLAY_TAG)
+    
+    def schedule_sync(self):
+        if self.sync_job is None:
+            self.sync_job = self.canvas.after_idle(self.sync_viewport)
+    
+    def sync_viewport(self):
+        self.sync_job = None
+        if self.drag.active:
+            return
+        if self.loading:
+            self.load_view()
+        self.renderer.sync()
     
     def select_widget(self, data):
         self.selected_widget = data
+        self.selected_ids = [data['id']]
+        self.draw_selection()
         self.show_props(data)
     
     def show_props(self, data):
-        for w in self.props_frame.winfo_children():
-            w.destroy()
-        
-        header = tk.Frame(self.props_frame, bg="#34495e")
-        header.pack(fill=tk.X, pady=(0, 10))
-        tk.Label(header, text=f"{data['type']} #{data['id']}",
-                font=("Arial", 11, "bold"), bg="#34495e", fg="white").pack(side=tk.LEFT, padx=10, pady=5)
-        tk.Button(header, text="🗑️", command=lambda: self.delete_widget(data['id']),
-                 bg="#e74c3c", fg="white").pack(side=tk.RIGHT, padx=10)
-        
-        # Basic Properties
-        if data['type'] in ['Label', 'Button', 'Checkbutton', 'Radiobutton']:
-            self.add_input(data, 'text', 'Text:')
-        
-        self.add_combo(data, 'font', 'Font:', ['Arial', 'Helvetica', 'Times New Roman', 'Courier'])
-        self.add_input(data, 'font_size', 'Font Size:', 'number')
-        
-        # Position & Size
-        sec = tk.LabelFrame(self.props_frame, text="Position & Size", bg="#2d2d2d",
-                           fg="white", font=("Arial", 9, "bold"))
-        sec.pack(fill=tk.X, padx=10, pady=5)
-        
-        f = tk.Frame(sec, bg="#2d2d2d")
-        f.pack(fill=tk.X, padx=5, pady=3)
-        tk.Label(f, text="X:", bg="#2d2d2d", fg="white").grid(row=0, column=0)
-        x_ent = tk.Entry(f, width=6, bg="#34495e", fg="white")
-        x_ent.insert(0, data['x'])
-        x_ent.grid(row=0, column=1, padx=3)
-        x_ent.bind('<Return>', lambda e: self.update_prop(data['id'], 'x', int(x_ent.get() or 0)))
-        
-        tk.Label(f, text="Y:", bg="#2d2d2d", fg="white").grid(row=0, column=2, padx=(10,0))
-        y_ent = tk.Entry(f, width=6, bg="#34495e", fg="white")
-        y_ent.insert(0, data['y'])
-        y_ent.grid(row=0, column=3, padx=3)
-        y_ent.bind('<Return>', lambda e: self.update_prop(data['id'], 'y', int(y_ent.get() or 0)))
-        
-        f2 = tk.Frame(sec, bg="#2d2d2d")
-        f2.pack(fill=tk.X, padx=5, pady=3)
-        tk.Label(f2, text="W:", bg="#2d2d2d", fg="white").grid(row=0, column=0)
-        w_ent = tk.Entry(f2, width=6, bg="#34495e", fg="white")
-        w_ent.insert(0, data['width'])
-        w_ent.grid(row=0, column=1, padx=3)
-        w_ent.bind('<Return>', lambda e: self.update_prop(data['id'], 'width', int(w_ent.get() or 100)))
-        
-        tk.Label(f2, text="H:", bg="#2d2d2d", fg="white").grid(row=0, column=2, padx=(10,0))
-        h_ent = tk.Entry(f2, width=6, bg="#34495e", fg="white")
-        h_ent.insert(0, data['height'])
-        h_ent.grid(row=0, column=3, padx=3)
-        h_ent.bind('<Return>', lambda e: self.update_prop(data['id'], 'height', int(h_ent.get() or 30)))
-        
-        # Colors
-        self.add_color(data, 'bg_color', 'Background')
-        if data['type'] in ['Button', 'Checkbutton', 'Radiobutton', 'Scale', 'Progressbar']:
-            self.add_color(data, 'fg_color', 'Main Color')
-        self.add_color(data, 'text_color', 'Text Color')
-        self.add_color(data, 'border_color', 'Border')
-        
-        # CustomTkinter
-        self.add_slider(data, 'corner_radius', 'Corner Radius', 0, 50)
-        self.add_slider(data, 'border_width', 'Border Width', 0, 10)
-    
-    def add_input(self, data, key, label, itype='text'):
-        f = tk.Frame(self.props_frame, bg="#2d2d2d")
-        f.pack(fill=tk.X, padx=10, pady=3)
-        tk.Label(f, text=label, bg="#2d2d2d", fg="white", font=("Arial", 9)).pack(anchor='w')
-        ent = tk.Entry(f, bg="#34495e", fg="white")
-        ent.insert(0, data[key])
-        ent.pack(fill=tk.X, pady=2)
-        ent.bind('<KeyRelease>', lambda e: self.update_prop(data['id'], key, 
-                 int(ent.get()) if itype == 'number' and ent.get() else ent.get()))
-    
-    def add_combo(self, data, key, label, values):
-        f = tk.Frame(self.props_frame, bg="#2d2d2d")
-        f.pack(fill=tk.X, padx=10, pady=3)
-        tk.Label(f, text=label, bg="#2d2d2d", fg="white", font=("Arial", 9)).pack(anchor='w')
-        var = tk.StringVar(value=data[key])
-        combo = ttk.Combobox(f, textvariable=var, values=values, state='readonly')
-        combo.pack(fill=tk.X, pady=2)
-        combo.bind('<<ComboboxSelected>>', lambda e: self.update_prop(data['id'], key, var.get()))
-    
-    def add_color(self, data, key, label):
-        f = tk.Frame(self.props_frame, bg="#2d2d2d")
-        f.pack(fill=tk.X, padx=10, pady=3)
-        tk.Label(f, text=f"{label}:", bg="#2d2d2d", fg="white", font=("Arial", 9)).pack(anchor='w')
-        
-        cf = tk.Frame(f, bg="#2d2d2d")
-        cf.pack(fill=tk.X, pady=2)
-        
-        display = tk.Canvas(cf, width=25, height=20, bg=data[key], highlightthickness=1)
-        display.pack(side=tk.LEFT, padx=(0, 5))
-        
-        ent = tk.Entry(cf, bg="#34495e", fg="white", width=12)
-        ent.insert(0, data[key])
-        ent.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        
-        def pick():
-            color = colorchooser.askcolor(data[key])[1]
-            if color:
-                ent.delete(0, tk.END)
-                ent.insert(0, color)
-                display.config(bg=color)
-                self.update_prop(data['id'], key, color)
-        
-        tk.Button(cf, text="🎨", command=pick, bg="#3498db", fg="white").pack(side=tk.LEFT)
-        ent.bind('<Return>', lambda e: self.update_prop(data['id'], key, ent.get()))
-    
-    def add_slider(self, data, key, label, min_val, max_val):
-        f = tk.Frame(self.props_frame, bg="#2d2d2d")
-        f.pack(fill=tk.X, padx=10, pady=3)
-        
-        lf = tk.Frame(f, bg="#2d2d2d")
-        lf.pack(fill=tk.X)
-        tk.Label(lf, text=f"{label}:", bg="#2d2d2d", fg="white", font=("Arial", 9)).pack(side=tk.LEFT)
-        val_lbl = tk.Label(lf, text=str(data[key]), bg="#2d2d2d", fg="#3498db", font=("Arial", 9, "bold"))
-        val_lbl.pack(side=tk.RIGHT)
-        
-        def on_change(v):
-            val_lbl.config(text=str(int(float(v))))
-            self.update_prop(data['id'], key, int(float(v)))
-        
-        slider = tk.Scale(f, from_=min_val, to=max_val, orient=tk.HORIZONTAL,
-                         bg="#34495e", fg="white", command=on_change, highlightthickness=0)
-        slider.set(data[key])
-        slider.pack(fill=tk.X, pady=2)
+        self.properties().show([data])
+    
+    def show_selection_props(self):
+        if self.selected_ids:
+            self.properties().show([self.widgets.get(wid) for wid in self.selected_ids])
+        else:
+            self.show_empty_props()
     
     def update_prop(self, wid, key, value):
-        for data in self.widgets:
-            if data['id'] == wid:
-                data[key] = value
-                self.draw_widget(data)
-                break
+        data = self.widgets.get(wid)
+        if data and data[key] != value:
+            old = data[key]
+            self.apply_prop(wid, key, value)
+            self.history.record(SetProp(wid, key, old, value))
     
     def delete_widget(self, wid):
-        self.widgets = [w for w in self.widgets if w['id'] != wid]
-        if wid in self.canvas_widgets:
-            for item in self.canvas_widgets[wid]:
-                self.canvas.delete(item)
-            del self.canvas_widgets[wid]
+        self.drag.release()
+        self.history.record(Remove(self.remove_widgets([wid])))
         self.show_empty_props()
     
     def clear_all(self):
+        from tkinter import messagebox
         if messagebox.askyesno("Clear", "Delete all widgets?"):
-            self.widgets = []
-            self.canvas_widgets = {}
-            self.canvas.delete("all")
+            self.finish_loading()
+            self.drag.cancel()
+            removed = list(zip(self.widgets.z_list(), self.widgets.to_list()))
+            self.widgets.clear()
+            self.selected_ids = []
+            self.clipboard = []
+            self.render.clear()
+            self.renderer.clear()
             self.show_empty_props()
             self.next_id = 1
+            self.record_change('c')
+            if removed:
+                self.history.record(Remove(removed))
+    
+    # Model primitives: history replays edits through these, they record nothing
+    def apply_prop(self, wid, key, value):
+        data = self.widgets.get(wid)
+        if data:
+            data[key] = value
+            self.render.mark_dirty(wid)
+            self.record_change('s', wid, key, value)
+    
+    def move_widgets(self, wids, dx, dy):
+        for wid in wids:
+            data = self.widgets.get(wid)
+            if data:
+                data['x'] += dx
+                data['y'] += dy
+                self.draw_widget(data)
+        self.record_change('m', list(wids), dx, dy)
+    
+    def insert_widgets(self, dicts, keys):
+        for d, z in zip(dicts, keys):
+            self.renderer.draw(self.widgets.add(Widget.from_dict(d), z))
+        self.next_id = max(self.next_id, max(d['id'] for d in dicts) + 1)
+        self.record_change('a', dicts, keys)
+    
+    def remove_widgets(self, wids):
+        # Returns [(stacking key, dict)], bottom first, for restore_widgets
+        removed = sorted(((self.widgets.z(wid), self.widgets.get(wid).to_dict())
+                          for wid in dict.fromkeys(wids) if wid in self.widgets),
+                         key=lambda pair: pair[0])
+        for _, d in removed:
+            wid = d['id']
+            self.widgets.remove(wid)
+            self.renderer.remove(wid)
+            self.render.discard(wid)
+            if wid in self.selected_ids:
+                self.selected_ids.remove(wid)
+        self.draw_selection()
+        self.record_change('d', [d['id'] for _, d in removed])
+        return removed
+    
+    def restore_widgets(self, removed):
+        # Each widget goes back under its old key, so the canvas stacks it where it was
+        for z, d in removed:
+            self.renderer.draw(self.widgets.add(Widget.from_dict(d), z))
+        self.next_id = max(self.next_id, max(d['id'] for _, d in removed) + 1)
+        self.record_change('r', removed)
+    
+    def load_widgets(self, widgets, compact=True):
+        self.widgets = widgets
+        self.drag.cancel()
+        self.render.clear()
+        self.renderer.clear()
+        for data in self.widgets:
+            self.renderer.draw(data)
+        # A snapshot can bring back ids handed out again since (after Clear All)
+        self.next_id = max(self.next_id, widgets.max_id() + 1)
+        # Stacking keys come from the store; an open .pgdb needs a full rewrite
+        # unless they are the file's own (see open_database)
+        self.db_full = True
+        self.selected_ids = [wid for wid in self.selected_ids if wid in widgets]
+        self.draw_selection()
+        if compact and self.journal is not None:
+            self.journal.compact(widgets.to_snapshot())
+        if self._preview is not None and self._preview.running:
+            self._preview.reload()
+    
+    # Autosave
+    def start_autosave(self):
+        from tkinter import messagebox
+        if self.project_path is not None:
+            self.start_project_journal()
+            return
+        widgets = None
+        if has_changes(UNTITLED) and messagebox.askyesno(
+                "Recover", "Restore unsaved work from the last session?"):
+            widgets = self.recover_project(UNTITLED)
+        self.journal = Journal(UNTITLED, self.read_project)
+        if widgets is not None:
+            self.load_widgets(widgets)
+            self.next_id = self.widgets.max_id() + 1
+        else:
+            self.journal.reset()
+            if self.widgets:
+                # Drawn before autosave started (see finish_startup)
+                self.journal.compact(self.widgets.to_snapshot())
+    
+    def start_project_journal(self):
+        # A project opened before autosave started (Load works before the
+        # panels are built) was read without its journal
+        project = self.project_path
+        self.journal = Journal(project, self.read_project)
+        if not self.history.step and has_changes(project):
+            # Nothing edited since: reopen it with last session's changes
+            self.open_project(project)
+            return
+        self.journal.reset()
+        if self.history.step:
+            # The edits made meanwhile need a base; a .pgdb still loading can't be one yet
+            self.finish_loading()
+            self.journal.compact(self.widgets.to_snapshot())
+    
+    def recover_project(self, filename):
+        # The autosaved project, or None (the user is told) if it can't be rebuilt
+        from tkinter import messagebox
+        try:
+            return recover(filename, self.read_project)
+        except RECOVER_ERRORS as e:
+            messagebox.showerror("Recover", f"Unsaved changes could not be restored:\n{e}")
+            return None
+    
+    def switch_journal(self, project, discard=False):
+        if self.journal is not None:
+            self.journal.close(discard)
+            self.journal = Journal(project, self.read_project)
+    
+    def record_change(self, *record):
+        if self.db is not None:
+            self.track_db(record)
+        if self._preview is not None and self._preview.running:
+            self._preview.record(record)
+        if self.journal is not None:
+            self.journal.append(*record)
+            # The writer builds the base from its own copy, off this thread
+            if self.journal.due():
+                self.journal.compact()
+    
+    def on_close(self):
+        if self.restore_job is not None:
+            self.root.after_cancel(self.restore_job)
+        if self._profiler is not None:
+            self._profiler.stop()
+        if self._preview is not None:
+            self._preview.stop()
+        if self.journal is not None:
+            self.journal.close()
+        self.close_db()
+        self.root.destroy()
+    
+    def undo(self):
+        self.drag.release()
+        if self.history.undo():
+            self.after_history()
+    
+    def redo(self):
+        self.drag.release()
+        if self.history.redo():
+            self.after_history()
+    
+    def after_history(self):
+        self.selected_ids = [wid for wid in self.selected_ids if wid in self.widgets]
+        self.draw_selection()
+        self.show_selection_props()
+    
+    # Project database
+    def track_db(self, record):
+        op = record[0]
+        if op == 's':
+            self.db_changed.add(record[1])
+        elif op == 'm':
+            self.db_changed.update(record[1])
+        elif op in ('a', 'r'):
+            ids = [d['id'] for d in record[1]] if op == 'a' else [d['id'] for _, d in record[1]]
+            self.db_changed.update(ids)
+            self.db_removed.difference_update(ids)
+        elif op == 'd':
+            self.db_removed.update(record[1])
+            self.db_changed.difference_update(record[1])
+        elif op == 'c':
+            self.db_full = True
+    
+    def open_db(self, filename):
+        import projectdb
+        self.close_db()
+        self.db = projectdb.ProjectDB(filename)
+        self.db_changed = set()
+        self.db_removed = set()
+        self.db_full = False
+    
+    def close_db(self):
+        if self.load_job is not None:
+            self.root.after_cancel(self.load_job)
+            self.load_job = None
+        self.db_rows = None
+        self.db_views = []
+        self.resume_gc()
+        if self.gc_frozen:
+            # What was frozen while the project loaded can become garbage now
+            gc.unfreeze()
+            self.gc_frozen = False
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+    
+    def open_database(self, filename):
+        # Only widgets in view are read now. The rest are merged in short
+        # slices between events, and views scrolled to meanwhile are read
+        # as they are exposed; save, export and the layout check finish first
+        self.open_db(filename)
+        self.load_widgets(WidgetStore(top=self.db.max_z()), compact=False)
+        self.db_full = False
+        self.next_id = self.db.max_id() + 1
+        self.db_rows = self.db.batches(LOAD_BATCH)
+        # Full collections over a heap growing by thousands of widgets per
+        # slice would stall the UI far longer than the slices themselves;
+        # instead each slice collects what it made and freezes the rest
+        if gc.isenabled():
+            gc.disable()
+            self.gc_paused = True
+        self.load_view()
+        self.load_job = self.root.after(1, self.load_more)
+    
+    @property
+    def loading(self):
+        return self.db_rows is not None
+    
+    def load_view(self):
+        rect = self.renderer.view_rect()
+        for seen in self.db_views:
+            if seen[0] <= rect[0] and seen[1] <= rect[1] and seen[2] >= rect[2] and seen[3] >= rect[3]:
+                return
+        rows = self.db.region(*rect, limit=VIEW_ROWS)
+        self.merge_rows(rows)
+        # A view with more rows than that (zoomed far out) fills in as loading goes on
+        if len(rows) < VIEW_ROWS:
+            self.db_views.append(rect)
+    
+    def load_more(self):
+        self.load_job = None
+        deadline = time.perf_counter() + LOAD_SLICE_MS / 1000
+        for rows in self.db_rows:
+            self.merge_rows(rows)
+            if time.perf_counter() >= deadline:
+                self.freeze_loaded()
+                self.load_job = self.root.after(1, self.load_more)
+                return
+        self.loaded()
+    
+    def merge_rows(self, rows):
+        # Rows go in under their stored keys; widgets added meanwhile are above
+        # them, and rows already read or deleted since are skipped
+        widgets, removed, draw = self.widgets, self.db_removed, self.renderer.draw
+        for depth, data in rows:
+            if data.id not in widgets and data.id not in removed:
+                draw(widgets.add(data, depth))
+    
+    def loaded(self):
+        self.db_rows = None
+        self.db_views = []
+        self.freeze_loaded()
+        self.resume_gc()
+        if self._preview is not None and self._preview.running:
+            self._preview.reload()
+    
+    def freeze_loaded(self):
+        # The project lives until the next open: leave its rows out of later
+        # collections, but collect any garbage made meanwhile first
+        if self.gc_paused:
+            gc.collect(1)
+            gc.freeze()
+            self.gc_frozen = True
+    
+    def resume_gc(self):
+        if self.gc_paused:
+            self.gc_paused = False
+            gc.enable()
+    
+    def finish_loading(self):
+        if self.loading:
+            if self.load_job is not None:
+                self.root.after_cancel(self.load_job)
+                self.load_job = None
+            for rows in self.db_rows:
+                self.merge_rows(rows)
+            self.loaded()
+    
+    def save_database(self, filename):
+        import projectdb
+        depth = self.widgets.z
+        if self.db is not None and self.db.path == filename:
+            if self.db_full:
+                self.db.replace_all(self.widgets, depth)
+            else:
+                self.db.write_back(self.widgets, self.db_changed, self.db_removed, depth)
+            self.db_changed = set()
+            self.db_removed = set()
+            self.db_full = False
+        else:
+            projectdb.save(self.widgets, filename, depth)
+            self.open_db(filename)
     
     def generate_code(self):
-        code = """# Auto-generated by PyGUI Builder Pro
-import customtkinter as ctk
-
-ctk.set_appearance_mode("dark")
-ctk.set_default_color_theme("blue")
-
-root = ctk.CTk()
-root.title("My App")
-root.geometry("700x500")
-
-"""
-        for i, w in enumerate(self.widgets):
-            var = f"{w['type'].lower()}{i+1}"
-            code += f"# {w['type']}\n"
-            
-            if w['type'] == 'Label':
-                code += f"{var} = ctk.CTkLabel(root, text=\"{w['text']}\", "
-                code += f"font=(\"{w['font']}\", {w['font_size']}), fg_color=\"{w['bg_color']}\", "
-                code += f"text_color=\"{w['text_color']}\", corner_radius={w['corner_radius']})\n"
-            elif w['type'] == 'Button':
-                code += f"{var} = ctk.CTkButton(root, text=\"{w['text']}\", "
-                code += f"font=(\"{w['font']}\", {w['font_size']}), fg_color=\"{w['fg_color']}\", "
-                code += f"hover_color=\"{w['hover_color']}\", corner_radius={w['corner_radius']}, "
-                code += f"width={w['width']}, height={w['height']})\n"
-            elif w['type'] == 'Entry':
-                code += f"{var} = ctk.CTkEntry(root, font=(\"{w['font']}\", {w['font_size']}), "
-                code += f"corner_radius={w['corner_radius']}, width={w['width']})\n"
-            elif w['type'] == 'Text':
-                code += f"{var} = ctk.CTkTextbox(root, font=(\"{w['font']}\", {w['font_size']}), "
-                code += f"corner_radius={w['corner_radius']}, width={w['width']}, height={w['height']*2})\n"
-            elif w['type'] == 'Checkbutton':
-                code += f"{var} = ctk.CTkCheckBox(root, text=\"{w['text']}\", "
-                code += f"font=(\"{w['font']}\", {w['font_size']}), fg_color=\"{w['fg_color']}\")\n"
-            elif w['type'] == 'Radiobutton':
-                code += f"{var} = ctk.CTkRadioButton(root, text=\"{w['text']}\", "
-                code += f"font=(\"{w['font']}\", {w['font_size']}), fg_color=\"{w['fg_color']}\")\n"
-            elif w['type'] == 'Frame':
-                code += f"{var} = ctk.CTkFrame(root, fg_color=\"{w['bg_color']}\", "
-                code += f"corner_radius={w['corner_radius']}, width={w['width']}, height={w['height']})\n"
-            elif w['type'] == 'Scale':
-                code += f"{var} = ctk.CTkSlider(root, fg_color=\"{w['fg_color']}\", width={w['width']})\n"
-            elif w['type'] == 'Progressbar':
-                code += f"{var} = ctk.CTkProgressBar(root, fg_color=\"{w['fg_color']}\", "
-                code += f"corner_radius={w['corner_radius']}, width={w['width']})\n{var}.set(0.5)\n"
-            
-            code += f"{var}.place(x={w['x']}, y={w['y']})\n\n"
-        
-        code += "root.mainloop()\n"
-        return code
+        return self.codegen.generate(self.widgets)
+    
+    def check_layout(self, exporting=False):
+        # Returns True when there is nothing to fix, or the user exports anyway
+        from tkinter import messagebox
+        from lint import lint
+        self.finish_loading()
+        issues = lint(self.widgets)
+        if not issues:
+            if not exporting:
+                messagebox.showinfo("Layout", "No layout issues found.")
+            return True
+        shown = '\n'.join(f"• {issue.message}" for issue in issues[:LINT_SHOWN])
+        if len(issues) > LINT_SHOWN:
+            shown += f"\n… and {len(issues) - LINT_SHOWN} more"
+        title = f"{len(issues)} layout issue{'s' if len(issues) > 1 else ''}"
+        if exporting and messagebox.askyesno(title, f"{shown}\n\nExport anyway?"):
+            return True
+        if not exporting:
+            messagebox.showwarning(title, shown)
+        # Select everything involved so it can be fixed straight away
+        self.selected_ids = list(dict.fromkeys(wid for issue in issues for wid in issue.ids
+                                               if wid in self.widgets))
+        self.draw_selection()
+        self.show_selection_props()
+        return False
     
     def export_code(self):
+        from tkinter import filedialog, messagebox
+        self.finish_loading()
         if not self.widgets:
             messagebox.showwarning("No Widgets", "Add widgets before exporting!")
             return
+        if not self.check_layout(exporting=True):
+            return
         
         filename = filedialog.asksaveasfilename(defaultextension=".py",
                                                filetypes=[("Python files", "*.py")])
         if filename:
+            # Compact exports start faster on big forms and look the same
+            codegen = self.compact_codegen if self.compact_var.get() else self.codegen
             with open(filename, 'w') as f:
-                f.write(self.generate_code())
+                codegen.write(self.widgets, f)
             messagebox.showinfo("Success", f"Exported to {filename}\n\nInstall: pip install customtkinter")
     
+    def export_profile(self):
+        from tkinter import filedialog, messagebox
+        if not self.profiler.enabled:
+            messagebox.showinfo("Profiler", "Press F12 to start profiling first.")
+            return
+        filename = filedialog.asksaveasfilename(defaultextension=".json",
+                                               filetypes=[("JSON files", "*.json")])
+        if filename:
+            self.profiler.save(filename)
+    
     def save_project(self):
+        from tkinter import filedialog, messagebox
+        import projectbin
+        self.finish_loading()
         if not self.widgets:
             messagebox.showwarning("No Widgets", "Add widgets before saving!")
             return
-        filename = filedialog.asksaveasfilename(defaultextension=".json",
-                                               filetypes=[("JSON files", "*.json")])
+        filename = filedialog.asksaveasfilename(defaultextension=".json", filetypes=PROJECT_TYPES)
         if filename:
-            with open(filename, 'w') as f:
-                json.dump(self.widgets, f, indent=2)
+            if filename.endswith('.pgdb'):
+                self.save_database(filename)
+            else:
+                self.close_db()
+                if filename.endswith('.pgb'):
+                    projectbin.save(self.widgets, filename)
+                else:
+                    with open(filename, 'w') as f:
+                        json.dump(self.widgets.to_list(), f, indent=2)
+            # The file now holds everything the journal did
+            if filename != (self.project_path or UNTITLED):
+                self.switch_journal(filename, discard=True)
+            if self.journal is not None:
+                # Only a .pgdb keeps stacking keys; reading the others back numbers them 1..n
+                self.journal.reset(None if self.db is not None else self.widgets.z_list())
+            self.project_path = filename
+            if self.autosave:
+                remember_project(filename)
             messagebox.showinfo("Success", f"Saved to {filename}")
     
     def load_project(self):
-        filename = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+        from tkinter import filedialog, messagebox
+        filename = filedialog.askopenfilename(
+            filetypes=[("Project files", "*.json *.pgb *.pgdb")] + PROJECT_TYPES)
         if filename:
-            with open(filename, 'r') as f:
-                self.widgets = json.load(f)
-            self.canvas.delete("all")
-            self.canvas_widgets = {}
-            for data in self.widgets:
-                self.draw_widget(data)
-            if self.widgets:
-                self.next_id = max(w['id'] for w in self.widgets) + 1
+            self.open_project(filename)
             messagebox.showinfo("Success", "Project loaded!")
+    
+    def read_project(self, filename):
+        import projectbin
+        import projectdb
+        if projectbin.is_binary(filename):
+            return projectbin.load(filename)
+        if projectdb.is_database(filename):
+            return projectdb.load(filename)
+        with open(filename, 'r') as f:
+            return WidgetStore.from_list(json.load(f))
+    
+    def open_project(self, filename, widgets=None):
+        # Unsaved autosaved edits are replayed on top of the file.
+        # widgets: the project already read (see restore_project)
+        import projectdb
+        journaled = self.journal is not None and has_changes(filename)
+        database = projectdb.is_database(filename)
+        self.close_db()
+        self.switch_journal(filename)
+        self.project_path = filename
+        if self.autosave:
+            remember_project(filename)
+        self.selected_ids = []
+        self.show_empty_props()
+        if journaled and widgets is None:
+            widgets = self.recover_project(filename)
+            if widgets is None:
+                # Start over from the file itself
+                self.journal.reset()
+                journaled = False
+        if database and not journaled:
+            self.open_database(filename)
+        else:
+            if widgets is None:
+                widgets = self.read_project(filename)
+            if database:
+                self.open_db(filename)
+            self.load_widgets(widgets, compact=journaled)
+            if self.widgets:
+                self.next_id = self.widgets.max_id() + 1
+        self.history.clear()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,198 @@
+"""Widget model: compact widget records and an id-indexed store.
+
+Records keep the dict-style access (`data['x']`) the rest of the builder
+uses, but store their fields in `__slots__` instead of a per-widget dict.
+"""
+import sys
+
+FIELDS = ('id', 'type', 'text', 'x', 'y', 'width', 'height', 'font', 'font_size',
+          'bg_color', 'fg_color', 'text_color', 'border_color', 'corner_radius',
+          'border_width', 'hover_color')
+FIELD_SET = frozenset(FIELDS)
+
+# String fields worth interning: the same few fonts and colors repeat across
+# thousands of widgets, but json.load hands back a fresh string for each one
+INTERNED = ('type', 'font', 'bg_color', 'fg_color', 'text_color', 'border_color', 'hover_color')
+
+
+class Widget:
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, id: int, type: str, text: str = '', x: int = 100, y: int = 100,
+                 width: int = 150, height: int = 35, font: str = 'Arial', font_size: int = 12,
+                 bg_color: str = '#f0f0f0', fg_color: str = '#3498db',
+                 text_color: str = '#000000', border_color: str = '#cccccc',
+                 corner_radius: int = 10, border_width: int = 2,
+                 hover_color: str = '#2980b9', extra: dict = None):
+        self.id = id
+        self.type = type
+        self.text = text
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.font = font
+        self.font_size = font_size
+        self.bg_color = bg_color
+        self.fg_color = fg_color
+        self.text_color = text_color
+        self.border_color = border_color
+        self.corner_radius = corner_radius
+        self.border_width = border_width
+        self.hover_color = hover_color
+        # Keys outside FIELDS from hand-edited or newer project files
+        self.extra = extra
+
+    def __getitem__(self, key):
+        if key in FIELD_SET:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in FIELD_SET or bool(self.extra and key in self.extra)
+
+    def __repr__(self):
+        return f"Widget(id={self.id!r}, type={self.type!r}, x={self.x!r}, y={self.y!r})"
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        d = {key: getattr(self, key) for key in FIELDS}
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        values = {}
+        extra = None
+        for key, value in d.items():
+            if key in FIELD_SET:
+                if key in INTERNED and type(value) is str:
+                    value = sys.intern(value)
+                values[key] = value
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        return cls(extra=extra, **values)
+
+
+class WidgetStore:
+    """Widgets keyed by id, iterated in stacking order.
+
+    Every widget has a stacking key: new widgets get one above everything
+    the store has held, and a widget keeps its key until it is removed, so
+    putting it back (undoing a delete) restores it by that key. The dict
+    behind the store is insertion-ordered, so lookup, append and delete are
+    all O(1); a widget restored below the top is O(1) too, and the dict is
+    re-sorted by key the next time the order is read.
+    """
+
+    def __init__(self, widgets=(), z=None, top=0):
+        self._by_id = {}
+        self._z = {}
+        self._sorted = True
+        # Highest key handed out; never lowered, so keys are not reused
+        self.top = 0
+        if z is None:
+            for w in widgets:
+                self.add(w)
+        else:
+            for w, key in zip(widgets, z):
+                self.add(w, key)
+        self.top = max(self.top, top)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        self._order()
+        return iter(self._by_id.values())
+
+    def __contains__(self, wid):
+        return wid in self._by_id
+
+    def _order(self):
+        if not self._sorted:
+            z = self._z
+            self._by_id = {wid: self._by_id[wid] for wid in sorted(self._by_id, key=z.__getitem__)}
+            self._sorted = True
+
+    def get(self, wid):
+        return self._by_id.get(wid)
+
+    def z(self, wid):
+        """Stacking key of a widget in the store."""
+        return self._z[wid]
+
+    def add(self, widget, z=None):
+        """Add a widget on top, or at stacking key `z`."""
+        if widget.id in self._by_id:
+            raise ValueError(f"duplicate widget id {widget.id}")
+        if z is None:
+            z = self.top + 1
+        if z > self.top:
+            self.top = z
+        else:
+            self._sorted = False
+        self._by_id[widget.id] = widget
+        self._z[widget.id] = z
+        return widget
+
+    def remove(self, wid):
+        self._z.pop(wid, None)
+        return self._by_id.pop(wid, None)
+
+    def clear(self):
+        self._by_id.clear()
+        self._z.clear()
+        self._sorted = True
+
+    def ids(self):
+        self._order()
+        return list(self._by_id)
+
+    def z_list(self):
+        """Stacking keys in stacking order."""
+        self._order()
+        z = self._z
+        return [z[wid] for wid in self._by_id]
+
+    def restore(self, pairs):
+        """Put widgets back at their stacking keys; `pairs` is (z, widget)."""
+        for z, widget in pairs:
+            self.add(widget, z)
+
+    def max_id(self):
+        return max(self._by_id, default=0)
+
+    def to_list(self):
+        self._order()
+        return [w.to_dict() for w in self._by_id.values()]
+
+    def to_snapshot(self):
+        """Plain data for from_snapshot, stacking keys included."""
+        return {'widgets': self.to_list(), 'z': self.z_list(), 'top': self.top}
+
+    @classmethod
+    def from_list(cls, items, z=None, top=0):
+        return cls((Widget.from_dict(d) for d in items), z, top)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        return cls.from_list(snapshot['widgets'], snapshot['z'], snapshot['top'])
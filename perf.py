@@ -0,0 +1,247 @@
+"""Opt-in instrumentation: handler timings, canvas counters, loop lag, memory.
+
+Nothing is measured while the profiler is off: timing wrappers are set as
+instance attributes over the hot methods when it is switched on and
+deleted again when it is switched off, so the normal path calls the plain
+methods. (Tk bindings for these handlers therefore go through a lambda,
+which looks the method up at call time.)
+
+While on it keeps
+    - a log2 histogram of wall time per instrumented method
+    - the renderer's canvas item created/deleted/recycled counts
+    - event-loop lag: how late an `after(LAG_MS)` callback fires
+    - tracemalloc current and peak traced memory
+
+and can show them in a HUD drawn over the design canvas, or save them as
+JSON (`to_dict`) for comparing builds. Set PYGUI_PROFILE=1 to start the
+builder with profiling on.
+"""
+import json
+import platform
+import time
+import tracemalloc
+
+from render import OVERLAY_TAG
+
+LAG_MS = 50
+HUD_MS = 500
+BUCKETS = 32
+TOP_ALLOCATIONS = 10
+HUD_TAG = "hud"
+HUD_ROWS = 8
+
+# (attribute path on the app, method names)
+HOT_PATHS = (
+    ('', ('draw_widget', 'draw_selection', 'show_props', 'show_selection_props',
+          'on_canvas_click', 'on_canvas_drag', 'on_canvas_release', 'update_prop',
+          'sync_viewport', 'add_widgets', 'generate_code', 'check_layout', 'undo', 'redo')),
+    ('codegen', ('write', 'generate')),
+    ('compact_codegen', ('write', 'generate')),
+    ('render', ('flush',)),
+    ('drag', ('flush',)),
+    ('inspector', ('show',)),
+)
+
+
+class Histogram:
+    """Counts of durations in power-of-two microsecond buckets."""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        us = int(seconds * 1e6)
+        self.counts[min(us.bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """Upper bound, in ms, of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min((1 << bucket) / 1000, self.max * 1000)
+        return self.max * 1000
+
+    def to_dict(self):
+        return {'count': self.count, 'total_ms': self.total * 1000,
+                'mean_ms': self.total * 1000 / self.count if self.count else 0.0,
+                'p50_ms': self.percentile(50), 'p95_ms': self.percentile(95),
+                'max_ms': self.max * 1000,
+                # bucket i holds durations below 2**i microseconds
+                'buckets_us': {str(1 << i): n for i, n in enumerate(self.counts) if n}}
+
+
+class Profiler:
+    def __init__(self, app):
+        self.app = app
+        self.enabled = False
+        self.hud = False
+        self.timings = {}
+        self.lag = Histogram()
+        self.patched = []
+        self.started = None
+        self.owns_tracemalloc = False
+        self.counters_at_start = (0, 0, 0)
+        self.lag_job = None
+        self.hud_job = None
+        self.expected = None
+
+    def timed(self, name, method):
+        histogram = self.timings.setdefault(name, Histogram())
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                histogram.add(clock() - start)
+        return wrapper
+
+    def start(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started = time.perf_counter()
+        for path, names in HOT_PATHS:
+            target = getattr(self.app, path) if path else self.app
+            if target is None:
+                # Not built yet, e.g. the property panel before the first frame
+                continue
+            for name in names:
+                setattr(target, name, self.timed(f"{path}.{name}" if path else name,
+                                                 getattr(target, name)))
+                self.patched.append((target, name))
+        renderer = self.app.renderer
+        self.counters_at_start = (renderer.created, renderer.deleted, renderer.recycled)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.owns_tracemalloc = True
+        self.expected = None
+        self.sample_lag()
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for target, name in self.patched:
+            # Drop the instance attribute: the class method shows through again
+            delattr(target, name)
+        self.patched = []
+        if self.lag_job is not None:
+            self.app.root.after_cancel(self.lag_job)
+            self.lag_job = None
+        if self.owns_tracemalloc:
+            tracemalloc.stop()
+            self.owns_tracemalloc = False
+        self.show_hud(False)
+
+    def toggle(self):
+        # F12: off -> profiling with the HUD -> off
+        if self.enabled:
+            self.stop()
+        else:
+            self.start()
+            self.show_hud(True)
+
+    def reset(self):
+        self.timings = {}
+        self.lag = Histogram()
+        if self.enabled:
+            self.stop()
+            self.start()
+
+    def sample_lag(self):
+        now = time.perf_counter()
+        if self.expected is not None:
+            self.lag.add(max(0.0, now - self.expected))
+        self.expected = now + LAG_MS / 1000
+        self.lag_job = self.app.root.after(LAG_MS, self.sample_lag)
+
+    def counters(self):
+        renderer = self.app.renderer
+        created, deleted, recycled = self.counters_at_start
+        return {'items_created': renderer.created - created,
+                'items_deleted': renderer.deleted - deleted,
+                'items_recycled': renderer.recycled - recycled,
+                'live_items': renderer.live_items(),
+                'widgets': len(self.app.widgets)}
+
+    def memory(self):
+        if not tracemalloc.is_tracing():
+            return {}
+        current, peak = tracemalloc.get_traced_memory()
+        return {'current_kb': current / 1024, 'peak_kb': peak / 1024}
+
+    def top_allocations(self):
+        if not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().statistics('lineno')[:TOP_ALLOCATIONS]
+        return [{'where': str(stat.traceback), 'kb': stat.size / 1024, 'blocks': stat.count}
+                for stat in stats]
+
+    def to_dict(self):
+        return {'python': platform.python_version(),
+                'seconds': time.perf_counter() - self.started if self.started else 0.0,
+                'timings': {name: h.to_dict() for name, h in sorted(self.timings.items()) if h.count},
+                'event_loop_lag': self.lag.to_dict(),
+                'counters': self.counters(),
+                'memory': self.memory(),
+                'top_allocations': self.top_allocations()}
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    # HUD
+    def show_hud(self, on):
+        self.hud = on
+        if self.hud_job is not None:
+            self.app.root.after_cancel(self.hud_job)
+            self.hud_job = None
+        self.app.canvas.delete(HUD_TAG)
+        if on:
+            self.draw_hud()
+
+    def hud_lines(self):
+        busiest = sorted((h for h in self.timings.items() if h[1].count),
+                         key=lambda item: item[1].total, reverse=True)[:HUD_ROWS]
+        lines = [f"{'handler':<22}{'calls':>7}{'p50':>8}{'p95':>8}{'max':>8}  ms"]
+        for name, h in busiest:
+            lines.append(f"{name[:22]:<22}{h.count:>7}{h.percentile(50):>8.2f}"
+                         f"{h.percentile(95):>8.2f}{h.max * 1000:>8.2f}")
+        c = self.counters()
+        lines.append(f"items live {c['live_items']}  +{c['items_created']} "
+                     f"-{c['items_deleted']} recycled {c['items_recycled']}")
+        lines.append(f"loop lag p95 {self.lag.percentile(95):.1f} ms  max {self.lag.max * 1000:.1f} ms")
+        memory = self.memory()
+        if memory:
+            lines.append(f"memory {memory['current_kb'] / 1024:.1f} MB  peak {memory['peak_kb'] / 1024:.1f} MB")
+        return lines
+
+    def draw_hud(self):
+        self.hud_job = None
+        c = self.app.canvas
+        c.delete(HUD_TAG)
+        x, y = c.canvasx(8), c.canvasy(8)
+        text = c.create_text(x + 6, y + 6, text='\n'.join(self.hud_lines()), anchor='nw',
+                             fill="#ecf0f1", font=("Courier", 9), tags=(HUD_TAG, OVERLAY_TAG))
+        bbox = c.bbox(text)
+        if bbox:
+            box = c.create_rectangle(bbox[0] - 6, bbox[1] - 6, bbox[2] + 6, bbox[3] + 6,
+                                     fill="#1a1a1a", outline="#8e44ad", tags=(HUD_TAG, OVERLAY_TAG))
+            c.tag_lower(box, text)
+        c.tag_raise(HUD_TAG)
+        self.hud_job = self.app.root.after(HUD_MS, self.draw_hud)
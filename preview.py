@@ -0,0 +1,326 @@
+"""Live preview: the exported app running in a child process, patched in place.
+
+The builder starts `python preview.py` once and talks to it over the
+child's stdin/stdout, one JSON message per line:
+
+    {"op": "load", "seq": n, "source": ..., "names": {id: variable}}
+        run this exported program (the unrolled CodeGenerator output)
+        in place of the current one; `names` maps widget ids to the
+        variables the program assigns them to
+    {"op": "patch", "seq": n, "changes": [[id, option, value], ...]}
+        `configure(option=value)` on existing widgets, where value is
+        the Python literal the exporter would have written; option
+        "place" moves the widget to value = [x, y]
+
+and the child answers each with "ok <seq>" once the change is applied
+and drawn, "stale <seq>" if a patch couldn't be applied (the builder
+then sends a fresh load), or "error <seq>" if a program failed to run.
+
+Property edits and drags become patches: the changed constructor
+options are evaluated with codegen's own compiled templates, so the
+preview shows exactly what an export would. Adding, removing or
+loading widgets sends a load, which re-runs the program inside the
+already running interpreter, with customtkinter already imported.
+Edits made in the same event-loop turn go out as one message, and a
+message's round trip is recorded in `latency`.
+
+This module must not import tkinter at the top level: the child only
+needs customtkinter, and the builder side only pipes.
+"""
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from ast import literal_eval
+
+from codegen import CONSTRUCTORS, CodeGenerator
+from perf import Histogram
+
+# Child: how often the Tk loop checks for messages
+POLL_MS = 4
+# Builder: how often to check the child is still running
+WATCH_MS = 500
+STOP_TIMEOUT = 2.0
+STDERR_LINES = 20
+
+
+def variable_names(widgets):
+    """Widget id -> the variable CodeGenerator assigns it to."""
+    return {w['id']: f"{w['type'].lower()}{i+1}" for i, w in enumerate(widgets)
+            if w['type'] in CONSTRUCTORS}
+
+
+def changed_options(data, key):
+    """Constructor options of `data` that read `key`, as exported source."""
+    ctor = CONSTRUCTORS.get(data['type'])
+    if ctor is None:
+        return {}
+    options = {name: emitter.emit(None, *(data[k] for k in emitter.keys))
+               for name, emitter in ctor.options if key in emitter.keys}
+    if key == 'text' and ctor.text is not None:
+        options['text'] = ctor.text.emit(None, data['text'])
+    return options
+
+
+class LivePreview:
+    """Builder side: owns the child process and turns edits into messages."""
+
+    def __init__(self, app, on_exit=None):
+        self.app = app
+        self.on_exit = on_exit
+        self.codegen = CodeGenerator()
+        self.process = None
+        self.changes = {}
+        self.reload_due = False
+        self.job = None
+        self.watch_job = None
+        self.seq = 0
+        self.sent = {}
+        self.latency = {'patch': Histogram(), 'load': Histogram()}
+        self.acked = 0
+        self.stderr = []
+
+    @property
+    def running(self):
+        return self.process is not None
+
+    def start(self):
+        if self.process is not None:
+            return
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, bufsize=1, cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.stderr = []
+        threading.Thread(target=self.read_acks, args=(self.process,), daemon=True).start()
+        threading.Thread(target=self.read_stderr, args=(self.process,), daemon=True).start()
+        self.reload()
+        self.watch_job = self.app.root.after(WATCH_MS, self.watch)
+
+    def stop(self):
+        process, self.process = self.process, None
+        for job in (self.job, self.watch_job):
+            if job is not None:
+                self.app.root.after_cancel(job)
+        self.job = self.watch_job = None
+        self.changes = {}
+        self.sent = {}
+        if process is None:
+            return
+        try:
+            # End of input tells the child to close its window and exit
+            process.stdin.close()
+            process.wait(STOP_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+
+    def watch(self):
+        self.watch_job = None
+        if self.process is None:
+            return
+        if self.process.poll() is not None:
+            self.exited()
+            return
+        self.watch_job = self.app.root.after(WATCH_MS, self.watch)
+
+    def exited(self):
+        self.stop()
+        if self.on_exit is not None:
+            self.on_exit(''.join(self.stderr[-STDERR_LINES:]))
+
+    # Edits
+    def reload(self):
+        self.reload_due = True
+        self.changes = {}
+        self.schedule()
+
+    def record(self, record):
+        # The same records autosave journals (see PyGUIBuilder.record_change)
+        if self.reload_due:
+            self.schedule()
+            return
+        op = record[0]
+        if op == 's':
+            wid, key = record[1], record[2]
+            data = self.app.widgets.get(wid)
+            if data is None:
+                return
+            if key == 'type':
+                self.reload()
+                return
+            if key in ('x', 'y'):
+                self.changes[(wid, 'place')] = [data['x'], data['y']]
+            for option, value in changed_options(data, key).items():
+                self.changes[(wid, option)] = value
+        elif op == 'm':
+            for wid in record[1]:
+                data = self.app.widgets.get(wid)
+                if data is not None:
+                    self.changes[(wid, 'place')] = [data['x'], data['y']]
+        else:
+            self.reload()
+            return
+        self.schedule()
+
+    def dragged(self, wids, dx, dy):
+        # Called every drag frame with the offset so far, in canvas pixels
+        if self.reload_due:
+            return
+        z = self.app.renderer.zoom
+        dx, dy = round(dx / z), round(dy / z)
+        for wid in wids:
+            data = self.app.widgets.get(wid)
+            if data is not None:
+                self.changes[(wid, 'place')] = [data['x'] + dx, data['y'] + dy]
+        self.schedule()
+
+    def schedule(self):
+        if self.job is None and self.process is not None:
+            self.job = self.app.root.after_idle(self.flush)
+
+    def flush(self):
+        self.job = None
+        if self.process is None:
+            return
+        if self.reload_due:
+            self.reload_due = False
+            widgets = self.app.widgets
+            message = {'op': 'load', 'source': self.codegen.generate(widgets),
+                       'names': variable_names(widgets)}
+        elif self.changes:
+            message = {'op': 'patch', 'changes': [[wid, option, value] for (wid, option), value
+                                                  in self.changes.items()]}
+            self.changes = {}
+        else:
+            return
+        self.seq += 1
+        message['seq'] = self.seq
+        self.sent[self.seq] = (message['op'], time.perf_counter())
+        try:
+            self.process.stdin.write(json.dumps(message) + '\n')
+            self.process.stdin.flush()
+        except OSError:
+            self.exited()
+
+    # Reader threads: they only record, never touch Tk
+    def read_acks(self, process):
+        for line in process.stdout:
+            status, _, seq = line.strip().partition(' ')
+            sent = self.sent.pop(int(seq), None) if seq.isdigit() else None
+            if sent is None:
+                continue
+            self.latency[sent[0]].add(time.perf_counter() - sent[1])
+            self.acked += 1
+            if status == 'stale':
+                # Goes out with the next edit
+                self.reload_due = True
+
+    def read_stderr(self, process):
+        for line in process.stderr:
+            self.stderr.append(line)
+            del self.stderr[:-STDERR_LINES]
+
+
+class PreviewWindow:
+    """Child side: one run of an exported program, patched until the next load."""
+
+    def __init__(self, ctk, message, inbox, channel):
+        self.inbox = inbox
+        self.channel = channel
+        self.next = None
+        namespace = {'__name__': '__preview__'}
+        # The program ends in root.mainloop(); the preview runs the loop itself
+        mainloop = ctk.CTk.mainloop
+        ctk.CTk.mainloop = lambda self, *args, **kwargs: None
+        try:
+            exec(compile(message['source'], '<preview>', 'exec'), namespace)
+        except BaseException:
+            root = namespace.get('root')
+            if root is not None:
+                root.destroy()
+            raise
+        finally:
+            ctk.CTk.mainloop = mainloop
+        self.root = namespace['root']
+        self.widgets = {int(wid): namespace[name] for wid, name in message['names'].items()
+                        if name in namespace}
+        self.root.protocol("WM_DELETE_WINDOW", self.root.quit)
+        self.root.update_idletasks()
+        self.ack('ok', message['seq'])
+
+    def ack(self, status, seq):
+        self.channel.write(f"{status} {seq}\n")
+        self.channel.flush()
+
+    def run(self):
+        """Show the program until it is replaced; returns the next load or None."""
+        self.root.after(POLL_MS, self.poll)
+        self.root.mainloop()
+        self.root.destroy()
+        return self.next
+
+    def poll(self):
+        while True:
+            try:
+                message = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            if message is None or message['op'] == 'load':
+                self.next = message
+                self.root.quit()
+                return
+            self.patch(message)
+        self.root.after(POLL_MS, self.poll)
+
+    def patch(self, message):
+        stale = False
+        for wid, option, value in message['changes']:
+            widget = self.widgets.get(wid)
+            try:
+                if option == 'place':
+                    widget.place(x=value[0], y=value[1])
+                else:
+                    widget.configure(**{option: literal_eval(value)})
+            except Exception:
+                # Unknown widget, a value the literal can't express, or an
+                # option this widget can't change after construction
+                stale = True
+        self.root.update_idletasks()
+        self.ack('stale' if stale else 'ok', message['seq'])
+
+
+def child():
+    import customtkinter as ctk
+
+    # Output from the previewed program must not mix with the acks
+    channel, sys.stdout = sys.stdout, sys.stderr
+    inbox = queue.Queue()
+
+    def read():
+        for line in sys.stdin:
+            inbox.put(json.loads(line))
+        inbox.put(None)
+    threading.Thread(target=read, daemon=True).start()
+
+    message = inbox.get()
+    while message is not None:
+        if message['op'] != 'load':
+            message = inbox.get()
+            continue
+        try:
+            window = PreviewWindow(ctk, message, inbox, channel)
+        except Exception:
+            traceback.print_exc()
+            channel.write(f"error {message['seq']}\n")
+            channel.flush()
+            message = inbox.get()
+            continue
+        message = window.run()
+
+
+if __name__ == '__main__':
+    child()
@@ -0,0 +1,210 @@
+"""Compact binary project format (.pgb) with lazy, memory-mapped loading.
+
+Layout, all little-endian:
+
+    header   magic, version, record size, record count, string count,
+             and the byte offsets of the three sections below
+    records  one fixed-width row per widget, in stacking order; numeric
+             fields are stored inline, string fields as string-table ids
+    offsets  (string count + 1) u32 offsets into the string blob
+    strings  UTF-8 blob of every distinct string, each stored once
+
+Values that don't fit their column (a blank font size, a float, keys this
+version doesn't know) go into a per-record JSON "extra" string, so
+converting JSON -> binary -> JSON is lossless.
+
+    python projectbin.py to-bin project.json project.pgb
+    python projectbin.py to-json project.pgb project.json
+"""
+import json
+import mmap
+import struct
+import sys
+
+from model import FIELDS, Widget, WidgetStore
+
+MAGIC = b'PGBP'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHIIQQQ')
+NO_STRING = 0xFFFFFFFF
+I32_MIN, I32_MAX = -2**31, 2**31 - 1
+
+STRING_FIELDS = ('type', 'text', 'font', 'bg_color', 'fg_color', 'text_color',
+                 'border_color', 'hover_color')
+# Column layout follows FIELDS, plus the extra-JSON string id at the end
+COLUMNS = FIELDS + ('extra',)
+RECORD = struct.Struct('<' + ''.join('I' if f in STRING_FIELDS or f == 'extra' else 'i'
+                                     for f in COLUMNS))
+STRING_POSITIONS = tuple(i for i, f in enumerate(FIELDS) if f in STRING_FIELDS)
+OFFSET = struct.Struct('<I')
+
+
+def is_binary(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save(widgets, path):
+    strings = {}
+    blob = bytearray()
+    offsets = [0]
+
+    def intern(s):
+        idx = strings.get(s)
+        if idx is None:
+            idx = strings[s] = len(offsets) - 1
+            blob.extend(s.encode('utf-8'))
+            offsets.append(len(blob))
+        return idx
+
+    records = bytearray()
+    count = 0
+    for w in widgets:
+        d = w.to_dict() if isinstance(w, Widget) else w
+        row = []
+        extra = {k: v for k, v in d.items() if k not in FIELDS}
+        for field in FIELDS:
+            if field not in d:
+                # Missing keys round-trip as missing
+                extra.setdefault('__missing__', []).append(field)
+                row.append(NO_STRING if field in STRING_FIELDS else 0)
+                continue
+            value = d[field]
+            if field in STRING_FIELDS:
+                if type(value) is str:
+                    row.append(intern(value))
+                    continue
+                row.append(NO_STRING)
+            else:
+                if type(value) is int and I32_MIN <= value <= I32_MAX:
+                    row.append(value)
+                    continue
+                row.append(0)
+            extra[field] = value
+        row.append(intern(json.dumps(extra)) if extra else NO_STRING)
+        records += RECORD.pack(*row)
+        count += 1
+
+    records_at = HEADER.size
+    offsets_at = records_at + len(records)
+    strings_at = offsets_at + OFFSET.size * len(offsets)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, count, len(offsets) - 1,
+                            records_at, offsets_at, strings_at))
+        f.write(records)
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(blob)
+
+
+class BinaryProject:
+    """Read-only view of a .pgb file; widgets are decoded when accessed."""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, record_size, self.count, string_count,
+         self.records_at, self.offsets_at, self.strings_at) = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a PyGUI binary project")
+        if version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"unsupported binary project version {version}")
+        self.strings = [None] * string_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        view = memoryview(self.map)[self.records_at:self.offsets_at]
+        try:
+            for row in RECORD.iter_unpack(view):
+                yield self.widget(row)
+        finally:
+            view.release()
+
+    def string(self, idx):
+        s = self.strings[idx]
+        if s is None:
+            start, end = struct.unpack_from('<2I', self.map, self.offsets_at + OFFSET.size * idx)
+            s = self.strings[idx] = sys.intern(
+                str(self.map[self.strings_at + start:self.strings_at + end], 'utf-8'))
+        return s
+
+    def row(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return RECORD.unpack_from(self.map, self.records_at + RECORD.size * i)
+
+    def column(self, field):
+        """Yield one numeric field for every record without decoding the rest."""
+        pos = COLUMNS.index(field)
+        view = memoryview(self.map)[self.records_at:self.offsets_at]
+        try:
+            for row in RECORD.iter_unpack(view):
+                yield row[pos]
+        finally:
+            view.release()
+
+    def __getitem__(self, i):
+        return self.widget(self.row(i))
+
+    def widget(self, row):
+        if row[-1] != NO_STRING:
+            return Widget.from_dict(self.decode(row))
+        # Common case: every value fit its column, build the record directly
+        values = list(row[:-1])
+        for pos in STRING_POSITIONS:
+            values[pos] = self.string(values[pos])
+        return Widget(*values)
+
+    def decode(self, row):
+        d = {}
+        for field, value in zip(FIELDS, row):
+            if field in STRING_FIELDS:
+                d[field] = None if value == NO_STRING else self.string(value)
+            else:
+                d[field] = value
+        if row[-1] != NO_STRING:
+            extra = json.loads(self.string(row[-1]))
+            for field in extra.pop('__missing__', ()):
+                del d[field]
+            d.update(extra)
+        return d
+
+    def to_list(self):
+        return [self.decode(self.row(i)) for i in range(self.count)]
+
+
+def load(path):
+    with BinaryProject(path) as project:
+        return WidgetStore(project)
+
+
+def json_to_binary(src, dst):
+    with open(src, 'r') as f:
+        save(json.load(f), dst)
+
+
+def binary_to_json(src, dst):
+    with BinaryProject(src) as project:
+        widgets = project.to_list()
+    with open(dst, 'w') as f:
+        json.dump(widgets, f, indent=2)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4 or sys.argv[1] not in ('to-bin', 'to-json'):
+        sys.exit("usage: projectbin.py to-bin|to-json SRC DST")
+    (json_to_binary if sys.argv[1] == 'to-bin' else binary_to_json)(sys.argv[2], sys.argv[3])
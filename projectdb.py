@@ -0,0 +1,312 @@
+"""SQLite project store (.pgdb): one row per widget, indexed for queries.
+
+    widgets        id, z (stacking order), one column per model field and
+                   an "extra" JSON column; indexed on type, (x, y) and z
+    widget_rtree   R*Tree of each widget's rendered bounds, when the
+                   sqlite3 build has the rtree module
+    meta           format version and the largest widget extent, used to
+                   answer region queries from the (x, y) index without R*Tree
+
+Data columns are declared without a type so SQLite stores values exactly
+as given. Values that don't survive that (bools, lists, missing keys,
+integers beyond 64 bits) go into "extra", so JSON -> .pgdb -> JSON is
+lossless.
+
+    python projectdb.py to-db project.json project.pgdb
+    python projectdb.py to-json project.pgdb project.json
+"""
+import json
+import math
+import os
+import sqlite3
+import sys
+from itertools import islice
+
+from hittest import widget_bounds
+from model import FIELD_SET, FIELDS, Widget, WidgetStore
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+FORMAT = 'pygui-builder'
+VERSION = 1
+I64_MIN, I64_MAX = -2**63, 2**63 - 1
+MISSING = object()
+
+COLUMNS = ('id', 'z') + FIELDS[1:] + ('extra',)
+FIELD_POSITIONS = tuple(range(2, 2 + len(FIELDS) - 1))
+SELECT = f"SELECT {', '.join(COLUMNS)} FROM widgets"
+UPSERT = (f"INSERT OR REPLACE INTO widgets ({', '.join(COLUMNS)}) "
+          f"VALUES ({', '.join('?' * len(COLUMNS))})")
+
+SCHEMA = f"""
+CREATE TABLE meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE widgets (id INTEGER PRIMARY KEY, z REAL NOT NULL, {', '.join(FIELDS[1:])}, extra);
+"""
+INDEXES = """
+CREATE INDEX widgets_type ON widgets (type);
+CREATE INDEX widgets_xy ON widgets (x, y);
+CREATE INDEX widgets_z ON widgets (z);
+"""
+RTREE = "CREATE VIRTUAL TABLE widget_rtree USING rtree(id, x1, x2, y1, y2)"
+
+
+def is_database(path):
+    with open(path, 'rb') as f:
+        return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+
+
+def encode(w, z):
+    """Row for a Widget or a widget dict; `z` is its stacking key."""
+    if isinstance(w, Widget):
+        row = [getattr(w, field) for field in FIELDS]
+        extra = dict(w.extra) if w.extra else {}
+    else:
+        row = [w.get(field, MISSING) for field in FIELDS]
+        extra = {k: v for k, v in w.items() if k not in FIELD_SET}
+        missing = [field for field, value in zip(FIELDS, row) if value is MISSING]
+        if missing:
+            # Missing keys round-trip as missing
+            extra['__missing__'] = missing
+    if type(row[0]) is not int:
+        raise ValueError(f"widget id must be an integer, got {row[0]!r}")
+    for i in range(1, len(row)):
+        value = row[i]
+        t = type(value)
+        if not (t is str or (t is int and I64_MIN <= value <= I64_MAX) or t is float or value is None):
+            if value is not MISSING:
+                extra[FIELDS[i]] = value
+            row[i] = None
+    row.insert(1, z)
+    row.append(json.dumps(extra) if extra else None)
+    return row
+
+
+def decode(row):
+    d = {'id': row[0]}
+    for field, pos in zip(FIELDS[1:], FIELD_POSITIONS):
+        d[field] = row[pos]
+    if row[-1] is not None:
+        extra = json.loads(row[-1])
+        for field in extra.pop('__missing__', ()):
+            del d[field]
+        d.update(extra)
+    return d
+
+
+def to_widget(row):
+    if row[-1] is not None:
+        return Widget.from_dict(decode(row))
+    # Common case: every value sits in its column, build the record directly
+    return Widget(row[0], *row[2:-1])
+
+
+def bounds_of(d):
+    """(x1, y1, x2, y2) as floats with x1 <= x2 and y1 <= y2, or None.
+
+    A negative width or height spans the box the other way, as the canvas
+    draws it. Geometry that isn't a finite number gives None: the widget
+    still round-trips through its columns, it just isn't indexed.
+    """
+    try:
+        box = widget_bounds(d)
+    except (KeyError, TypeError):
+        return None
+    try:
+        x1, y1, x2, y2 = (float(v) for v in box if type(v) is int or type(v) is float)
+    except (ValueError, OverflowError):
+        # Not four numbers, or an integer too large for a float
+        return None
+    if not all(math.isfinite(v) for v in (x1, y1, x2, y2)):
+        return None
+    return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+
+def create(path):
+    """New empty database; indexes are built by `save` once the rows are in."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    try:
+        conn.execute(RTREE)
+    except sqlite3.OperationalError:
+        pass
+    conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                     [('format', FORMAT), ('version', VERSION), ('max_w', 0), ('max_h', 0)])
+    conn.commit()
+    return conn
+
+
+def save(widgets, path, z=None):
+    """Write a complete project; `z(id)` gives each stacking key (default: position)."""
+    tmp = path + '.tmp'
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = create(tmp)
+    try:
+        # A half-written temp file is simply discarded, so skip the rollback journal
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        db = ProjectDB(conn=conn)
+        with conn:
+            db.write_rows(widgets, z)
+        # Building indexes over sorted rows beats updating them row by row
+        conn.executescript(INDEXES)
+        conn.close()
+        os.replace(tmp, path)
+    except BaseException:
+        conn.close()
+        os.remove(tmp)
+        raise
+
+
+class ProjectDB:
+    """An open .pgdb file: region and attribute queries, partial writes."""
+
+    def __init__(self, path=None, conn=None):
+        self.path = path
+        self.conn = conn or sqlite3.connect(path)
+        try:
+            meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError:
+            meta = {}
+        if meta.get('format') != FORMAT:
+            self.close()
+            raise ValueError(f"{path} is not a PyGUI project database")
+        if meta.get('version') != VERSION:
+            self.close()
+            raise ValueError(f"unsupported project database version {meta.get('version')}")
+        self.max_w = meta['max_w']
+        self.max_h = meta['max_h']
+        self.rtree = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'widget_rtree'").fetchone() is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT count(*) FROM widgets").fetchone()[0]
+
+    def rows(self, where='', params=()):
+        return self.conn.execute(f"{SELECT} {where} ORDER BY z", params)
+
+    def region(self, x1, y1, x2, y2, limit=None):
+        """(z, Widget) for widgets whose rendered bounds meet the rectangle.
+
+        With `limit`, at most that many, the lowest in the stacking order.
+        """
+        if self.rtree:
+            cursor = self.rows("WHERE id IN (SELECT id FROM widget_rtree WHERE "
+                               "x1 <= ? AND x2 >= ? AND y1 <= ? AND y2 >= ?)",
+                               (x2, x1, y2, y1))
+            return [(row[1], to_widget(row)) for row in islice(cursor, limit)]
+        # No R*Tree: widen the (x, y) index range by the largest extent, then filter
+        cursor = self.rows("WHERE x BETWEEN ? AND ? AND y BETWEEN ? AND ?",
+                           (x1 - self.max_w, x2, y1 - self.max_h, y2))
+        found = []
+        for row in cursor:
+            widget = to_widget(row)
+            b = bounds_of(widget)
+            if b is not None and b[0] <= x2 and b[2] >= x1 and b[1] <= y2 and b[3] >= y1:
+                found.append((row[1], widget))
+                if len(found) == limit:
+                    break
+        return found
+
+    def find(self, **equals):
+        """Widgets whose columns equal the given values, e.g. find(type='Button')."""
+        for column in equals:
+            if column not in COLUMNS:
+                raise ValueError(f"unknown column {column!r}")
+        where = ' AND '.join(f"{column} = ?" for column in equals)
+        cursor = self.rows(f"WHERE {where}" if where else '', tuple(equals.values()))
+        return [to_widget(row) for row in cursor]
+
+    def max_id(self):
+        return self.conn.execute("SELECT max(id) FROM widgets").fetchone()[0] or 0
+
+    def max_z(self):
+        return self.conn.execute("SELECT max(z) FROM widgets").fetchone()[0] or 0
+
+    def get(self, wid):
+        row = self.rows("WHERE id = ?", (wid,)).fetchone()
+        return None if row is None else to_widget(row)
+
+    def widgets(self):
+        """(z, Widget) for every widget, in stacking order."""
+        return [(row[1], to_widget(row)) for row in self.rows()]
+
+    def batches(self, size):
+        """The same as widgets(), read `size` rows at a time."""
+        cursor = self.rows()
+        while True:
+            rows = cursor.fetchmany(size)
+            if not rows:
+                return
+            yield [(row[1], to_widget(row)) for row in rows]
+
+    def to_list(self):
+        return [decode(row) for row in self.rows()]
+
+    def write_rows(self, widgets, z=None):
+        rows, boxes = [], []
+        max_w, max_h = self.max_w, self.max_h
+        for i, d in enumerate(widgets):
+            rows.append(encode(d, i + 1 if z is None else z(d['id'])))
+            b = bounds_of(d)
+            if b is not None:
+                boxes.append((d['id'], b[0], b[2], b[1], b[3]))
+                max_w, max_h = max(max_w, b[2] - b[0]), max(max_h, b[3] - b[1])
+        self.conn.executemany(UPSERT, rows)
+        if self.rtree:
+            self.conn.executemany("INSERT OR REPLACE INTO widget_rtree VALUES (?, ?, ?, ?, ?)", boxes)
+        if (max_w, max_h) != (self.max_w, self.max_h):
+            self.max_w, self.max_h = max_w, max_h
+            self.conn.executemany("UPDATE meta SET value = ? WHERE key = ?",
+                                  [(max_w, 'max_w'), (max_h, 'max_h')])
+
+    def delete_rows(self, wids):
+        params = [(wid,) for wid in wids]
+        self.conn.executemany("DELETE FROM widgets WHERE id = ?", params)
+        if self.rtree:
+            self.conn.executemany("DELETE FROM widget_rtree WHERE id = ?", params)
+
+    def write_back(self, store, changed, removed, z):
+        """Write only the changed and removed rows of `store` in one transaction."""
+        with self.conn:
+            self.delete_rows(removed)
+            self.write_rows((store.get(wid) for wid in changed if wid in store), z)
+
+    def replace_all(self, store, z):
+        with self.conn:
+            self.conn.execute("DELETE FROM widgets")
+            if self.rtree:
+                self.conn.execute("DELETE FROM widget_rtree")
+            self.write_rows(store, z)
+
+
+def load(path):
+    with ProjectDB(path) as db:
+        rows = db.widgets()
+    return WidgetStore((w for _, w in rows), [z for z, _ in rows])
+
+
+def json_to_db(src, dst):
+    with open(src, 'r') as f:
+        save(json.load(f), dst)
+
+
+def db_to_json(src, dst):
+    with ProjectDB(src) as db:
+        widgets = db.to_list()
+    with open(dst, 'w') as f:
+        json.dump(widgets, f, indent=2)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4 or sys.argv[1] not in ('to-db', 'to-json'):
+        sys.exit("usage: projectdb.py to-db|to-json SRC DST")
+    (json_to_db if sys.argv[1] == 'to-db' else db_to_json)(sys.argv[2], sys.argv[3])
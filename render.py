@@ -0,0 +1,421 @@
+"""Canvas rendering: widget shapes, the canvas renderer and redraw scheduler.
+
+`widget_shapes` describes a widget as plain (kind, coords, options)
+tuples, so the renderer can either create the canvas items or update
+existing ones in place with `coords`/`itemconfigure`.
+"""
+from bisect import bisect_left
+
+from hittest import widget_bounds
+
+# Below this zoom widgets are drawn as single plain rectangles
+LOD_ZOOM = 0.5
+# Screen pixels past each viewport edge that still get canvas items
+MARGIN = 200
+# Hidden item groups kept per item layout for reuse
+POOL_LIMIT = 256
+# Overlays (selection outlines, guides) stay above widget items
+OVERLAY_TAG = "overlay"
+
+
+def widget_tag(wid):
+    return f"w{wid}"
+
+
+def rounded_rect(x1, y1, x2, y2, r, fill, outline, width):
+    if r > 0:
+        points = (x1+r,y1, x2-r,y1, x2,y1, x2,y1+r, x2,y2-r, x2,y2,
+                  x2-r,y2, x1+r,y2, x1,y2, x1,y2-r, x1,y1+r, x1,y1)
+        return ('polygon', points, {'fill': fill, 'outline': outline,
+                                    'width': width, 'smooth': True})
+    return ('rectangle', (x1, y1, x2, y2), {'fill': fill, 'outline': outline, 'width': width})
+
+
+def text(x, y, label, font, fill, anchor='center'):
+    return ('text', (x, y), {'text': label, 'font': font, 'fill': fill, 'anchor': anchor})
+
+
+def oval(x1, y1, x2, y2, **options):
+    return ('oval', (x1, y1, x2, y2), options)
+
+
+def widget_shapes(data):
+    x, y = data['x'], data['y']
+    w, h = data['width'], data['height']
+    r = data['corner_radius']
+    kind = data['type']
+    font = (data['font'], data['font_size'])
+
+    if kind == 'Label':
+        return [rounded_rect(x, y, x+w, y+h, r, data['bg_color'], data['border_color'], 2),
+                text(x+w//2, y+h//2, data['text'], font, data['text_color'])]
+    if kind == 'Button':
+        return [rounded_rect(x, y, x+w, y+h, r, data['fg_color'], data['border_color'], 2),
+                text(x+w//2, y+h//2, data['text'], font + ('bold',), 'white')]
+    if kind == 'Entry':
+        return [rounded_rect(x, y, x+w, y+h, r, 'white', data['border_color'], 2),
+                text(x+10, y+h//2, "Enter text...", font, '#999', 'w')]
+    if kind == 'Text':
+        return [rounded_rect(x, y, x+w, y+h*2, r, 'white', data['border_color'], 2),
+                text(x+10, y+10, "Text area...", font, '#999', 'nw')]
+    if kind == 'Checkbutton':
+        return [rounded_rect(x, y, x+25, y+25, 5, 'white', data['border_color'], 2),
+                text(x+12, y+12, "✓", ('Arial', 16, 'bold'), data['fg_color']),
+                text(x+35, y+12, data['text'], font, data['text_color'], 'w')]
+    if kind == 'Radiobutton':
+        return [oval(x, y, x+25, y+25, fill='white', outline=data['border_color'], width=2),
+                oval(x+7, y+7, x+18, y+18, fill=data['fg_color'], outline=''),
+                text(x+35, y+12, data['text'], font, data['text_color'], 'w')]
+    if kind == 'Frame':
+        return [rounded_rect(x, y, x+w, y+h, r, data['bg_color'], data['border_color'], 2),
+                text(x+w//2, y+10, "Frame", (data['font'], 9), '#999')]
+    if kind == 'Scale':
+        return [rounded_rect(x, y+10, x+w, y+25, 15, '#e0e0e0', data['border_color'], 1),
+                oval(x+w//2-10, y+5, x+w//2+10, y+30, fill=data['fg_color'],
+                     outline=data['border_color'], width=2)]
+    if kind == 'Progressbar':
+        return [rounded_rect(x, y, x+w, y+25, r, '#e0e0e0', data['border_color'], 1),
+                rounded_rect(x+2, y+2, x+w//2, y+23, r-2, data['fg_color'], '', 0)]
+    return []
+
+
+def appearance_key(data, zoom):
+    # Everything widget_shapes and lod_shapes read for the non-text shapes
+    return (data['type'], data['width'], data['height'], data['corner_radius'],
+            data['bg_color'], data['fg_color'], data['border_color'], zoom)
+
+
+def scale_shapes(shapes, zoom):
+    scaled = []
+    for kind, coords, options in shapes:
+        coords = tuple(c * zoom for c in coords)
+        font = options.get('font')
+        if font and type(font[1]) is int:
+            options = dict(options, font=(font[0], max(1, round(font[1] * zoom))) + font[2:])
+        if options.get('width'):
+            options = dict(options, width=max(1, options['width'] * zoom))
+        scaled.append((kind, coords, options))
+    return scaled
+
+
+def lod_shapes(data, zoom):
+    x1, y1, x2, y2 = widget_bounds(data)
+    kind = data['type']
+    if kind in ('Entry', 'Text'):
+        fill = 'white'
+    elif kind in ('Label', 'Frame'):
+        fill = data['bg_color']
+    else:
+        fill = data['fg_color']
+    return [('rectangle', (x1 * zoom, y1 * zoom, x2 * zoom, y2 * zoom),
+             {'fill': fill, 'outline': data['border_color'], 'width': 1})]
+
+
+class CanvasRenderer:
+    """Keeps the design canvas items in step with the widget model.
+
+    In virtual mode only widgets intersecting the viewport (plus MARGIN)
+    own canvas items. Items of widgets that scroll away are hidden and
+    reused for widgets scrolling in with the same item layout. Canvas
+    stacking follows the hit index's z-order: `depth(wid)` gives a widget's
+    stacking key when it is first drawn, creation order if not given.
+
+    With a `sprites.SpriteCache` widget bodies are drawn as one image item
+    each instead of vector shapes; the model is not affected either way.
+    """
+
+    def __init__(self, canvas, index, lookup, virtual=True, sprites=None, depth=None):
+        self.canvas = canvas
+        self.index = index
+        self.lookup = lookup
+        self.depth = depth
+        self.virtual = virtual
+        self.sprites = sprites
+        self.sprite_of = {}
+        self.zoom = 1.0
+        self.rect = None
+        self.extent = None
+        self.region = (0, 0, 0, 0)
+        self.items = {}
+        self.kinds = {}
+        self.owner = {}
+        self.pool = {}
+        self.live_z = []
+        self.z_owner = {}
+        # Canvas item counters
+        self.created = 0
+        self.deleted = 0
+        self.recycled = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def live_items(self):
+        return len(self.owner)
+
+    def shapes(self, data):
+        zoom = self.zoom
+        if zoom < LOD_ZOOM:
+            return lod_shapes(data, zoom)
+        shapes = widget_shapes(data)
+        return shapes if zoom == 1 else scale_shapes(shapes, zoom)
+
+    def sprite_shapes(self, data, shapes, key):
+        """Swap the non-text shapes for one image item showing their sprite."""
+        zoom = self.zoom
+        ox, oy = data['x'] * zoom, data['y'] * zoom
+        body = [shape for shape in shapes if shape[0] != 'text']
+        sprite = self.sprites.acquire(key, body, ox, oy)
+        return [('image', (ox + sprite.dx, oy + sprite.dy), {'image': sprite.image, 'anchor': 'nw'})] + \
+            [shape for shape in shapes if shape[0] == 'text']
+
+    def set_sprites(self, sprites):
+        """Switch between vector (None) and sprite rendering, redrawing live widgets."""
+        live = list(self.items)
+        for wid in live:
+            self.release(wid)
+        # Pooled item layouts belong to the old mode and are never reused
+        for groups in self.pool.values():
+            for items in groups:
+                for item in items:
+                    self.canvas.delete(item)
+                self.deleted += len(items)
+        self.pool.clear()
+        self.sprites = sprites
+        for wid in live:
+            data = self.lookup(wid)
+            if data is not None:
+                self.draw(data)
+
+    def view_rect(self):
+        c, zoom = self.canvas, self.zoom
+        x1, y1 = c.canvasx(-MARGIN), c.canvasy(-MARGIN)
+        x2 = c.canvasx(c.winfo_width() + MARGIN)
+        y2 = c.canvasy(c.winfo_height() + MARGIN)
+        return (x1 / zoom, y1 / zoom, x2 / zoom, y2 / zoom)
+
+    def in_view(self, bounds):
+        if not self.virtual:
+            return True
+        if self.rect is None:
+            self.rect = self.view_rect()
+        x1, y1, x2, y2 = self.rect
+        return bounds[0] <= x2 and bounds[2] >= x1 and bounds[1] <= y2 and bounds[3] >= y1
+
+    def draw(self, data):
+        wid = data['id']
+        bounds = widget_bounds(data)
+        if wid in self.index:
+            self.index.move(wid, bounds)
+        else:
+            self.index.insert(wid, bounds, None if self.depth is None else self.depth(wid))
+        self.grow(bounds)
+        if not self.in_view(bounds):
+            self.release(wid)
+            return
+        shapes = self.shapes(data)
+        key = None
+        if self.sprites is not None and shapes:
+            key = appearance_key(data, self.zoom)
+            shapes = self.sprite_shapes(data, shapes, key)
+        kinds = tuple(shape[0] for shape in shapes)
+        items = self.items.get(wid)
+        if items is not None and self.kinds[wid] == kinds:
+            # Same item layout: update in place, keeping the stacking order
+            for item, (kind, coords, options) in zip(items, shapes):
+                self.canvas.coords(item, *coords)
+                self.canvas.itemconfigure(item, **options)
+        else:
+            if items is not None:
+                self.release(wid)
+            self.materialize(wid, kinds, shapes)
+        if key is not None:
+            # The new sprite is acquired before the old one is let go, so an
+            # unchanged appearance is never evicted in between
+            old = self.sprite_of.get(wid)
+            self.sprite_of[wid] = key
+            if old is not None:
+                self.sprites.release(old)
+
+    def materialize(self, wid, kinds, shapes):
+        tag = widget_tag(wid)
+        pooled = self.pool.get(kinds)
+        if pooled:
+            items = pooled.pop()
+            for item, (kind, coords, options) in zip(items, shapes):
+                self.canvas.coords(item, *coords)
+                self.canvas.itemconfigure(item, state='normal', tags=tag, **options)
+            self.recycled += 1
+        else:
+            create = {'polygon': self.canvas.create_polygon, 'rectangle': self.canvas.create_rectangle,
+                      'oval': self.canvas.create_oval, 'text': self.canvas.create_text,
+                      'image': self.canvas.create_image}
+            items = [create[kind](*coords, tags=tag, **options) for kind, coords, options in shapes]
+            self.created += len(items)
+        self.items[wid] = items
+        self.kinds[wid] = kinds
+        for item in items:
+            self.owner[item] = wid
+
+        # Slot the items into the stacking order below the next higher widget
+        z = self.index.entries[wid][1]
+        pos = bisect_left(self.live_z, z)
+        self.live_z.insert(pos, z)
+        self.z_owner[z] = wid
+        if pos + 1 < len(self.live_z):
+            above = self.items[self.z_owner[self.live_z[pos + 1]]][0]
+            for item in items:
+                self.canvas.tag_lower(item, above)
+        elif pooled:
+            for item in items:
+                self.canvas.tag_raise(item)
+
+    def release(self, wid):
+        """Drop a widget's items, parking them in the pool when there is room."""
+        items = self.items.pop(wid, None)
+        if items is None:
+            return
+        kinds = self.kinds.pop(wid)
+        for item in items:
+            del self.owner[item]
+        key = self.sprite_of.pop(wid, None)
+        if key is not None:
+            self.sprites.release(key)
+        z = self.index.entries[wid][1]
+        del self.live_z[bisect_left(self.live_z, z)]
+        del self.z_owner[z]
+        pooled = self.pool.setdefault(kinds, [])
+        if len(pooled) < POOL_LIMIT:
+            tag = widget_tag(wid)
+            self.canvas.itemconfigure(tag, state='hidden')
+            self.canvas.dtag(tag, tag)
+            pooled.append(items)
+        else:
+            for item in items:
+                self.canvas.delete(item)
+            self.deleted += len(items)
+
+    def remove(self, wid):
+        self.release(wid)
+        self.index.remove(wid)
+
+    def clear(self):
+        self.canvas.delete("all")
+        self.deleted += len(self.owner) + sum(len(items) for groups in self.pool.values()
+                                             for items in groups)
+        self.items.clear()
+        self.kinds.clear()
+        self.owner.clear()
+        self.pool.clear()
+        self.live_z.clear()
+        self.z_owner.clear()
+        self.index.clear()
+        self.sprite_of.clear()
+        if self.sprites is not None:
+            self.sprites.clear()
+        self.extent = None
+
+    def sync(self):
+        """Materialize widgets entering the viewport and release those leaving it."""
+        if not self.virtual:
+            return
+        self.rect = self.view_rect()
+        visible = self.index.query(*self.rect)
+        keep = set(visible)
+        for wid in [w for w in self.items if w not in keep]:
+            self.release(wid)
+        for wid in visible:
+            if wid not in self.items:
+                data = self.lookup(wid)
+                if data is not None:
+                    self.draw(data)
+        self.canvas.tag_raise(OVERLAY_TAG)
+
+    def grow(self, bounds):
+        if self.extent is None:
+            self.extent = list(bounds)
+        elif (bounds[0] >= self.extent[0] and bounds[1] >= self.extent[1]
+              and bounds[2] <= self.extent[2] and bounds[3] <= self.extent[3]):
+            return
+        else:
+            e = self.extent
+            e[0], e[1] = min(e[0], bounds[0]), min(e[1], bounds[1])
+            e[2], e[3] = max(e[2], bounds[2]), max(e[3], bounds[3])
+        self.update_scrollregion()
+
+    def update_scrollregion(self):
+        x1, y1, x2, y2 = self.extent or (0, 0, 0, 0)
+        z = self.zoom
+        pad = max(self.canvas.winfo_width(), self.canvas.winfo_height())
+        self.region = (min(0, x1 * z) - pad, min(0, y1 * z) - pad, x2 * z + pad, y2 * z + pad)
+        self.canvas.configure(scrollregion=self.region)
+
+    def set_zoom(self, zoom, sx=None, sy=None):
+        """Zoom around screen point (sx, sy), by default the viewport centre."""
+        c = self.canvas
+        if sx is None:
+            sx, sy = c.winfo_width() / 2, c.winfo_height() / 2
+        mx, my = c.canvasx(sx) / self.zoom, c.canvasy(sy) / self.zoom
+        self.zoom = zoom
+        self.update_scrollregion()
+        # Scroll so the model point under (sx, sy) stays put
+        x1, y1, x2, y2 = self.region
+        c.xview_moveto((mx * zoom - sx - x1) / (x2 - x1))
+        c.yview_moveto((my * zoom - sy - y1) / (y2 - y1))
+        for wid in list(self.items):
+            data = self.lookup(wid)
+            if data is not None:
+                self.draw(data)
+        self.sync()
+
+
+class RenderScheduler:
+    """Collects dirty widget ids and redraws them in one idle-time pass.
+
+    Any number of changes to a widget before the pass runs cost a single
+    redraw. `requested` counts mark_dirty calls, `executed` actual redraws.
+    """
+
+    def __init__(self, tk_widget, redraw):
+        self.tk_widget = tk_widget
+        self.redraw = redraw
+        self.dirty = {}
+        self.job = None
+        self.requested = 0
+        self.executed = 0
+
+    def mark_dirty(self, wid):
+        self.requested += 1
+        self.dirty[wid] = None
+        if self.job is None:
+            self.job = self.tk_widget.after_idle(self.flush)
+
+    def discard(self, wid):
+        self.dirty.pop(wid, None)
+
+    def flush(self):
+        self.job = None
+        # Each id leaves the set just before it is drawn: if a redraw raises
+        # (say a TclError from a destroyed widget), the ones after it stay
+        # dirty for the next pass. Ids marked meanwhile wait for it too.
+        try:
+            for wid in list(self.dirty):
+                if wid not in self.dirty:
+                    # Discarded by an earlier redraw
+                    continue
+                del self.dirty[wid]
+                if self.redraw(wid) is not False:
+                    self.executed += 1
+        finally:
+            if self.dirty and self.job is None:
+                self.job = self.tk_widget.after_idle(self.flush)
+
+    def clear(self):
+        if self.job is not None:
+            self.tk_widget.after_cancel(self.job)
+            self.job = None
+        self.dirty = {}
+
+    def stats(self):
+        return {'requested': self.requested, 'executed': self.executed,
+                'pending': len(self.dirty)}
@@ -0,0 +1,87 @@
+"""Snap-to-grid and alignment guides for dragging.
+
+The DragEngine asks the Snapper for the offset to apply once per frame.
+Along each axis the dragged selection's three edges (left/center/right,
+top/middle/bottom) are looked up in the spatial index's EdgeIndex; the
+closest edge of another widget within SNAP_PIXELS (on screen) wins and a
+guide line is shown through it. With nothing in reach the selection's
+top-left corner snaps to the GRID. Each lookup is a bisect, so a frame
+costs O(log n) however many widgets the canvas holds.
+"""
+from render import OVERLAY_TAG
+
+GRID = 10
+SNAP_PIXELS = 6
+GUIDE_TAG = "guide"
+GUIDE_COLOR = "#e91e63"
+
+
+class Snapper:
+    def __init__(self, canvas, edges, grid=GRID, tolerance=SNAP_PIXELS):
+        self.canvas = canvas
+        self.edges = edges
+        self.grid = grid
+        self.tolerance = tolerance
+        self.exclude = set()
+        self.box = None
+        self.zoom = 1.0
+        self.lines = None
+        self.lookups = 0
+
+    def begin(self, wids, boxes, zoom):
+        """Start a drag of `wids`, whose design-canvas bounds are `boxes`."""
+        self.exclude = set(wids)
+        x1s, y1s, x2s, y2s = zip(*boxes)
+        self.box = (min(x1s), min(y1s), max(x2s), max(y2s))
+        self.zoom = zoom
+
+    def axis(self, axis, low, high, shift):
+        """Snapped shift along one axis (model units) and the edge it met, if any."""
+        tolerance = self.tolerance / self.zoom
+        best = None
+        for edge in (low + shift, (low + high) / 2 + shift, high + shift):
+            self.lookups += 1
+            hit = self.edges.nearest(axis, edge, tolerance, self.exclude)
+            if hit is not None and (best is None or abs(hit[0] - edge) < abs(best[0] - best[2])):
+                best = (hit[0], hit[1], edge)
+        if best is not None:
+            return shift + best[0] - best[2], best
+        if self.grid:
+            return round((low + shift) / self.grid) * self.grid - low, None
+        return round(shift), None
+
+    def __call__(self, dx, dy):
+        # Offsets arrive and leave in canvas pixels; the model is unzoomed
+        z = self.zoom
+        x1, y1, x2, y2 = self.box
+        sx, x_hit = self.axis(0, x1, x2, dx / z)
+        sy, y_hit = self.axis(1, y1, y2, dy / z)
+        self.show_guides(x_hit, y_hit, (x1 + sx, y1 + sy, x2 + sx, y2 + sy))
+        return sx * z, sy * z
+
+    def show_guides(self, x_hit, y_hit, box):
+        c, z = self.canvas, self.zoom
+        if self.lines is None:
+            self.lines = [c.create_line(0, 0, 0, 0, fill=GUIDE_COLOR, dash=(3, 2), state='hidden',
+                                        tags=(GUIDE_TAG, OVERLAY_TAG)) for _ in range(2)]
+        for axis, hit in enumerate((x_hit, y_hit)):
+            line = self.lines[axis]
+            if hit is None:
+                c.itemconfigure(line, state='hidden')
+                continue
+            value, wid = hit[0], hit[1]
+            other = self.edges.entries[wid][0]
+            # The guide runs across both the selection and the widget it lines up with
+            if axis == 0:
+                coords = (value, min(box[1], other[1]), value, max(box[3], other[3]))
+            else:
+                coords = (min(box[0], other[0]), value, max(box[2], other[2]), value)
+            c.coords(line, *(v * z for v in coords))
+            c.itemconfigure(line, state='normal')
+            c.tag_raise(line)
+
+    def end(self):
+        if self.lines is not None:
+            self.canvas.delete(GUIDE_TAG)
+            self.lines = None
+        self.exclude = set()
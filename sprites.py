@@ -0,0 +1,170 @@
+"""Sprite rendering backend: widget bodies rasterized once into PhotoImages.
+
+A widget's boxes, rounded boxes and ovals are painted into a single
+`tk.PhotoImage` as runs of horizontal spans, so the canvas shows one image
+item instead of several (smoothed) polygons and ovals. Text stays a canvas
+text item: Tk cannot render fonts into a photo image.
+
+Sprites are shared by every widget with the same appearance and kept in
+an LRU cache with a memory budget. Sprites still shown on the canvas are
+never evicted, so the budget may be exceeded while they are all in use.
+"""
+import math
+from collections import OrderedDict
+
+import tkinter as tk
+
+# Tk photo images hold 4 bytes per pixel
+SPRITE_BUDGET = 32 * 1024 * 1024
+
+
+def shape_box(kind, coords):
+    """Bounding box and corner radii of a rectangle, rounded rect or oval."""
+    if kind == 'polygon':
+        # rounded_rect points: the first is (x1+r, y1), the ninth (x1, y2)
+        xs, ys = coords[0::2], coords[1::2]
+        x1, y1, x2, y2 = min(xs), min(ys), max(xs), max(ys)
+        r = coords[0] - x1
+        return (x1, y1, x2, y2), r, r
+    x1, y1, x2, y2 = coords
+    if kind == 'oval':
+        return (x1, y1, x2, y2), (x2 - x1) / 2, (y2 - y1) / 2
+    return (x1, y1, x2, y2), 0, 0
+
+
+def spans(x1, y1, x2, y2, rx, ry):
+    """Yield (row, start, end) pixel spans covering a box with elliptic corners."""
+    rx, ry = min(rx, (x2 - x1) / 2), min(ry, (y2 - y1) / 2)
+    for row in range(math.floor(y1), math.ceil(y2)):
+        yc = row + 0.5
+        if yc < y1 or yc > y2:
+            continue
+        dx = 0
+        if ry > 0:
+            t = max(y1 + ry - yc, yc - (y2 - ry), 0) / ry
+            dx = rx * (1 - math.sqrt(max(0.0, 1 - t * t)))
+        start, end = round(x1 + dx), round(x2 - dx)
+        if end > start:
+            yield row, start, end
+
+
+def paint(image, color, rows):
+    """Fill spans, merging runs of identical rows into one put."""
+    run = None
+    for row, start, end in rows:
+        if run and run[1] == row and run[2] == start and run[3] == end:
+            run[1] = row + 1
+            continue
+        if run:
+            image.put(color, to=(run[2], run[0], run[3], run[1]))
+        run = [row, row + 1, start, end]
+    if run:
+        image.put(color, to=(run[2], run[0], run[3], run[1]))
+
+
+def rasterize(master, shapes):
+    """Paint non-text shapes into a new PhotoImage.
+
+    Returns (image, dx, dy): the image's top-left corner relative to the
+    coordinate origin of `shapes`.
+    """
+    boxes = []
+    for kind, coords, options in shapes:
+        box, rx, ry = shape_box(kind, coords)
+        # Tk centres outlines on the shape's edge
+        half = options.get('width', 1) / 2 if options.get('outline') else 0
+        boxes.append((box, rx, ry, half, options))
+    left = math.floor(min(box[0] - half for box, _, _, half, _ in boxes))
+    top = math.floor(min(box[1] - half for box, _, _, half, _ in boxes))
+    right = math.ceil(max(box[2] + half for box, _, _, half, _ in boxes))
+    bottom = math.ceil(max(box[3] + half for box, _, _, half, _ in boxes))
+    image = tk.PhotoImage(master=master, width=max(1, right - left), height=max(1, bottom - top))
+    for (x1, y1, x2, y2), rx, ry, half, options in boxes:
+        x1, y1, x2, y2 = x1 - left, y1 - top, x2 - left, y2 - top
+        fill = options.get('fill')
+        if half:
+            outer = list(spans(x1 - half, y1 - half, x2 + half, y2 + half, rx + half, ry + half))
+            inner = list(spans(x1 + half, y1 + half, x2 - half, y2 - half,
+                               max(0, rx - half), max(0, ry - half)))
+            if fill:
+                paint(image, options['outline'], outer)
+                paint(image, fill, inner)
+            else:
+                # Outline only: paint the ring left and right of the inside
+                inside = {row: (start, end) for row, start, end in inner}
+                ring = []
+                for row, start, end in outer:
+                    if row in inside:
+                        ring.append((row, start, inside[row][0]))
+                        ring.append((row, inside[row][1], end))
+                    else:
+                        ring.append((row, start, end))
+                paint(image, options['outline'], [s for s in ring if s[2] > s[1]])
+        elif fill:
+            paint(image, fill, spans(x1, y1, x2, y2, rx, ry))
+    return image, left, top
+
+
+class Sprite:
+    __slots__ = ('image', 'dx', 'dy', 'size', 'users')
+
+    def __init__(self, image, dx, dy):
+        self.image = image
+        self.dx = dx
+        self.dy = dy
+        self.size = image.width() * image.height() * 4
+        self.users = 0
+
+
+class SpriteCache:
+    """Sprites by appearance key, least recently used first."""
+
+    def __init__(self, master, budget=SPRITE_BUDGET):
+        self.master = master
+        self.budget = budget
+        self.sprites = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def acquire(self, key, shapes, ox, oy):
+        """Return the sprite for `key`, painting `shapes` (translated by -ox, -oy) on a miss."""
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+        else:
+            self.misses += 1
+            local = [(kind, tuple(c - (ox if i % 2 == 0 else oy) for i, c in enumerate(coords)),
+                      options) for kind, coords, options in shapes]
+            sprite = self.sprites[key] = Sprite(*rasterize(self.master, local))
+            self.bytes += sprite.size
+        sprite.users += 1
+        self.evict()
+        return sprite
+
+    def release(self, key):
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            sprite.users -= 1
+
+    def evict(self):
+        if self.bytes <= self.budget:
+            return
+        for key in [k for k, s in self.sprites.items() if not s.users]:
+            self.bytes -= self.sprites.pop(key).size
+            self.evictions += 1
+            if self.bytes <= self.budget:
+                break
+
+    def clear(self):
+        self.sprites.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {'sprites': len(self.sprites), 'bytes': self.bytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}